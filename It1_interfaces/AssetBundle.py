@@ -0,0 +1,192 @@
+# AssetBundle.py - The whole pieces/ tree compiled into one memory-mapped file
+import copy
+import hashlib
+import json
+import os
+import pathlib
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from It1_interfaces.Moves import Moves
+from It1_interfaces.SpriteAtlas import SpriteAtlas
+
+MAGIC = b"CHSBNDL1"
+ALIGN = 64   # תחילת הפריימים מיושרת - גישה ישירה מה-mmap
+
+
+def fingerprint(pieces_root: pathlib.Path) -> str:
+    """Hash of path, size and mtime of every file under pieces_root - changes when any asset changes."""
+    pieces_root = pathlib.Path(pieces_root)
+    digest = hashlib.sha1()
+    for path in sorted(p for p in pieces_root.rglob("*") if p.is_file()):
+        stat = path.stat()
+        digest.update(f"{path.relative_to(pieces_root).as_posix()}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def default_bundle_path(pieces_root: pathlib.Path, size: Tuple[int, int]) -> pathlib.Path:
+    """pieces/ -> pieces.80x80.bundle next to it."""
+    pieces_root = pathlib.Path(pieces_root)
+    return pieces_root.with_name(f"{pieces_root.name}.{size[0]}x{size[1]}.bundle")
+
+
+class AssetBundle:
+    """
+    Sprites (resized BGRA/BGR frames), parsed move tables and state configs of
+    every piece type in a single file:
+
+        MAGIC | header length (uint64) | JSON header | padding | frames (N, H, W, C) uint8
+
+    The frames are opened with np.memmap, so a cold start reads no PNGs and
+    every process that opens the same bundle shares the same physical pages.
+    The header records the fingerprint of the pieces tree it was built from;
+    open() rebuilds the bundle when the tree has changed.
+    """
+
+    _shared: Dict[Tuple[str, Tuple[int, int]], "AssetBundle"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, atlas: SpriteAtlas, moves: Dict[str, list], configs: Dict[str, Dict[str, dict]],
+                 source_fingerprint: str = "", path: Optional[pathlib.Path] = None):
+        self.atlas = atlas
+        self._moves = moves        # piece_type -> [[dx, dy, move_type], ...]
+        self._configs = configs    # piece_type -> state folder -> config.json
+        self.fingerprint = source_fingerprint
+        self.path = path
+
+    # ─── build ───────────────────────────────────────────────────────────────
+    @classmethod
+    def compile(cls, pieces_root: pathlib.Path, bundle_path: pathlib.Path,
+                size: Tuple[int, int] = (80, 80)) -> "AssetBundle":
+        """Build the bundle file from the pieces tree and return it opened (memory-mapped)."""
+        pieces_root = pathlib.Path(pieces_root)
+        bundle_path = pathlib.Path(bundle_path)
+        source_fingerprint = fingerprint(pieces_root)
+        atlas = SpriteAtlas.build(pieces_root, size)
+
+        moves: Dict[str, list] = {}
+        configs: Dict[str, Dict[str, dict]] = {}
+        for piece_dir in sorted(p for p in pieces_root.iterdir() if p.is_dir()):
+            moves_path = piece_dir / "moves.txt"
+            if moves_path.is_file():
+                with open(moves_path, "r") as f:
+                    moves[piece_dir.name] = [list(m) for m in Moves.parse_lines(f)]
+            states_dir = piece_dir / "states"
+            if not states_dir.is_dir():
+                continue
+            for state_dir in sorted(p for p in states_dir.iterdir() if p.is_dir()):
+                config_path = state_dir / "config.json"
+                if config_path.is_file():
+                    with open(config_path, "r") as f:
+                        configs.setdefault(piece_dir.name, {})[state_dir.name] = json.load(f)
+
+        header = json.dumps({
+            'fingerprint': source_fingerprint,
+            'size': list(size),
+            'shape': list(atlas.frames.shape),
+            'index': [[piece, state, start, end] for (piece, state), (start, end) in atlas.index.items()],
+            'moves': moves,
+            'configs': configs,
+        }).encode("utf-8")
+        prefix = len(MAGIC) + 8 + len(header)
+        padding = b"\0" * (-prefix % ALIGN)
+
+        # כתיבה לקובץ זמני והחלפה אטומית - תהליך שקורא את הבאנדל הישן לא רואה קובץ חצי כתוב
+        tmp_path = bundle_path.with_name(bundle_path.name + f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            f.write(padding)
+            f.write(np.ascontiguousarray(atlas.frames).tobytes())
+        try:
+            os.replace(tmp_path, bundle_path)
+        except OSError as e:
+            # ב-Windows אי אפשר להחליף קובץ שתהליך אחר ממפה - ממשיכים עם מה שנבנה בזיכרון
+            print(f"⚠️ AssetBundle: could not replace {bundle_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return cls(atlas, moves, configs, source_fingerprint)
+        print(f"📦 AssetBundle: compiled {pieces_root} -> {bundle_path}")
+        return cls.load(bundle_path)
+
+    # ─── load ────────────────────────────────────────────────────────────────
+    @staticmethod
+    def read_header(bundle_path: pathlib.Path) -> Tuple[dict, int]:
+        """Return (header, offset of the frames) - raises ValueError if this is not a bundle."""
+        with open(bundle_path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{bundle_path} is not an asset bundle")
+            (header_len,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+        prefix = len(MAGIC) + 8 + header_len
+        return header, prefix + (-prefix % ALIGN)
+
+    @classmethod
+    def load(cls, bundle_path: pathlib.Path) -> "AssetBundle":
+        """Memory-map an existing bundle file (no freshness check)."""
+        bundle_path = pathlib.Path(bundle_path)
+        header, offset = cls.read_header(bundle_path)
+        shape = tuple(header['shape'])
+        if shape[0]:
+            frames = np.memmap(bundle_path, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+        else:
+            frames = np.empty(shape, dtype=np.uint8)
+        index = {(piece, state): (start, end) for piece, state, start, end in header['index']}
+        return cls(SpriteAtlas(frames, index), header['moves'], header['configs'], header['fingerprint'], bundle_path)
+
+    @classmethod
+    def open(cls, pieces_root: pathlib.Path, size: Tuple[int, int] = (80, 80),
+             bundle_path: Optional[pathlib.Path] = None) -> "AssetBundle":
+        """
+        Process-wide bundle per (pieces_root, size): memory-mapped from disk when the
+        file is up to date with the pieces tree, otherwise (re)compiled first.
+        """
+        size = (int(size[0]), int(size[1]))
+        key = (str(pathlib.Path(pieces_root).resolve()), size)
+        with cls._shared_lock:
+            bundle = cls._shared.get(key)
+            if bundle is None:
+                bundle = cls._open_fresh(pathlib.Path(pieces_root), size, bundle_path)
+                cls._shared[key] = bundle
+            return bundle
+
+    @classmethod
+    def _open_fresh(cls, pieces_root: pathlib.Path, size: Tuple[int, int],
+                    bundle_path: Optional[pathlib.Path]) -> "AssetBundle":
+        bundle_path = pathlib.Path(bundle_path) if bundle_path else default_bundle_path(pieces_root, size)
+        if bundle_path.is_file():
+            try:
+                header, _ = cls.read_header(bundle_path)
+                if header['fingerprint'] == fingerprint(pieces_root) and tuple(header['size']) == size:
+                    print(f"📦 AssetBundle: mapped {bundle_path}")
+                    return cls.load(bundle_path)
+                print(f"📦 AssetBundle: {bundle_path} is stale - rebuilding")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ AssetBundle: cannot read {bundle_path}: {e} - rebuilding")
+        return cls.compile(pieces_root, bundle_path, size)
+
+    # ─── lookups ─────────────────────────────────────────────────────────────
+    def has_piece(self, piece_type: str) -> bool:
+        return piece_type in self._moves and piece_type in self._configs
+
+    def states(self, piece_type: str) -> List[str]:
+        """State folders of a piece type that have a config.json."""
+        return list(self._configs.get(piece_type, {}))
+
+    def moves(self, piece_type: str) -> List[Tuple[int, int, str]]:
+        """Parsed moves.txt of a piece type - a new list, the caller may keep it."""
+        return [(dx, dy, move_type) for dx, dy, move_type in self._moves[piece_type]]
+
+    def config(self, piece_type: str, state: str) -> dict:
+        """config.json of a piece state - a copy, the caller may change it."""
+        return copy.deepcopy(self._configs[piece_type][state])
+
+
+if __name__ == "__main__":
+    # שלב build: python -m It1_interfaces.AssetBundle <pieces_root> [width height]
+    import sys
+    root = pathlib.Path(sys.argv[1])
+    bundle_size = (int(sys.argv[2]), int(sys.argv[3])) if len(sys.argv) > 3 else (80, 80)
+    AssetBundle.compile(root, default_bundle_path(root, bundle_size), bundle_size)
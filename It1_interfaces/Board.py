@@ -1,7 +1,25 @@
+import math
 from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
 
 from  It1_interfaces.img import Img  # ייבוא מוחלט במקום יחסי
 
+# שדות שמשפיעים על הגאומטריה - שינוי שלהם בונה מחדש את טבלאות ה-lookup
+_GEOMETRY_FIELDS = ("cell_H_pix", "cell_W_pix", "W_cells", "H_cells")
+
+
+def _edges(cell_pix: float, cells: int) -> np.ndarray:
+    """
+    Pixel edges of cells 0..cells (cells+1 values). Edge i is floor(i * cell_pix) -
+    for i >= 0 the same as the original int() truncation - with a small epsilon so float noise
+    (e.g. 2.9999999) never moves a cell by a pixel. Fractional sizes are thereby
+    spread over the board and every machine gets the same integers.
+    """
+    return np.array([math.floor(i * cell_pix + 1e-6) for i in range(cells + 1)], dtype=np.int32)
+
+
 @dataclass
 class Board:
     cell_H_pix: int
@@ -12,6 +30,11 @@ class Board:
     H_cells: int
     img: Img
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in _GEOMETRY_FIELDS:
+            object.__setattr__(self, "_lut", None)
+
     def clone(self) -> "Board":
         new_img = Img()
         new_img.img = self.img.img.copy() if self.img.img is not None else None
@@ -25,12 +48,61 @@ class Board:
             img=new_img
         )
 
+    # ─── lookup tables ───────────────────────────────────────────────────────
+    def _tables(self):
+        lut = getattr(self, "_lut", None)
+        if lut is None:
+            col_edges = _edges(self.cell_W_pix, int(self.W_cells))
+            row_edges = _edges(self.cell_H_pix, int(self.H_cells))
+            # גם כ-tuple של int רגילים - גישה לאינדקס מהירה יותר מ-numpy לתא בודד
+            lut = (col_edges, row_edges, tuple(int(v) for v in col_edges), tuple(int(v) for v in row_edges))
+            object.__setattr__(self, "_lut", lut)
+        return lut
+
+    @property
+    def col_edges(self) -> np.ndarray:
+        """x pixel of every vertical grid line, W_cells+1 values."""
+        return self._tables()[0]
+
+    @property
+    def row_edges(self) -> np.ndarray:
+        """y pixel of every horizontal grid line, H_cells+1 values."""
+        return self._tables()[1]
+
     def cell_to_pixel(self, cell: tuple[int, int]) -> tuple[int, int]:
         """
         ממיר מיקום תא (עמודה, שורה) למיקום בפיקסלים על המסך.
         cell = (x, y) כשמערכת הקואורדינטות היא (עמודה, שורה)
         """
         x, y = cell  # x=עמודה, y=שורה
-        pixel_x = int(x * self.cell_W_pix)
-        pixel_y = int(y * self.cell_H_pix)
-        return pixel_x, pixel_y
+        _, _, xs, ys = self._tables()
+        if 0 <= x < len(xs) and 0 <= y < len(ys):
+            return xs[x], ys[y]
+        # מחוץ ללוח - הנוסחה המקורית, int() חותך לכיוון 0 (גם בתאים שליליים)
+        return int(x * self.cell_W_pix + 1e-6), int(y * self.cell_H_pix + 1e-6)
+
+    def cell_rect(self, cell: tuple[int, int]) -> Tuple[int, int, int, int]:
+        """(x0, y0, x1, y1) of a cell, x1/y1 exclusive. Neighbouring cells share edges exactly."""
+        x, y = cell
+        _, _, xs, ys = self._tables()
+        return xs[x], ys[y], xs[x + 1], ys[y + 1]
+
+    def cells_to_pixels(self, cells) -> np.ndarray:
+        """Vectorized cell_to_pixel: (N, 2) array of (x, y) cells -> (N, 2) int32 pixels."""
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        col_edges, row_edges, _, _ = self._tables()
+        xs, ys = cells[:, 0], cells[:, 1]
+        inside = (xs >= 0) & (xs < len(col_edges)) & (ys >= 0) & (ys < len(row_edges))
+        if inside.all():
+            return np.stack([col_edges[xs], row_edges[ys]], axis=1)
+        out = np.stack([np.trunc(xs * self.cell_W_pix + 1e-6), np.trunc(ys * self.cell_H_pix + 1e-6)],
+                       axis=1).astype(np.int32)
+        out[inside] = np.stack([col_edges[xs[inside]], row_edges[ys[inside]]], axis=1)
+        return out
+
+    def cell_rects(self, cells) -> np.ndarray:
+        """Vectorized cell_rect: (N, 2) cells on the board -> (N, 4) int32 (x0, y0, x1, y1)."""
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        col_edges, row_edges, _, _ = self._tables()
+        xs, ys = cells[:, 0], cells[:, 1]
+        return np.stack([col_edges[xs], row_edges[ys], col_edges[xs + 1], row_edges[ys + 1]], axis=1)
@@ -0,0 +1,151 @@
+# BoardRenderer.py - Dirty-rectangle compositing of pieces and cursors onto a persistent board frame
+from typing import Dict, List, Optional, Tuple
+import cv2
+from It1_interfaces.Board import Board
+
+# (x0, y0, x1, y1) in board pixels, x1/y1 exclusive
+Rect = Tuple[int, int, int, int]
+# (top_left, bottom_right, color, thickness) - same arguments cv2.rectangle gets
+Box = Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, ...], int]
+
+
+def _intersects(a: Rect, b: Rect) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def snapshot_sprites(pieces) -> List[Tuple[object, object, Tuple[int, int]]]:
+    """
+    (piece, frame Img, (x, y)) for every drawable piece, read now.
+    The result does not change when the pieces move on, so it can be rendered later
+    or on another thread (the piece is kept only as an identity key).
+    """
+    sprites = []
+    for piece in pieces:
+        state = getattr(piece, "_state", None)
+        graphics = getattr(state, "_graphics", None)
+        physics = getattr(state, "_physics", None)
+        if graphics is None or physics is None:
+            continue
+        pixel_pos = getattr(physics, "pixel_pos", None)
+        sprite = graphics.get_img()
+        if pixel_pos is None or sprite is None or getattr(sprite, "img", None) is None:
+            continue
+        sprites.append((piece, sprite, (int(pixel_pos[0]), int(pixel_pos[1]))))
+    return sprites
+
+
+class BoardRenderer:
+    """
+    Keeps a persistent frame buffer of the board and redraws only the regions
+    that changed since the previous frame (piece moves, animation frame
+    changes, cursor and selection moves).
+    """
+
+    def __init__(self, board: Board):
+        self.board = board
+        self.frame = board.clone()              # persistent frame buffer
+        self._background = board.img.img        # pristine pixels, never drawn on
+        self._height, self._width = self._background.shape[:2]
+
+        # id(piece) -> (piece, rect, frame Img) as drawn in the previous frame
+        self._drawn_sprites: Dict[int, Tuple[object, Rect, object]] = {}
+        self._drawn_boxes: List[Box] = []
+        self._full_redraw = True
+
+        # regions rewritten by the last render() call, for callers that mirror the frame
+        self.last_dirty_rects: List[Rect] = []
+
+    def invalidate(self):
+        """Force a full redraw on the next render (e.g. after the board image changed)."""
+        self._full_redraw = True
+
+    def render(self, pieces, boxes: Optional[List[Box]] = None) -> Board:
+        """Bring the frame buffer up to date and return it."""
+        return self.render_sprites(snapshot_sprites(pieces), boxes)
+
+    def render_sprites(self, sprite_list, boxes: Optional[List[Box]] = None) -> Board:
+        """Same as render(), from a snapshot_sprites() list instead of live pieces."""
+        boxes = list(boxes or [])
+        sprites = self._collect_sprites(sprite_list)
+
+        if self._full_redraw:
+            dirty = [(0, 0, self._width, self._height)]
+        else:
+            dirty = self._changed_rects(sprites, boxes)
+
+        if not dirty:
+            self.last_dirty_rects = []
+            return self.frame
+
+        # Anything overlapping a dirty region must be redrawn in full, otherwise
+        # its semi-transparent pixels would be blended twice; its own rect becomes dirty too.
+        redraw_sprites = set()
+        redraw_boxes = set()
+        changed = True
+        while changed:
+            changed = False
+            for key, (_, rect, _, _) in sprites.items():
+                if key not in redraw_sprites and any(_intersects(rect, d) for d in dirty):
+                    redraw_sprites.add(key)
+                    dirty.append(rect)
+                    changed = True
+            for i, box in enumerate(boxes):
+                if i not in redraw_boxes:
+                    rect = self._box_rect(box)
+                    if any(_intersects(rect, d) for d in dirty):
+                        redraw_boxes.add(i)
+                        dirty.append(rect)
+                        changed = True
+
+        frame_img = self.frame.img.img
+        for x0, y0, x1, y1 in dirty:
+            frame_img[y0:y1, x0:x1] = self._background[y0:y1, x0:x1]
+
+        for key, (_, _, sprite, pos) in sprites.items():
+            if key in redraw_sprites:
+                sprite.draw_on(self.frame.img, pos[0], pos[1])
+
+        for i, (top_left, bottom_right, color, thickness) in enumerate(boxes):
+            if i in redraw_boxes:
+                cv2.rectangle(frame_img, top_left, bottom_right, color, thickness)
+
+        self._drawn_sprites = {key: (piece, rect, sprite) for key, (piece, rect, sprite, _) in sprites.items()}
+        self._drawn_boxes = boxes
+        self._full_redraw = False
+        self.last_dirty_rects = dirty
+        return self.frame
+
+    # ─── helpers ─────────────────────────────────────────────────────────────
+    def _collect_sprites(self, sprite_list) -> Dict[int, Tuple[object, Rect, object, Tuple[int, int]]]:
+        sprites = {}
+        for piece, sprite, (x, y) in sprite_list:
+            h, w = sprite.img.shape[:2]
+            sprites[id(piece)] = (piece, self._clip((x, y, x + w, y + h)), sprite, (x, y))
+        return sprites
+
+    def _changed_rects(self, sprites, boxes: List[Box]) -> List[Rect]:
+        dirty = []
+        for key, (_, rect, sprite, _) in sprites.items():
+            prev = self._drawn_sprites.get(key)
+            if prev is None:
+                dirty.append(rect)
+            elif prev[1] != rect or prev[2] is not sprite:
+                dirty.append(prev[1])
+                dirty.append(rect)
+        for key, (_, rect, _) in self._drawn_sprites.items():
+            if key not in sprites:
+                dirty.append(rect)      # piece was captured / removed
+
+        if boxes != self._drawn_boxes:
+            for box in set(self._drawn_boxes).symmetric_difference(boxes):
+                dirty.append(self._box_rect(box))
+        return [r for r in dirty if r[0] < r[2] and r[1] < r[3]]
+
+    def _box_rect(self, box: Box) -> Rect:
+        (x0, y0), (x1, y1), _, thickness = box
+        pad = thickness // 2 + 1   # cv2 draws thick lines centred on the edge
+        return self._clip((min(x0, x1) - pad, min(y0, y1) - pad, max(x0, x1) + pad + 1, max(y0, y1) + pad + 1))
+
+    def _clip(self, rect: Rect) -> Rect:
+        x0, y0, x1, y1 = rect
+        return (max(0, x0), max(0, y0), min(self._width, x1), min(self._height, y1))
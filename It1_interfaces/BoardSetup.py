@@ -0,0 +1,112 @@
+# BoardSetup.py - Starting layout of the pieces, loaded from a CSV file (pieces/board.csv)
+import csv
+import os
+import pathlib
+import random
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# (piece_id, piece_type, (col, row))
+Placement = Tuple[str, str, Tuple[int, int]]
+
+# פתיחה רגילה - כש-board.csv חסר בתיקיית הכלים
+STANDARD_ROWS = (
+    ("RB", "NB", "BB", "QB", "KB", "BB", "NB", "RB"),
+    ("PB",) * 8,
+    (), (), (), (),
+    ("PW",) * 8,
+    ("RW", "NW", "BW", "QW", "KW", "BW", "NW", "RW"),
+)
+
+
+class BoardSetup:
+    """
+    Where every piece starts. The CSV has one line per board row (row 0 on top)
+    and one column per file; a cell holds a piece type ("RB", "PW", ...) or is empty.
+    Piece IDs are assigned in bulk in reading order: type + running number per type
+    (RB0 at (0, 0), RB1 at (7, 0), ...), the same IDs the game used to assign by hand.
+    """
+
+    _shared: Dict[str, "BoardSetup"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, pieces: Iterable[Tuple[str, Tuple[int, int]]]):
+        self.pieces: Tuple[Tuple[str, Tuple[int, int]], ...] = tuple(
+            (p_type, (int(col), int(row))) for p_type, (col, row) in pieces)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[str]]) -> "BoardSetup":
+        return cls((cell.strip(), (col, row))
+                   for row, cells in enumerate(rows)
+                   for col, cell in enumerate(cells) if cell.strip())
+
+    @classmethod
+    def from_csv(cls, path) -> "BoardSetup":
+        with open(path, "r", newline="") as f:
+            return cls.from_rows(list(csv.reader(f)))
+
+    @classmethod
+    def standard(cls) -> "BoardSetup":
+        return cls.from_rows(STANDARD_ROWS)
+
+    @classmethod
+    def shared(cls, path) -> "BoardSetup":
+        """Parse a layout file once per process - every room starts from the same parsed setup."""
+        key = str(pathlib.Path(path).resolve())
+        with cls._shared_lock:
+            setup = cls._shared.get(key)
+            if setup is None:
+                setup = cls._shared[key] = cls.from_csv(path)
+            return setup
+
+    def placements(self) -> List[Placement]:
+        """(piece_id, piece_type, cell) for every piece, IDs assigned in one pass."""
+        counters: Dict[str, int] = {}
+        result = []
+        for p_type, cell in self.pieces:
+            index = counters.get(p_type, 0)
+            counters[p_type] = index + 1
+            result.append((f"{p_type}{index}", p_type, cell))
+        return result
+
+    def piece_types(self) -> List[str]:
+        return sorted({p_type for p_type, _ in self.pieces})
+
+    def shuffled(self, seed: Optional[int] = None) -> "BoardSetup":
+        """
+        Random layout: the files of all non-pawn pieces are permuted with one
+        permutation, so both back ranks stay mirrored (like Chess960, without its rules).
+        """
+        columns = sorted({col for _, (col, _) in self.pieces})
+        order = columns[:]
+        random.Random(seed).shuffle(order)
+        perm = dict(zip(columns, order))
+        return BoardSetup((p_type, (col if p_type.startswith("P") else perm[col], row))
+                          for p_type, (col, row) in self.pieces)
+
+    def __len__(self):
+        return len(self.pieces)
+
+
+def load_setup(pieces_root: pathlib.Path) -> BoardSetup:
+    """
+    The layout a new game starts from: CHESS_LAYOUT=<csv> or <pieces_root>/board.csv,
+    the standard layout when the pieces tree has no board.csv.
+    CHESS_LAYOUT_SEED=<number> shuffles the back ranks with that seed, "random" with a new one each game.
+    """
+    layout = os.environ.get("CHESS_LAYOUT")
+    if layout:
+        if not pathlib.Path(layout).is_file():
+            raise FileNotFoundError(f"CHESS_LAYOUT={layout}: layout file not found")
+        setup = BoardSetup.shared(layout)
+    else:
+        path = pathlib.Path(pieces_root) / "board.csv"
+        if path.is_file():
+            setup = BoardSetup.shared(path)
+        else:
+            print(f"⚠️ No {path} - starting from the standard layout")
+            setup = BoardSetup.standard()
+    seed = os.environ.get("CHESS_LAYOUT_SEED")
+    if seed:
+        setup = setup.shuffled(None if seed == "random" else int(seed))
+    return setup
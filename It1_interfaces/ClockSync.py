@@ -0,0 +1,39 @@
+# ClockSync.py - Estimates the server's game clock on a client from timestamped state messages
+import time
+from collections import deque
+from typing import Optional
+
+
+class ClockSync:
+    """
+    Every state message carries the server's time when it was sent. The gap
+    between that and the local receive time is the clock offset plus the
+    network delay; the smallest gap of the recent samples is the best estimate
+    of the offset (the message that waited least). A sliding window lets the
+    estimate follow slow drift instead of sticking to one lucky sample.
+    """
+
+    def __init__(self, window: int = 32):
+        self._samples: "deque[float]" = deque(maxlen=window)
+        self.offset_ms: Optional[float] = None   # local - server
+
+    @staticmethod
+    def local_ms() -> float:
+        return time.monotonic() * 1000
+
+    def observe(self, server_ms: float, local_ms: Optional[float] = None):
+        """Record one message: server send time and local receive time (default: now)."""
+        if local_ms is None:
+            local_ms = self.local_ms()
+        self._samples.append(local_ms - server_ms)
+        self.offset_ms = min(self._samples)
+
+    @property
+    def synced(self) -> bool:
+        return self.offset_ms is not None
+
+    def server_now(self, local_ms: Optional[float] = None) -> float:
+        """Current server time as estimated from the local clock."""
+        if local_ms is None:
+            local_ms = self.local_ms()
+        return local_ms - (self.offset_ms or 0.0)
@@ -0,0 +1,116 @@
+# FrameCache.py - Process-wide flyweight cache of decoded sprite frames
+import pathlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import cv2
+from It1_interfaces.img import Img
+
+
+class FrameCache:
+    """
+    LRU cache of decoded sprite frame lists, keyed by (piece type, state, size).
+    All pieces of the same type share the same Img objects, so a state switch
+    is a list lookup instead of reading and decoding PNGs from disk.
+
+    Several sizes of the same sprites can live side by side (like mipmaps):
+    get_scaled() builds a missing size lazily, always from the decoded PNGs at
+    their own resolution (resizing an already resized frame loses detail).
+    The decoded PNGs are kept outside the LRU, so they are never evicted and a
+    later size does not decode them again.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, List[Img]]" = OrderedDict()
+        self._sources: Dict[str, List[Img]] = {}   # folder -> הפריימים ברזולוציה המקורית, לא נכנסים ל-LRU
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, loader: Callable[[], List[Img]]) -> List[Img]:
+        """Return the frames for key, calling loader() only on a miss."""
+        with self._lock:
+            frames = self._entries.get(key)
+            if frames is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return frames
+
+        # טעינה מחוץ ל-lock כדי לא לחסום thread-ים אחרים בזמן קריאה מהדיסק
+        frames = loader()
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:      # thread אחר טען במקביל - נשתמש בשלו
+                self._entries.move_to_end(key)
+                return existing
+            self.misses += 1
+            self._entries[key] = frames
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return frames
+
+    def get_scaled(self, sprites_folder, size: Tuple[int, int]) -> List[Img]:
+        """Frames of a <type>/states/<state>/sprites folder resized to size=(width, height)."""
+        folder = str(sprites_folder)
+        size = (int(size[0]), int(size[1]))
+        return self.get((folder, size), lambda: self._build_scale(folder, size))
+
+    def cached_sizes(self, sprites_folder) -> List[Tuple[int, int]]:
+        folder = str(sprites_folder)
+        with self._lock:
+            return [key[1] for key in self._entries
+                    if isinstance(key, tuple) and len(key) == 2 and key[0] == folder]
+
+    def source_frames(self, sprites_folder) -> List[Img]:
+        """The PNGs of a sprites folder decoded at their own resolution (decoded once, never evicted)."""
+        folder = str(sprites_folder)
+        with self._lock:
+            frames = self._sources.get(folder)
+        if frames is not None:
+            return frames
+        frames = self._decode(folder)
+        with self._lock:
+            return self._sources.setdefault(folder, frames)   # thread אחר פענח במקביל - נשתמש בשלו
+
+    @staticmethod
+    def _decode(folder: str) -> List[Img]:
+        frames = []
+        for img_path in sorted(pathlib.Path(folder).glob("*.png")):
+            img = Img().read(img_path)
+            if img.img is not None:
+                frames.append(img)
+        return frames
+
+    def _build_scale(self, folder: str, size: Tuple[int, int]) -> List[Img]:
+        # תמיד מהרזולוציה המקורית (מפוענחת פעם אחת) - לא מגודל שכבר הוקטן
+        sources = [frame.img for frame in self.source_frames(folder) if frame.img is not None]
+
+        frames = []
+        for src in sources:
+            shrinking = src.shape[1] >= size[0] and src.shape[0] >= size[1]
+            img = Img()
+            img.img = cv2.resize(src, size, interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR)
+            img._blit_data(4 if img.img.ndim == 3 and img.img.shape[2] == 4 else 3)
+            frames.append(img)
+        return frames if frames else [Img()]  # לפחות פריים ריק
+
+    def peek(self, key: Hashable) -> Optional[List[Img]]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sources.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Global frame cache instance
+frame_cache = FrameCache()
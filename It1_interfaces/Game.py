@@ -9,19 +9,42 @@ from It1_interfaces.img  import Img
 from It1_interfaces.Board  import Board
 from It1_interfaces.Command  import Command
 from It1_interfaces.Piece  import Piece
+from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.OccupancyIndex import OccupancyIndex
+from It1_interfaces.MoveGenerator import MoveGenerator
+from It1_interfaces.PieceRegistry import PieceRegistry
 from It1_interfaces.EventSystem import Event, EventType, event_publisher
 from It1_interfaces.MessageOverlay import MessageOverlay
 from It1_interfaces.ScoreSystem import ScoreSystem
 from It1_interfaces.MovesLog import MovesLog
 from It1_interfaces.SoundSystem import SoundSystem
+from It1_interfaces.BoardRenderer import snapshot_sprites
+from It1_interfaces.LayeredCanvas import LayeredCanvas
+from It1_interfaces.RenderWorker import FrameComposer, FrameSnapshot, RenderWorker
+from It1_interfaces.LoopScheduler import LoopScheduler
+from It1_interfaces.TickProfiler import TickProfiler
+from It1_interfaces.RenderTarget import RenderTarget, WindowTarget
+from It1_interfaces.VideoRecorder import VideoRecorder
 
 class InvalidBoard(Exception): ...
+
+PROMOTION_TYPES = ("QW", "QB")  # הכלים שחייל יכול להפוך אליהם
 # ────────────────────────────────────────────────────────────────────
 class Game:
     def __init__(self, pieces: List[Piece], board: Board, 
-                 player1_name: str = "Player 1", player2_name: str = "Player 2",extended_img: Optional[np.ndarray] = None):
+                 player1_name: str = "Player 1", player2_name: str = "Player 2",extended_img: Optional[np.ndarray] = None,
+                 tick_hz: float = 60.0, render_hz: float = 60.0,
+                 render_target: Optional[RenderTarget] = None, threaded_render: bool = False,
+                 profiler: Optional[TickProfiler] = None, piece_factory: Optional[PieceFactory] = None):
         """Initialize the game with pieces and board."""
         self.pieces = pieces  # שמור כרשימה במקום כמילון
+        # משבצת -> כלי, מתעדכן בתחילת תנועה/הגעה/תפיסה/הכתרה במקום סריקה של כל הרשימה
+        self.occupancy = OccupancyIndex(self._get_piece_position, self._get_piece_target,
+                                        color_of=lambda piece: piece.piece_id[1:2])
+        # טבלות יעדים וקרניים - בדיקת חוקיות ונתיב בפעולות על bitboard
+        self.move_generator = MoveGenerator.shared(8, 8)
+        # piece_id -> כלי, ספירה לפי סוג ומלכים לפי צבע - שליחת פקודות ובדיקת נצחון בלי סריקה
+        self.registry = PieceRegistry()
         self.board = board
         self.user_input_queue = queue.Queue()
         self.extended_img=extended_img
@@ -29,6 +52,23 @@ class Game:
         self.player1_name = player1_name  # שחקן 1 - כלים לבנים
         self.player2_name = player2_name  # שחקן 2 - כלים שחורים
         
+        # קצב סימולציה (טיקים קבועים) וקצב ציור - בלתי תלויים זה בזה
+        self.tick_hz = tick_hz
+        self.render_hz = render_hz
+        # חלון OpenCV כברירת מחדל, OffscreenTarget לריצה בלי מסך
+        self.render_target = render_target if render_target is not None else WindowTarget("Chess Game")
+        self.recorder: Optional[VideoRecorder] = None  # הקלטת משחק ברקע (start_recording)
+        # ציור הפריים ב-thread נפרד לשני באפרים - ה-thread הראשי רק מציג
+        self.threaded_render = threaded_render
+        # זמני כל שלב בלולאה (H - תצוגה על המסך, P - שמירה לקובץ); כבוי - כמעט בלי עלות
+        self.profiler = profiler if profiler is not None else TickProfiler()
+        # ספריית תבניות הכלים - ההכתרה יוצרת מלכה ממנה בלי לגעת בדיסק באמצע טיק
+        self.piece_factory = piece_factory
+        if piece_factory is not None:
+            piece_factory.preload(PROMOTION_TYPES)
+        else:
+            self._load_fallback_factory()
+        
         # מערכת שני שחקנים - ללא תורות
         self.selected_piece_player1 = None  # הכלי הנבחר של שחקן 1 (מקשי מספרים)
         self.selected_piece_player2 = None  # הכלי הנבחר של שחקן 2 (WASD)
@@ -57,6 +97,11 @@ class Game:
         self.sound_system = SoundSystem()
         print("🔊 SoundSystem initialized")
         
+        # לוח עם מלבנים מלוכלכים + חלון מורחב מוקצה פעם אחת - נוצרים בפריים הראשון
+        self._composer: Optional[FrameComposer] = None
+        self._render_worker: Optional[RenderWorker] = None
+        self._panel_snapshots: Dict[str, tuple] = {}  # name -> (version, draw_fn) - עותק חדש רק כשהגרסה משתנה
+        
         # הגדלת חלון - חישוב גדלים חדשים
         self.original_board_size = (board.img.img.shape[1], board.img.img.shape[0])  # (width, height)
         self.ui_panel_width = 300  # רוחב פאנל ממשק המשתמש
@@ -88,6 +133,7 @@ class Game:
     def run(self):
         """Main game loop."""
         self.start_user_input_thread()
+        self._load_fallback_factory()   # כלים שהוצבו אחרי הבנייה - עדיין לפני הטיק הראשון
 
         start_ms = self.game_time_ms()
         for p in self.pieces:
@@ -101,38 +147,30 @@ class Game:
             'start_time': start_ms
         })
 
+        scheduler = LoopScheduler(self.tick_hz, self.render_hz)
+        scheduler.start(start_ms)
+
         # ─────── main loop ──────────────────────────────────────────────────
         while not self.game_over:
-            now = self.game_time_ms()
-
-            # (1) update physics & animations
-            for p in self.pieces:
-                p.update(now)
-
-            # (2) update new systems
-            self.message_overlay.update(now / 1000.0)  # Convert to seconds
-
-            # (3) handle queued Commands from mouse thread
-            while not self.user_input_queue.empty():
-                print("📥 יש קומנד בתור!")  # DEBUG
-                cmd: Command = self.user_input_queue.get()
-                print("📥 cmd:", cmd)  # DEBUG
-                self._process_input(cmd)
-                # בדוק אם המשחק נגמר
+            # (1) simulation - fixed timestep, keeps running without any key press
+            for tick_ms in scheduler.due_ticks(self.game_time_ms()):
+                self._tick(tick_ms)
                 if self.game_over:
                     break
 
-            # (4) draw current position
-            self._draw()
-            if not self._show():           # returns False if user closed window
+            # (2) draw current position - at the render rate, late frames are skipped
+            if scheduler.render_due(self.game_time_ms()):
+                with self.profiler.stage("draw"):
+                    self._draw()
+
+            # (3) non-blocking input polling
+            with self.profiler.stage("show"):
+                keep_running = self._show()
+            if not keep_running:           # returns False if user closed window
                 break
 
-            # (5) detect captures
-            self._resolve_collisions()
-            
-            # (6) שליטה בקצב פריימים - 60 FPS
-            import time
-            time.sleep(1/60.0)  # ~16.7ms המתנה
+            # (4) sleep only for what's left of the frame budget
+            scheduler.sleep_until_next(self.game_time_ms())
 
         # אם המשחק נגמר בגלל נצחון ולא בגלל סגירת החלון
         if self.game_over:
@@ -150,7 +188,36 @@ class Game:
         else:
             print("🎮 המשחק נגמר!")
             print("🎮 Game Over!")
-        cv2.destroyAllWindows()
+        self.stop_recording()
+        self._stop_render_worker()
+        self.render_target.close()
+
+    def _tick(self, now: int):
+        """Advance the simulation by one fixed step."""
+        profiler = self.profiler
+        # (1) update physics & animations
+        with profiler.stage("pieces.update"):
+            for p in self.pieces:
+                p.update(now)
+
+        # (2) update new systems
+        with profiler.stage("overlay.update"):
+            self.message_overlay.update(now / 1000.0)  # Convert to seconds
+
+        # (3) handle queued Commands from mouse thread
+        with profiler.stage("commands"):
+            while not self.user_input_queue.empty():
+                print("📥 יש קומנד בתור!")  # DEBUG
+                cmd: Command = self.user_input_queue.get()
+                print("📥 cmd:", cmd)  # DEBUG
+                self._process_input(cmd)
+                # בדוק אם המשחק נגמר
+                if self.game_over:
+                    return
+
+        # (4) detect captures
+        with profiler.stage("collisions"):
+            self._resolve_collisions()
 
     # ─── drawing helpers ────────────────────────────────────────────────────
     def _process_input(self, cmd : Command):
@@ -158,37 +225,33 @@ class Game:
             self._handle_arrival(cmd)
             return
         
-        for piece in self.pieces:
-            if piece.piece_id == cmd.piece_id:
-                # פרסום אירוע תחילת תנועה
-                event_publisher.publish(EventType.PIECE_MOVE_START, {
-                    'piece_id': piece.piece_id,
-                    'from_position': self._get_piece_position(piece),
-                    'to_position': cmd.target,
-                    'timestamp': self.game_time_ms()
-                })
-                
-                piece.on_command(cmd, self.game_time_ms())
-                
-                # 🏆 בדיקת תנאי נצחון אחרי כל תנועה!
-                if self._is_win():
-                    self._announce_win()
-                    self.game_over = True  # סמן שהמשחק נגמר
-                    return  # עצור את המשחק
-                break
-        else:
+        piece = self.registry.get(self.pieces, cmd.piece_id)
+        if piece is None:
             print(f"❌ לא נמצא כלי עם ID: {cmd.piece_id}")
+            return
+
+        # פרסום אירוע תחילת תנועה
+        event_publisher.publish(EventType.PIECE_MOVE_START, {
+            'piece_id': piece.piece_id,
+            'from_position': self._get_piece_position(piece),
+            'to_position': cmd.target,
+            'timestamp': self.game_time_ms()
+        })
+        
+        piece.on_command(cmd, self.game_time_ms())
+        self.occupancy.update(self.pieces, piece)  # יעד התנועה נתפס / קפיצה מזיזה מיד
+        
+        # 🏆 בדיקת תנאי נצחון אחרי כל תנועה!
+        if self._is_win():
+            self._announce_win()
+            self.game_over = True  # סמן שהמשחק נגמר
 
     def _handle_arrival(self, cmd: Command):
         """Handle piece arrival and check for captures."""
         print(f"🏁 כלי הגיע ליעד: {cmd.piece_id}")
         
         # מצא את הכלי שהגיע ליעד
-        arriving_piece = None
-        for piece in self.pieces:
-            if piece.piece_id == cmd.piece_id:
-                arriving_piece = piece
-                break
+        arriving_piece = self.registry.get(self.pieces, cmd.piece_id)
         
         if not arriving_piece:
             print(f"❌ לא נמצא כלי שהגיע: {cmd.piece_id}")
@@ -196,6 +259,7 @@ class Game:
         
         # קבל את המיקום של הכלי שהגיע
         target_pos = arriving_piece._state._physics.cell
+        self.occupancy.update(self.pieces, arriving_piece)
         
         # פרסום אירוע סיום תנועה
         event_publisher.publish(EventType.PIECE_MOVE_END, {
@@ -216,16 +280,10 @@ class Game:
         self._check_pawn_promotion(arriving_piece, target_pos)
         
         print(f"🎯 בודק תפיסה במיקום {target_pos}")
-        print(f"🔍 רשימת כל הכלים והמיקומים שלהם:")
         
-        # הצג את כל הכלים והמיקומים שלהם
-        for piece in self.pieces:
-            piece_pos = piece._state._physics.cell
-            print(f"   {piece.piece_id} במיקום {piece_pos}")
-        
-        # חפש כלי יריב באותו מיקום
+        # חפש כלי יריב באותו מיקום - רק הכלים שבמשבצת, לא כל הלוח
         pieces_to_remove = []
-        for piece in self.pieces:
+        for piece in self.occupancy.all_at(self.pieces, target_pos):
             if piece != arriving_piece:  # לא אותו כלי
                 piece_pos = piece._state._physics.cell
                 print(f"🔍 בודק {piece.piece_id} במיקום {piece_pos} מול {target_pos}")
@@ -270,17 +328,19 @@ class Game:
         for piece in pieces_to_remove:
             if piece in self.pieces:
                 self.pieces.remove(piece)
+                self.occupancy.remove(self.pieces, piece)
+                self.registry.remove(self.pieces, piece)
                 print(f"🗑️ הסרתי {piece.piece_id} מרשימת הכלים")
                 
                 # DEBUG נוסף - ספירת מלכים אחרי הסרה
                 if piece.piece_id in ["KW0", "KB0"]:
-                    remaining_kings = [p.piece_id for p in self.pieces if p.piece_id in ["KW0", "KB0"]]
+                    white_kings = self.registry.kings(self.pieces, "W")
+                    black_kings = self.registry.kings(self.pieces, "B")
+                    remaining_kings = [p.piece_id for p in white_kings + black_kings]
                     print(f"👑 מלכים שנותרו אחרי הסרת {piece.piece_id}: {remaining_kings}")
                     print(f"📊 סה'כ כלים נותרים: {len(self.pieces)}")
                     
                     # בדיקה מיידית של תנאי נצחון
-                    white_kings = [p for p in self.pieces if p.piece_id == "KW0"]
-                    black_kings = [p for p in self.pieces if p.piece_id == "KB0"]
                     print(f"🔍 מלכים לבנים: {len(white_kings)}, מלכים שחורים: {len(black_kings)}")
                     
                     if len(white_kings) == 0:
@@ -321,7 +381,7 @@ class Game:
             # פרסום אירוע הכתרה
             event_publisher.publish(EventType.PAWN_PROMOTED, {
                 'pawn_piece': piece.piece_id,
-                'new_piece': new_piece_type + str(len([p for p in self.pieces if p.piece_id.startswith(new_piece_type)])),
+                'new_piece': self.registry.peek_id(self.pieces, new_piece_type),
                 'position': target_pos,
                 'timestamp': self.game_time_ms()
             })
@@ -332,14 +392,14 @@ class Game:
         """Replace a pawn with a queen at the given position."""
         print(f"🎆 מבצע הכתרה: {pawn.piece_id} -> {queen_type} במיקום {position}")
         
-        # צור מלכה חדשה
-        pieces_root = pathlib.Path(r"C:\Users\סולי\Downloads\chess\chess\CTD25\pieces")
-        from It1_interfaces.PieceFactory  import PieceFactory
-        factory = PieceFactory(self.board, pieces_root)
+        # צור מלכה חדשה מהתבנית הטעונה מראש - אף פעם לא טעינה מהדיסק באמצע טיק
+        factory = self.piece_factory
+        if factory is None:
+            print(f"⚠️ אין ספריית כלים - ההכתרה של {pawn.piece_id} בוטלה")
+            return
         
         # יצירת ID ייחודי למלכה החדשה
-        existing_queens = [p for p in self.pieces if p.piece_id.startswith(queen_type)]
-        queen_id = f"{queen_type}{len(existing_queens)}"
+        queen_id = self.registry.next_id(self.pieces, queen_type)   # מונה עולה - לא מתנגש עם מלכה חיה
         
         # צור מלכה חדשה במיקום הנדרש
         new_queen = factory.create_piece(queen_type, position, self.user_input_queue)
@@ -349,53 +409,111 @@ class Game:
         # הסר את החייל הישן והוסף את המלכה החדשה
         if pawn in self.pieces:
             self.pieces.remove(pawn)
+            self.occupancy.remove(self.pieces, pawn)
+            self.registry.remove(self.pieces, pawn)
             print(f"🗑️ הסרתי חייל: {pawn.piece_id}")
             
         self.pieces.append(new_queen)
+        self.occupancy.add(self.pieces, new_queen)
+        self.registry.add(self.pieces, new_queen)
         print(f"👑 הוספתי מלכה חדשה: {queen_id} במיקום {position}")
         print(f"🎉 הכתרה הושלמה בהצלחה! {pawn.piece_id} -> {queen_id}")
 
+    def _load_fallback_factory(self):
+        """No factory was injected: build one from the pieces' own folder, before the game loop."""
+        if self.piece_factory is not None or not self.pieces:
+            return
+        try:
+            pieces_root = pathlib.Path(list(self.pieces)[0]._state._graphics.piece_states_dir).parent.parent
+            print(f"⚠️ No piece factory given to Game - loading templates from {pieces_root}")
+            factory = PieceFactory(self.board, pieces_root)
+            factory.preload(PROMOTION_TYPES)
+        except Exception as e:
+            print(f"⚠️ לא ניתן לטעון ספריית כלים להכתרה: {e}")
+            return
+        self.piece_factory = factory
+
     def _draw(self):
         """Draw the current game state with enlarged window and UI panels."""
-        # צור עותק נקי של הלוח לכל פריים
-        display_board = self.clone_board()
-        
-        # ציור כל הכלים על העותק
-        now = self.game_time_ms()
-        for p in self.pieces:
-            p.draw_on_board(display_board, now)
-        
-        # ציור סמנים של השחקנים
-        self._draw_cursors(display_board)
-        
-        # יצירת תמונה מורחבת עם פאנלים
-        if hasattr(display_board, "img"):
-            board_img = display_board.img.img
-            
-            # יצירת תמונה חדשה גדולה יותר
-            extended_img = self._create_extended_display(board_img)
-            
-            # ציור הודעות על התמונה
-            self.message_overlay.draw_on_image(extended_img)
-            
-            cv2.imshow("Chess Game", extended_img)
+        snapshot = self._frame_snapshot()
+        if self.threaded_render:
+            worker = self._get_render_worker()
+            worker.submit(snapshot)
+            # לא מחכה - אם הפריים עוד לא מוכן מציגים בפעם הבאה. הבאפר נשאר שלנו עד ה-acquire הבא,
+            # כי extended_img ו-render_target.last_frame מצביעים עליו
+            frame = worker.acquire_frame()
+            if frame is not None:
+                self._present(frame)
+            return
 
-    def _create_extended_display(self, board_img):
-        """Create extended display with UI panels."""
-        import numpy as np
-        
-        # יצירת תמונה חדשה עם גודל מורחב
-        extended_img = np.ones((self.new_window_height, self.new_window_width, 3), dtype=np.uint8) * 240  # רקע אפור בהיר
-        self.extended_img=extended_img
-        # העתקת תמונת הלוח לחלק השמאלי
-        board_height, board_width = board_img.shape[:2]
-        if board_img.shape[2] == 4:
-            board_img = board_img[:, :, :3]  # הסרת ערוץ Alpha
-        x_offset = (self.new_window_width - board_width) // 2
-        y_offset = (self.new_window_height - board_height) // 2
-        extended_img[y_offset:y_offset + board_height, x_offset:x_offset + board_width] = board_img
+        if self._composer is None or self._composer.board is not self.board:
+            self._composer = FrameComposer(self.board, self._build_canvas)
+        self._present(self._composer.compose(snapshot))
 
-        # extended_img[0:board_height, 0:board_width] = board_img
+    def _present(self, frame):
+        self.extended_img = frame
+        self.render_target.present(frame)
+        if self.recorder is not None:
+            self.recorder.push(frame, self.game_time_ms())  # רק עותק לתור - הקידוד ב-thread נפרד
+
+    def _frame_snapshot(self) -> FrameSnapshot:
+        """Copy what the frame shows, so it can be drawn while the game moves on."""
+        panels = {
+            "score": self._panel_snapshot("score", self.score_system),
+            "moves": self._panel_snapshot("moves", self.moves_log),
+            "controls": ((self.player1_name, self.player2_name), self._draw_controls_panel),
+        }
+        overlay = self.message_overlay.snapshot() if self.message_overlay.has_active_messages() else None
+        return FrameSnapshot(tuple(snapshot_sprites(self.pieces)), tuple(self._cursor_boxes()), panels, overlay,
+                             self.profiler.hud())
+
+    def _panel_snapshot(self, name, system):
+        cached = self._panel_snapshots.get(name)
+        if cached is None or cached[0] != system.version:
+            cached = (system.version, system.snapshot().draw_on_image)
+            self._panel_snapshots[name] = cached
+        return cached
+
+    def _get_render_worker(self) -> RenderWorker:
+        if self._render_worker is None or self._render_worker.board is not self.board:
+            self._stop_render_worker()
+            board = self.board
+            # שלושה באפרים: אחד מוצג (מוחזק עד הפריים הבא), אחד מוכן ואחד שה-worker מצייר בו
+            self._render_worker = RenderWorker(lambda: FrameComposer(board, self._build_canvas), buffers=3).start()
+        return self._render_worker
+
+    def _stop_render_worker(self):
+        if self._render_worker is not None:
+            self._render_worker.stop()
+            self._render_worker = None
+
+    def start_recording(self, path, fps: Optional[float] = None, **kwargs) -> VideoRecorder:
+        """Record every drawn frame to a video file (or PNG sequence) in the background."""
+        self.stop_recording()
+        self.recorder = VideoRecorder(path, fps=fps or self.render_hz, **kwargs).start()
+        return self.recorder
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.stop()
+            self.recorder = None
+
+    def render_frame(self) -> Optional[np.ndarray]:
+        """Draw one frame to the render target and return it (valid until the next frame is drawn - copy to keep it)."""
+        if self.threaded_render:
+            # מחכים לפריים של ה-snapshot הזה בדיוק
+            worker = self._get_render_worker()
+            frame = worker.render(self._frame_snapshot())
+            if frame is not None:
+                self._present(frame)   # מוחזק עד הפריים הבא - המתקשר יכול לקודד אותו בבטחה
+            return self.render_target.last_frame
+        self._draw()
+        return self.render_target.last_frame
+
+    def _build_canvas(self, board_width, board_height):
+        """Create the window canvas and its UI panel layers."""
+        canvas = LayeredCanvas(self.new_window_width, self.new_window_height, 240)  # רקע אפור בהיר
+        x_offset, _ = canvas.board_origin(board_width, board_height)
         
         # חישוב מיקום הפאנלים בצד ימין
         panel_x = x_offset + board_width + 10
@@ -404,18 +522,20 @@ class Game:
         # פאנל ניקוד
         score_panel_y = 10
         score_panel_height = 200
-        self.score_system.draw_on_image(extended_img, panel_x, score_panel_y, panel_width, score_panel_height)
+        canvas.add_layer("score", panel_x, score_panel_y, panel_width, score_panel_height,
+                         self.score_system.draw_on_image)
         
         # פאנל רשימת מהלכים
         moves_panel_y = score_panel_y + score_panel_height + 20
         moves_panel_height = 300
-        self.moves_log.draw_on_image(extended_img, panel_x, moves_panel_y, panel_width, moves_panel_height)
+        canvas.add_layer("moves", panel_x, moves_panel_y, panel_width, moves_panel_height,
+                         self.moves_log.draw_on_image)
         
         # פאנל פקדים
         controls_panel_y = moves_panel_y + moves_panel_height + 20
-        self._draw_controls_panel(extended_img, panel_x, controls_panel_y, panel_width, 100)
-        
-        return extended_img
+        canvas.add_layer("controls", panel_x, controls_panel_y, panel_width, 100,
+                         self._draw_controls_panel)
+        return canvas
 
     def _draw_controls_panel(self, img, x, y, width, height):
         """Draw controls instruction panel."""
@@ -437,68 +557,50 @@ class Game:
             cv2.putText(img, control, (x + 10, y + 40 + i * 20), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.35, (0, 0, 0), 1)
 
+    def _cursor_boxes(self):
+        """Return the cursor and selection rectangles as (top_left, bottom_right, color, thickness)."""
+        def cell_box(cell, color, thickness):
+            # אותה טבלת lookup כמו מיקומי הכלים - הסמן תמיד מיושר לכלי
+            x0, y0, x1, y1 = self.board.cell_rect(tuple(cell))
+            return ((x0, y0), (x1 - 1, y1 - 1), color, thickness)
+        
+        boxes = [
+            cell_box(self.cursor_pos_player1, (255, 0, 0), 8),  # סמן שחקן 1 - כחול עבה
+            cell_box(self.cursor_pos_player2, (0, 0, 255), 8),  # סמן שחקן 2 - אדום עבה
+        ]
+        
+        # סימון כלי נבחר - על הכלי עצמו, לא על הסמן
+        if self.selected_piece_player1:
+            piece_pos = self._get_piece_position(self.selected_piece_player1)
+            if piece_pos:
+                boxes.append(cell_box(piece_pos, (0, 255, 0), 4))  # ירוק עבה
+                # היעדים החוקיים של הכלי הנבחר - מסגרת דקה באותו צבע
+                boxes.extend(cell_box(cell, (0, 255, 0), 1) for cell in self.legal_targets(self.selected_piece_player1))
+        if self.selected_piece_player2:
+            piece_pos = self._get_piece_position(self.selected_piece_player2)
+            if piece_pos:
+                boxes.append(cell_box(piece_pos, (0, 255, 255), 4))  # צהוב עבה
+                boxes.extend(cell_box(cell, (0, 255, 255), 1) for cell in self.legal_targets(self.selected_piece_player2))
+        return boxes
+
     def _draw_cursors(self, board):
         """Draw player cursors on the board."""
-        print(f"Drawing cursors - Player1: {self.cursor_pos_player1}, Player2: {self.cursor_pos_player2}")
         if hasattr(board, 'img') and hasattr(board.img, 'img'):
-            print("Board has img!")
             img = board.img.img
-            
-            # חישוב גודל משבצת
-            board_height, board_width = img.shape[:2]
-            cell_width = board_width // 8
-            cell_height = board_height // 8
-            
-            # ציור סמן שחקן 1 (כחול עבה)
-            x1, y1 = self.cursor_pos_player1
-            top_left_1 = (x1 * cell_width, y1 * cell_height)
-            bottom_right_1 = ((x1 + 1) * cell_width - 1, (y1 + 1) * cell_height - 1)
-            cv2.rectangle(img, top_left_1, bottom_right_1, (255, 0, 0), 8)  # כחול BGR עבה מאוד
-            print(f"Drew THICK blue cursor at {top_left_1}-{bottom_right_1}")
-            
-            # ציור סמן שחקן 2 (אדום עבה)
-            x2, y2 = self.cursor_pos_player2
-            top_left_2 = (x2 * cell_width, y2 * cell_height)
-            bottom_right_2 = ((x2 + 1) * cell_width - 1, (y2 + 1) * cell_height - 1)
-            cv2.rectangle(img, top_left_2, bottom_right_2, (0, 0, 255), 8)  # אדום BGR עבה מאוד
-            print(f"Drew THICK red cursor at {top_left_2}-{bottom_right_2}")
-            
-            # סימון כלי נבחר - צריך להיות על הכלי עצמו, לא על הסמן
-            if self.selected_piece_player1:
-                # מצא את מיקום הכלי הנבחר של שחקן 1
-                piece_pos = self._get_piece_position(self.selected_piece_player1)
-                if piece_pos:
-                    px, py = piece_pos
-                    piece_top_left = (px * cell_width, py * cell_height)
-                    piece_bottom_right = ((px + 1) * cell_width - 1, (py + 1) * cell_height - 1)
-                    cv2.rectangle(img, piece_top_left, piece_bottom_right, (0, 255, 0), 4)  # ירוק עבה
-                    print(f"Added green selection for player 1 at piece position {piece_pos}")
-            
-            if self.selected_piece_player2:
-                # מצא את מיקום הכלי הנבחר של שחקן 2
-                piece_pos = self._get_piece_position(self.selected_piece_player2)
-                if piece_pos:
-                    px, py = piece_pos
-                    piece_top_left = (px * cell_width, py * cell_height)
-                    piece_bottom_right = ((px + 1) * cell_width - 1, (py + 1) * cell_height - 1)
-                    cv2.rectangle(img, piece_top_left, piece_bottom_right, (0, 255, 255), 4)  # צהוב עבה
-                    print(f"Added yellow selection for player 2 at piece position {piece_pos}")
+            for top_left, bottom_right, color, thickness in self._cursor_boxes():
+                cv2.rectangle(img, top_left, bottom_right, color, thickness)
         else:
             print("No board img found for cursor drawing!")
 
     def _show(self) -> bool:
         """Show the current frame and handle window events."""
-        # Make sure window is in focus
-        cv2.setWindowProperty("Chess Game", cv2.WND_PROP_TOPMOST, 1)
-        print("⏳ Waiting for key...")
-        # קלט ללא חסימה - רק 30ms המתנה מקסימום
-        key = cv2.waitKey(0) & 0xFF
-        print(f"🔑 Got key: {key}")
+        # קלט ללא חסימה - רק מעבד אירועי חלון ובודק אם נלחץ מקש
+        key = self.render_target.poll_key(1)
 
         # עבד קלט אם נלחץ מקש
         if key != 255 and key != -1:
         # if key != -1:
-            print(f"Pressed: {key}")
+            print(f"🔑 Got key: {key}")
             if self._handle_keyboard_input(key):
                 return False  # Exit if ESC was pressed
         
@@ -516,6 +618,15 @@ class Game:
         if key == 27 or key == ord('q'):  # ESC או Q
             self.game_over = True  # סמן שהמשחק נגמר
             return True  # Signal to exit
+
+        # מדידת ביצועים: H - הצג/הסתר זמני שלבים, P - שמור את הסטטיסטיקות לקובץ
+        if key in (ord('h'), ord('H')):
+            shown = self.profiler.toggle_hud()
+            print(f"⏱️ Profiler HUD {'on' if shown else 'off'}")
+            return False
+        if key in (ord('p'), ord('P')):
+            self.profiler.dump(f"tick_profile_{int(time.time())}.json")
+            return False
         
         # Convert to character for easier handling
         char = None
@@ -743,52 +854,24 @@ class Game:
         
         return None
 
+    def _get_piece_target(self, piece):
+        """The cell a piece in flight is heading to, None when it stands still."""
+        physics = getattr(getattr(piece, '_state', None), '_physics', None)
+        if getattr(physics, 'moving', False) is True:
+            return physics.target_cell
+        return None
+
     def _get_piece_at_position(self, x, y):
         """Get piece at specific position, if any."""
-        for piece in self.pieces:
-            piece_pos = self._get_piece_position(piece)
-            if piece_pos and piece_pos == (x, y):
-                return piece
-        return None
+        return self.occupancy.at(self.pieces, (x, y))
 
     def _find_piece_at_position(self, x, y):
         """Find piece at given board position."""
         print(f"מחפש כלי במיקום ({x}, {y})")
-        
-        for piece in self.pieces:
-            piece_found = False
-            piece_pos = None
-            
-            # בדיקה אם לכלי יש _state עם _physics עם cell
-            if hasattr(piece, '_state') and hasattr(piece._state, '_physics'):
-                physics = piece._state._physics
-                if hasattr(physics, 'cell'):
-                    piece_pos = physics.cell
-                    if physics.cell == (x, y):
-                        piece_found = True
-                        print(f"מצא כלי {piece.piece_id} במיקום {piece_pos} via _state._physics.cell")
-            
-            # פלטות נוספות - בדיקת מיקום ישיר
-            elif hasattr(piece, 'x') and hasattr(piece, 'y'):
-                piece_pos = (piece.x, piece.y)
-                if piece.x == x and piece.y == y:
-                    piece_found = True
-                    print(f"מצא כלי {piece.piece_id} במיקום {piece_pos} via x,y")
-            
-            elif hasattr(piece, 'board_position'):
-                piece_pos = piece.board_position
-                if piece.board_position == (x, y):
-                    piece_found = True
-                    print(f"מצא כלי {piece.piece_id} במיקום {piece_pos} via board_position")
-            
-            # Debug - הצג את מיקום כל כלי
-            if piece_pos:
-                print(f"כלי {piece.piece_id} נמצא במיקום {piece_pos}")
-            else:
-                print(f"כלי {piece.piece_id} - לא נמצא מיקום!")
-            
-            if piece_found:
-                return piece
+        piece = self.occupancy.at(self.pieces, (x, y))
+        if piece is not None:
+            print(f"מצא כלי {piece.piece_id} במיקום ({x}, {y})")
+            return piece
         
         print(f"לא נמצא כלי במיקום ({x}, {y})")
         return None
@@ -876,31 +959,12 @@ class Game:
         if piece_type.startswith('N'):  # Knight - no path checking
             return None
         
-        dx = end_x - start_x
-        dy = end_y - start_y
-        
-        # מלכים יכולים לזוז משבצת אחת בכל כיוון - אין צורך בבדיקת נתיב
-        if piece_type.startswith('K') and abs(dx) <= 1 and abs(dy) <= 1:
-            return None
-        
-        # חישוב כיוון התנועה
-        step_x = 0 if dx == 0 else (1 if dx > 0 else -1)
-        step_y = 0 if dy == 0 else (1 if dy > 0 else -1)
-        
-        # בדיקת נתיב - בלי לכלול את נקודות ההתחלה והסיום
-        current_x = start_x + step_x
-        current_y = start_y + step_y
-        
-        while current_x != end_x or current_y != end_y:
-            # בדיקה אם יש כלי במשבצת הנוכחית
-            blocking_piece = self._get_piece_at_position(current_x, current_y)
-            if blocking_piece:
-                print(f"🚫 נתיב חסום! כלי {blocking_piece.piece_id} במיקום ({current_x}, {current_y})")
-                return (current_x, current_y)  # מחזיר את מיקום הכלי החוסם
-            
-            # מעבר למשבצת הבאה
-            current_x += step_x
-            current_y += step_y
+        # מסכת המשבצות שבין ההתחלה לסיום מול לוח התפוסה - בלי מעבר משבצת-משבצת
+        blocking_position = self.move_generator.first_blocker(
+            (start_x, start_y), (end_x, end_y), self.occupancy.occupied(self.pieces))
+        if blocking_position:
+            print(f"🚫 נתיב חסום! כלי במיקום {blocking_position}")
+            return blocking_position  # מחזיר את מיקום הכלי החוסם
         
         print(f"✅ נתיב פנוי מ-({start_x}, {start_y}) ל-({end_x}, {end_y})")
         return None  # נתיב פנוי
@@ -916,61 +980,29 @@ class Game:
         if not current_pos:
             return False
         
-        current_x, current_y = current_pos
-        
-        # חישוב ההפרש
-        dx = new_x - current_x
-        dy = new_y - current_y
-        
-        # בדיקה אם יש כלי במיקום המטרה
-        target_piece = self._get_piece_at_position(new_x, new_y)
-        is_capture = target_piece is not None
-        
-        # קריאת הנתונים מקובץ התנועות של הכלי - קודם נבדוק אם התנועה חוקית
-        if hasattr(piece._state, '_moves') and hasattr(piece._state._moves, 'valid_moves'):
-            valid_moves = piece._state._moves.valid_moves
-            print(f"🔍 בודק תנועה: {piece.piece_id} מ-({current_x},{current_y}) ל-({new_x},{new_y}), הפרש: ({dx},{dy})")
-            print(f"🔍 תנועות אפשריות: {valid_moves}")
-            
-            move_is_valid = False
-            
-            # בדיקה לכל תנועה אפשרית - רק קואורדינטות, בלי סוגי תנועה
-            for move_dx, move_dy, move_type in valid_moves:
-                # קבצי התנועות של חילים: צריך להפוך את הכיוון
-                # החילים הלבנים והשחורים הפוכים במערכת הקואורדינטות
-                if piece.piece_id.startswith('P'):  # חילים - הפך כיוון
-                    # הקובץ אומר (0,-1) וזה צריך להישאר (0,-1)
-                    actual_dx = move_dx  # השאר כמו שזה
-                    actual_dy = move_dy  # השאר כמו שזה
-                else:  # כל שאר הכלים - use as is
-                    actual_dx = move_dx
-                    actual_dy = move_dy
-                
-                print(f"🔍 בודק תנועה ({move_dx},{move_dy},{move_type}) -> מתורגם: ({actual_dx},{actual_dy})")
-                
-                # בדיקה אם התנועה תואמת - רק קואורדינטות!
-                if dx == actual_dx and dy == actual_dy:
-                    print(f"✅ תנועה תואמת! הפרש ({dx},{dy}) = קואורדינטות ({actual_dx},{actual_dy})")
-                    move_is_valid = True
-                    break
-            
-            if not move_is_valid:
-                print(f"❌ לא נמצאה תנועה תואמת")
-                return False
-            
-            # כעת, אחרי שאנחנו יודעים שהתנועה חוקית לפי הקבצים, נבדוק נתיב
-            blocking_position = self._check_path(current_x, current_y, new_x, new_y, piece.piece_id)
-            
-            # אם יש כלי חוסם בדרך ואנחנו לא מנסים לזוז למיקום שלו
-            if blocking_position and blocking_position != (new_x, new_y):
-                print(f"🚫 תנועה לא חוקית: נתיב חסום על ידי כלי במיקום {blocking_position}")
-                return False
-            
-            print(f"✅ תנועה חוקית!")
-            return True
-        else:
+        if not (hasattr(piece._state, '_moves') and hasattr(piece._state._moves, 'valid_moves')):
             print(f"❌ אין נתוני תנועות לכלי {piece.piece_id}")
             return False
+        
+        # היעד בטבלת התנועות של הכלי (מקובץ התנועות) ואין כלי בין ההתחלה ליעד
+        if not self.move_generator.is_legal(piece.piece_id, piece._state._moves.valid_moves, current_pos,
+                                            (new_x, new_y), self.occupancy.occupied(self.pieces)):
+            print(f"❌ תנועה לא חוקית: {piece.piece_id} מ-{current_pos} ל-({new_x}, {new_y})")
+            return False
+        
+        print(f"✅ תנועה חוקית!")
+        return True
+
+    def legal_targets(self, piece) -> List[Tuple[int, int]]:
+        """Every cell the piece can move to now, own pieces excluded - for highlighting and validation."""
+        current_pos = self._get_piece_position(piece)
+        moves = getattr(getattr(piece._state, '_moves', None), 'valid_moves', None)
+        if not current_pos or moves is None:
+            return []
+        own = self.occupancy.occupied(self.pieces, piece.piece_id[1:2])
+        bits = self.move_generator.legal_targets(piece.piece_id, moves, current_pos,
+                                                 self.occupancy.occupied(self.pieces), own)
+        return self.move_generator.cells(bits)
 
     # ─── capture resolution ────────────────────────────────────────────────
     def _resolve_collisions(self):
@@ -980,19 +1012,10 @@ class Game:
     # ─── board validation & win detection ───────────────────────────────────
     def _is_win(self) -> bool:
         """Check if the game has ended."""
-        # בדיקה אם אחד המלכים נהרג
-        white_king_alive = False
-        black_king_alive = False
-        
+        # בדיקה אם אחד המלכים נהרג - מרשם המלכים לפי צבע במקום סריקת כל הכלים
         print("🔍 בודק תנאי נצחון...")
-        for piece in self.pieces:
-            print(f"   כלי קיים: {piece.piece_id}")
-            if piece.piece_id == "KW0":  # מלך לבן
-                white_king_alive = True
-                print("   👑 מלך לבן עדיין חי!")
-            elif piece.piece_id == "KB0":  # מלך שחור
-                black_king_alive = True
-                print("   👑 מלך שחור עדיין חי!")
+        white_king_alive = self.registry.king_alive(self.pieces, "W")
+        black_king_alive = self.registry.king_alive(self.pieces, "B")
         
         print(f"מלך לבן חי: {white_king_alive}, מלך שחור חי: {black_king_alive}")
         
@@ -1008,14 +1031,8 @@ class Game:
         """Announce the winner."""
         print("🎺 מכריז על הנצחון!")
         # בדיקה מי ניצח
-        white_king_alive = False
-        black_king_alive = False
-        
-        for piece in self.pieces:
-            if piece.piece_id == "KW0":  # מלך לבן
-                white_king_alive = True
-            elif piece.piece_id == "KB0":  # מלך שחור
-                black_king_alive = True
+        white_king_alive = self.registry.king_alive(self.pieces, "W")
+        black_king_alive = self.registry.king_alive(self.pieces, "B")
         
         winner = None
         winning_reason = "King captured"
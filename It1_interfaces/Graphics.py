@@ -1,9 +1,29 @@
 import pathlib
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import copy
 from It1_interfaces.img  import Img
 from It1_interfaces.Command  import Command
 from It1_interfaces.Board  import Board
+from It1_interfaces.SpriteAtlas import SpriteAtlas
+from It1_interfaces.FrameCache import frame_cache
+
+SPRITE_SIZE = (80, 80)  # ודא שזה תואם לגודל התא שלך
+
+
+def sprite_size_for_board(board: Board) -> Tuple[int, int]:
+    """
+    Sprite size (width, height) of one cell of the given board: the smallest cell of
+    Board's pixel grid (floor, like its edges), so a sprite never spills into the next cell.
+    """
+    return int(board.cell_W_pix + 1e-6), int(board.cell_H_pix + 1e-6)
+
+
+def frame_index_at(elapsed_ms: float, frame_count: int, frame_time_ms: float, loop: bool) -> int:
+    """Animation frame shown elapsed_ms after the animation started - same timing as Graphics.update."""
+    if frame_count <= 1 or elapsed_ms <= 0 or frame_time_ms <= 0:
+        return 0
+    index = int(elapsed_ms // frame_time_ms)
+    return index % frame_count if loop else min(index, frame_count - 1)
 
 
 class Graphics:
@@ -11,13 +31,18 @@ class Graphics:
                  sprites_folder: pathlib.Path,
                  board: Board,
                  loop: bool = True,
-                 fps: float = 6.0):
+                 fps: float = 6.0,
+                 atlas: Optional[SpriteAtlas] = None,
+                 sprite_size: Tuple[int, int] = SPRITE_SIZE):
         """
         Initialize graphics with sprites folder, cell size, loop setting, and FPS.
         טוען את כל התמונות מהתיקייה (לפי סדר שמות הקבצים).
+        אם יש atlas - הפריימים הם views לתוך ה-atlas ולא נטענים מהדיסק.
         """
         self.sprites_folder = sprites_folder
         self.board = board
+        self.atlas = atlas
+        self.sprite_size = (int(sprite_size[0]), int(sprite_size[1]))
         self.loop = loop
         self.fps = fps
         self.frame_time_ms = int(1000 / fps)
@@ -28,19 +53,27 @@ class Graphics:
         self.frames: List[Img] = self._load_frames()
         self.current_frame = 0
         self.last_update = 0
+        self.anim_start_ms: Optional[int] = None  # זמן המשחק שבו האנימציה הנוכחית התחילה
         self.running = True
 
     def _load_frames(self) -> List[Img]:
-        frames = []
-        for img_path in sorted(self.sprites_folder.glob("*.png")):
-            img = Img()
-            img.read(str(img_path), size=(80, 80))  # ודא שזה תואם לגודל התא שלך
-            frames.append(img)
-        return frames if frames else [Img()]  # לפחות פריים ריק
+        if self.atlas is not None and self.atlas.size == self.sprite_size:
+            piece_type = self.sprites_folder.parent.parent.parent.name
+            state_folder = self.sprites_folder.parent.name
+            if self.atlas.has(piece_type, state_folder):
+                return self.atlas.get_frames(piece_type, state_folder)
+        # כל הכלים מאותו סוג חולקים את אותם פריימים - נטען מהדיסק רק בפעם הראשונה
+        # הנתיב <type>/states/<state>/sprites מזהה את סוג הכלי ואת המצב
+        return frame_cache.get_scaled(self.sprites_folder, self.sprite_size)
+
+    def get_img_scaled(self, size: Tuple[int, int]) -> Img:
+        """Current frame at another size (thumbnails, spectator views) - built once per size."""
+        frames = frame_cache.get_scaled(self.sprites_folder, size)
+        return frames[min(self.current_frame, len(frames) - 1)]
 
     def copy(self):
         """Create a shallow copy of the graphics object."""
-        new_gfx = Graphics(self.sprites_folder, self.board, self.loop, self.fps)
+        new_gfx = copy.copy(self)   # הפריימים משותפים - אין טעינה מחדש
         new_gfx.current_frame = self.current_frame
         new_gfx.last_update = self.last_update
         new_gfx.running = self.running
@@ -50,6 +83,7 @@ class Graphics:
         """Reset the animation with a new command."""
         self.current_frame = 0
         self.last_update = 0
+        self.anim_start_ms = None
         self.running = True
         
         # אם יש פקודה עם state, החלף sprites בהתאם
@@ -84,6 +118,7 @@ class Graphics:
             return
         if self.last_update == 0:
             self.last_update = now_ms
+            self.anim_start_ms = now_ms
             return
         if now_ms - self.last_update >= self.frame_time_ms:
             self.current_frame += 1
@@ -95,6 +130,18 @@ class Graphics:
                     self.running = False
             self.last_update = now_ms
 
+    def playback(self) -> Dict:
+        """
+        What a remote viewer needs to play this animation itself:
+        state folder, start time and frame timing (see frame_index_at).
+        """
+        return {
+            'state': self.sprites_folder.parent.name,
+            'start_ms': self.anim_start_ms,
+            'frame_time_ms': self.frame_time_ms,
+            'loop': self.loop,
+        }
+
     def get_img(self) -> Img:
         """Get the current frame image."""
         return self.frames[self.current_frame]
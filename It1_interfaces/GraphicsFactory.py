@@ -1,9 +1,16 @@
 import pathlib
-from It1_interfaces.Graphics import Graphics
+from typing import Optional, Tuple
+from It1_interfaces.Graphics import Graphics, SPRITE_SIZE
 from It1_interfaces.Board  import Board
+from It1_interfaces.SpriteAtlas import SpriteAtlas
 
 
 class GraphicsFactory:
+    def __init__(self, atlas: Optional[SpriteAtlas] = None, sprite_size: Tuple[int, int] = SPRITE_SIZE):
+        """Initialize graphics factory, optionally backed by a shared sprite atlas."""
+        self.atlas = atlas
+        self.sprite_size = sprite_size
+
     def load(self,
              sprites_dir: pathlib.Path,
              cfg: dict,
@@ -15,5 +22,7 @@ class GraphicsFactory:
             sprites_folder=sprites_dir,
             board=board,
             loop=loop,
-            fps=fps
+            fps=fps,
+            atlas=self.atlas,
+            sprite_size=self.sprite_size
         )
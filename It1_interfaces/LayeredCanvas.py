@@ -0,0 +1,112 @@
+# LayeredCanvas.py - Preallocated window canvas with a static background and versioned UI panels
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+# (x0, y0, x1, y1) in board pixels, x1/y1 exclusive - same as BoardRenderer.Rect
+Rect = Tuple[int, int, int, int]
+# draw_fn(img, x, y, width, height) - same signature as ScoreSystem/MovesLog.draw_on_image
+DrawFn = Callable[[np.ndarray, int, int, int, int], None]
+
+_UNDRAWN = object()
+
+
+class _Layer:
+    def __init__(self, x: int, y: int, width: int, height: int, draw_fn: DrawFn):
+        self.x, self.y, self.width, self.height = x, y, width, height
+        self.draw_fn = draw_fn
+        self.version = _UNDRAWN
+
+
+class LayeredCanvas:
+    """
+    The extended game window, allocated once. The board is copied into the
+    centre and each side panel is a layer that is repainted only when the
+    version its owner reports changes (score, moves, controls text...).
+    """
+
+    PANEL_PAD = 2   # מסגרות הפאנלים (עובי 2) חורגות מעט מהמלבן
+
+    def __init__(self, width: int, height: int, background_value: int = 240):
+        self.width = width
+        self.height = height
+        self._background = np.full((height, width, 3), background_value, dtype=np.uint8)
+        self.canvas = self._background.copy()
+        self._layers: Dict[str, _Layer] = {}
+        self._full_redraw = True
+        self._damaged: List[Rect] = []   # אזורי קנבס שצוירו עליהם מבחוץ (הודעות) - לשחזר בפריים הבא
+
+    def add_layer(self, name: str, x: int, y: int, width: int, height: int, draw_fn: DrawFn):
+        """Register (or move) a panel layer."""
+        self._layers[name] = _Layer(x, y, width, height, draw_fn)
+        self._full_redraw = True
+
+    def invalidate(self, rects: Optional[List[Rect]] = None):
+        """
+        Restore the canvas on the next compose (e.g. after an overlay was drawn on it).
+        rects - only these regions, in canvas pixels (None = everything).
+        """
+        if rects is None:
+            self._full_redraw = True
+        else:
+            self._damaged.extend(rects)
+
+    def board_origin(self, board_width: int, board_height: int) -> Tuple[int, int]:
+        return (self.width - board_width) // 2, (self.height - board_height) // 2
+
+    def compose(self, board_img: np.ndarray, versions: Optional[Dict[str, Hashable]] = None,
+                board_dirty_rects: Optional[List[Rect]] = None,
+                draw_fns: Optional[Dict[str, DrawFn]] = None) -> np.ndarray:
+        """
+        Bring the canvas up to date and return it.
+        board_dirty_rects - אזורי הלוח שהשתנו מאז הפריים הקודם (None = להעתיק את כל הלוח).
+        draw_fns - ציור חלופי לשכבות לפריים הזה (למשל מעותק קפוא של הנתונים).
+        """
+        versions = versions or {}
+        draw_fns = draw_fns or {}
+        full = self._full_redraw
+        if full:
+            np.copyto(self.canvas, self._background)
+
+        board_height, board_width = board_img.shape[:2]
+        x_offset, y_offset = self.board_origin(board_width, board_height)
+        if full or board_dirty_rects is None:
+            board_dirty_rects = [(0, 0, board_width, board_height)]
+        damaged = [] if full else self._damaged
+        if damaged:
+            board_dirty_rects = list(board_dirty_rects)
+            for x0, y0, x1, y1 in damaged:
+                self.canvas[y0:y1, x0:x1] = self._background[y0:y1, x0:x1]
+                # החלק של האזור שנופל על הלוח - מעתיקים מחדש מהלוח
+                bx0, by0 = max(0, x0 - x_offset), max(0, y0 - y_offset)
+                bx1, by1 = min(board_width, x1 - x_offset), min(board_height, y1 - y_offset)
+                if bx0 < bx1 and by0 < by1:
+                    board_dirty_rects.append((bx0, by0, bx1, by1))
+        for x0, y0, x1, y1 in board_dirty_rects:
+            self.canvas[y_offset + y0:y_offset + y1, x_offset + x0:x_offset + x1] = board_img[y0:y1, x0:x1, :3]
+
+        for name, layer in self._layers.items():
+            version = versions.get(name)
+            if (not full and layer.version is not _UNDRAWN and layer.version == version
+                    and not any(self._overlaps(layer, rect) for rect in damaged)):
+                continue
+            if not full:
+                self._restore(layer)
+            draw_fn = draw_fns.get(name, layer.draw_fn)
+            draw_fn(self.canvas, layer.x, layer.y, layer.width, layer.height)
+            layer.version = version
+
+        self._full_redraw = False
+        self._damaged = []
+        return self.canvas
+
+    def _overlaps(self, layer: _Layer, rect: Rect) -> bool:
+        pad = self.PANEL_PAD
+        return (rect[0] < layer.x + layer.width + pad + 1 and layer.x - pad < rect[2] and
+                rect[1] < layer.y + layer.height + pad + 1 and layer.y - pad < rect[3])
+
+    def _restore(self, layer: _Layer):
+        pad = self.PANEL_PAD
+        x0, y0 = max(0, layer.x - pad), max(0, layer.y - pad)
+        x1 = min(self.width, layer.x + layer.width + pad + 1)
+        y1 = min(self.height, layer.y + layer.height + pad + 1)
+        self.canvas[y0:y1, x0:x1] = self._background[y0:y1, x0:x1]
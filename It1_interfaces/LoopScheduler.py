@@ -0,0 +1,68 @@
+# LoopScheduler.py - Fixed-timestep simulation with decoupled rendering for the game loop
+import time
+from typing import List
+
+
+class LoopScheduler:
+    """
+    Drives the main loop: simulation ticks happen at a fixed rate (tick_hz),
+    rendering at its own rate (render_hz). When a frame runs late the missing
+    ticks are caught up (up to max_ticks_per_frame) instead of slowing the game down;
+    beyond that the clock is re-synced so the loop never spirals.
+    All times are game-clock milliseconds (Game.game_time_ms).
+    """
+
+    def __init__(self, tick_hz: float = 60.0, render_hz: float = 60.0, max_ticks_per_frame: int = 5):
+        self.tick_ms = 1000.0 / tick_hz
+        self.render_ms = 1000.0 / render_hz
+        self.max_ticks_per_frame = max_ticks_per_frame
+
+        self._next_tick = 0.0
+        self._next_render = 0.0
+
+        # סטטיסטיקות - לבדיקת jitter תחת עומס
+        self.ticks = 0
+        self.renders = 0
+        self.dropped_ticks = 0
+        self.max_tick_lateness_ms = 0.0
+
+    def start(self, now_ms: float):
+        self._next_tick = float(now_ms)
+        self._next_render = float(now_ms)
+
+    def due_ticks(self, now_ms: float) -> List[int]:
+        """Return the (fixed-step) times of all simulation ticks due by now_ms."""
+        due = []
+        while self._next_tick <= now_ms and len(due) < self.max_ticks_per_frame:
+            self.max_tick_lateness_ms = max(self.max_tick_lateness_ms, now_ms - self._next_tick)
+            due.append(int(self._next_tick))
+            self._next_tick += self.tick_ms
+
+        if self._next_tick <= now_ms:
+            # פיגור גדול מדי - מוותרים על הטיקים החסרים ומסתנכרנים מחדש לשעון
+            skipped = int((now_ms - self._next_tick) // self.tick_ms) + 1
+            self.dropped_ticks += skipped
+            self._next_tick += skipped * self.tick_ms
+
+        self.ticks += len(due)
+        return due
+
+    def render_due(self, now_ms: float) -> bool:
+        """True when a frame should be drawn; frames that were missed are skipped, not queued."""
+        if now_ms < self._next_render:
+            return False
+        self._next_render += self.render_ms
+        if self._next_render <= now_ms:
+            self._next_render = now_ms + self.render_ms
+        self.renders += 1
+        return True
+
+    def time_to_next_ms(self, now_ms: float) -> float:
+        """Milliseconds until the next tick or frame is due (0 if already due)."""
+        return max(0.0, min(self._next_tick, self._next_render) - now_ms)
+
+    def sleep_until_next(self, now_ms: float, reserve_ms: float = 1.0):
+        """Sleep for what's left of the current frame budget, keeping reserve_ms for input polling."""
+        remaining = self.time_to_next_ms(now_ms) - reserve_ms
+        if remaining > 0:
+            time.sleep(remaining / 1000.0)
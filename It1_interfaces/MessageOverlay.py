@@ -1,9 +1,10 @@
 # MessageOverlay.py - Displays game messages and notifications
 import cv2
 import numpy as np
+import copy
 import time
-from typing import Optional, List
-from dataclasses import dataclass
+from typing import Optional, List, Tuple
+from dataclasses import dataclass, field
 from It1_interfaces.EventSystem import Event, EventType, event_publisher
 
 @dataclass
@@ -16,6 +17,12 @@ class Message:
     background_color: tuple = (0, 0, 0, 180)
     fade_in_duration: float = 0.5
     fade_out_duration: float = 0.5
+    # Pre-rendered banner (BGRA: text color + antialiased text coverage) and its text metrics
+    banner: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    text_metrics: Tuple[int, int, int] = field(default=(0, 0, 0), repr=False, compare=False)
+
+# (x0, y0, x1, y1) in image pixels, x1/y1 exclusive
+Rect = Tuple[int, int, int, int]
 
 class MessageOverlay:
     """Component that displays temporary messages and game notifications."""
@@ -143,6 +150,7 @@ class MessageOverlay:
             color=color,
             background_color=background_color
         )
+        self._render_banner(message)  # פעם אחת - בכל פריים רק מיזוג של אזור ההודעה
         self.messages.append(message)
         print(f"💬 Queued message: '{text}' for {duration}s")
     
@@ -154,10 +162,16 @@ class MessageOverlay:
         self.messages = [msg for msg in self.messages 
                         if current_time < msg.start_time + msg.duration + msg.fade_out_duration]
     
-    def draw_on_image(self, img: np.ndarray):
-        """Draw all active messages on the image."""
+    def snapshot(self) -> "MessageOverlay":
+        """Frozen copy of the current messages for drawing on another thread."""
+        snap = copy.copy(self)
+        snap.messages = list(self.messages)
+        return snap
+    
+    def draw_on_image(self, img: np.ndarray) -> List[Rect]:
+        """Draw all active messages on the image and return the regions drawn over."""
         if not self.messages:
-            return
+            return []
         
         height, width = img.shape[:2]
         current_time = time.time()
@@ -168,7 +182,7 @@ class MessageOverlay:
                              current_time < msg.start_time + msg.duration + msg.fade_out_duration]
         
         if not active_messages:
-            return
+            return []
         
         # Start from center, work outward
         y_center = height // 2
@@ -176,11 +190,33 @@ class MessageOverlay:
         total_height = len(active_messages) * message_height
         start_y = y_center - (total_height // 2)
         
+        rects = []
         for i, message in enumerate(active_messages):
-            self._draw_message(img, message, start_y + i * message_height, current_time)
+            rect = self._draw_message(img, message, start_y + i * message_height, current_time)
+            if rect is not None:
+                rects.append(rect)
+        return rects
+    
+    BANNER_PADDING = 20
+    
+    def _render_banner(self, message: Message):
+        """Rasterize the message text once into a small BGRA bitmap the size of its banner."""
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        thickness = 2
+        (text_width, text_height), baseline = cv2.getTextSize(message.text, font, message.font_size, thickness)
+        padding = self.BANNER_PADDING
+        
+        coverage = np.zeros((text_height + baseline + 2 * padding + 1, text_width + 2 * padding + 1), dtype=np.uint8)
+        cv2.putText(coverage, message.text, (padding, padding + text_height), font, message.font_size,
+                    255, thickness, cv2.LINE_AA)
+        banner = np.empty(coverage.shape + (4,), dtype=np.uint8)
+        banner[..., :3] = message.color[:3]
+        banner[..., 3] = coverage
+        message.banner = banner
+        message.text_metrics = (text_width, text_height, baseline)
     
-    def _draw_message(self, img: np.ndarray, message: Message, y_pos: int, current_time: float):
-        """Draw a single message with fade effects."""
+    def _draw_message(self, img: np.ndarray, message: Message, y_pos: int, current_time: float) -> Optional[Rect]:
+        """Draw a single message with fade effects; returns the region it covered."""
         # Calculate alpha based on fade in/out
         elapsed = current_time - message.start_time
         alpha = 1.0
@@ -195,38 +231,39 @@ class MessageOverlay:
         
         alpha = max(0.0, min(1.0, alpha))
         if alpha <= 0:
-            return
+            return None
         
-        # Get text size
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = message.font_size
-        thickness = 2
-        (text_width, text_height), baseline = cv2.getTextSize(message.text, font, font_scale, thickness)
-        
-        # Calculate position (centered)
-        height, width = img.shape[:2]
-        x_pos = (width - text_width) // 2
+        if message.banner is None:  # הודעה שנוצרה בלי show_message
+            self._render_banner(message)
+        text_width, text_height, _ = message.text_metrics
         
-        # Draw background rectangle with transparency
+        # Background transparency
         if len(message.background_color) == 4:  # RGBA
             bg_alpha = (message.background_color[3] / 255.0) * alpha
         else:  # RGB
             bg_alpha = alpha * 0.7
         
-        # Create background overlay
-        overlay = img.copy()
-        padding = 20
-        cv2.rectangle(overlay, 
-                     (max(0, x_pos - padding), max(0, y_pos - text_height - padding)),
-                     (min(width, x_pos + text_width + padding), min(height, y_pos + baseline + padding)),
-                     message.background_color[:3], -1)
-        
-        # Blend overlay with original image
-        cv2.addWeighted(overlay, bg_alpha, img, 1 - bg_alpha, 0, img)
+        # Banner position (centered) - clipped to the image
+        height, width = img.shape[:2]
+        padding = self.BANNER_PADDING
+        bx = (width - text_width) // 2 - padding
+        by = y_pos - text_height - padding
+        banner_h, banner_w = message.banner.shape[:2]
+        x0, y0 = max(0, bx), max(0, by)
+        x1, y1 = min(width, bx + banner_w), min(height, by + banner_h)
+        if x0 >= x1 or y0 >= y1:
+            return None
         
-        # Draw text with alpha
-        text_color = tuple(int(c * alpha) for c in message.color)
-        cv2.putText(img, message.text, (x_pos, y_pos), font, font_scale, text_color, thickness, cv2.LINE_AA)
+        # רק אזור ההודעה: רקע שקוף למחצה ואז הטקסט לפי הכיסוי שלו, בעוצמה של alpha
+        banner = message.banner[y0 - by:y1 - by, x0 - bx:x1 - bx]
+        roi = img[y0:y1, x0:x1, :3]
+        coverage = banner[..., 3:].astype(np.float32) * (1.0 / 255)
+        out = roi.astype(np.float32) * (1.0 - bg_alpha)
+        out += np.asarray(message.background_color[:3], dtype=np.float32) * bg_alpha
+        out += (banner[..., :3].astype(np.float32) * alpha - out) * coverage
+        np.rint(out, out=out)
+        roi[...] = out
+        return (x0, y0, x1, y1)
     
     def clear_all_messages(self):
         """Clear all messages."""
@@ -0,0 +1,155 @@
+# MoveGenerator.py - Bitboard move tables: legal targets and path blocking as integer operations
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Cell = Tuple[int, int]
+
+# 8 כיווני ההחלקה (dx, dy) - שורות, טורים ואלכסונים
+DIRECTIONS: Tuple[Cell, ...] = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def iter_cells(bits: int, width: int = 8) -> List[Cell]:
+    """Bitboard -> [(x, y), ...] in square order."""
+    cells = []
+    while bits:
+        low = bits & -bits
+        sq = low.bit_length() - 1
+        cells.append((sq % width, sq // width))
+        bits ^= low
+    return cells
+
+
+class MoveGenerator:
+    """
+    Square sq = y * width + x is bit sq of a Python int bitboard.
+
+    Built once per board size:
+      - rays[direction][sq]: the squares from sq to the edge in that direction
+      - between[a * squares + b]: the squares strictly between a and b when they
+        share a row, column or diagonal (0 otherwise - nothing to jump over)
+
+    Built once per move list (moves.txt of a piece type, shared by all its pieces):
+      - targets[sq]: every (dx, dy) of the list applied to sq, clipped to the board.
+        A knight's or a king's list is its attack table.
+
+    A move is legal when its target bit is in targets[from] and nothing on the
+    occupancy bitboard lies between[from, to] (knights jump).
+    """
+
+    _shared: Dict[Tuple[int, int], "MoveGenerator"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, width: int = 8, height: int = 8):
+        self.width = width
+        self.height = height
+        self.squares = width * height
+        self.rays: Dict[Cell, List[int]] = {d: [0] * self.squares for d in DIRECTIONS}
+        self.between: List[int] = [0] * (self.squares * self.squares)
+        for sq in range(self.squares):
+            x, y = sq % width, sq // width
+            for d in DIRECTIONS:
+                ray = 0
+                cx, cy = x + d[0], y + d[1]
+                while 0 <= cx < width and 0 <= cy < height:
+                    target = cy * width + cx
+                    self.between[sq * self.squares + target] = ray   # מה שכבר במסלול - לפני היעד
+                    ray |= 1 << target
+                    cx, cy = cx + d[0], cy + d[1]
+                self.rays[d][sq] = ray
+        self.lines: List[int] = [0] * self.squares   # כל המשבצות שעל קו ישר/אלכסון מ-sq
+        for sq in range(self.squares):
+            for d in DIRECTIONS:
+                self.lines[sq] |= self.rays[d][sq]
+        self._tables: Dict[Tuple[Cell, ...], List[int]] = {}
+        self._by_list: Dict[int, Tuple[Sequence, int, List[int]]] = {}   # id(moves) -> (moves, len, targets)
+
+    @classmethod
+    def shared(cls, width: int = 8, height: int = 8) -> "MoveGenerator":
+        """One generator per board size per process - the tables never change."""
+        key = (int(width), int(height))
+        with cls._shared_lock:
+            generator = cls._shared.get(key)
+            if generator is None:
+                generator = cls._shared[key] = cls(*key)
+            return generator
+
+    # ─── squares ─────────────────────────────────────────────────────────────
+    def square(self, cell) -> Optional[int]:
+        """(x, y) -> square index, None off the board."""
+        try:
+            x, y = cell
+        except (TypeError, ValueError):
+            return None
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        return y * self.width + x
+
+    def bit(self, cell) -> int:
+        sq = self.square(cell)
+        return 0 if sq is None else 1 << sq
+
+    def cells(self, bits: int) -> List[Cell]:
+        return iter_cells(bits, self.width)
+
+    # ─── move tables ─────────────────────────────────────────────────────────
+    def targets(self, moves: Sequence) -> List[int]:
+        """Per-square target bitboards of a move list [(dx, dy, move_type), ...]."""
+        entry = self._by_list.get(id(moves))
+        if entry is not None and entry[0] is moves and entry[1] == len(moves):
+            return entry[2]
+        key = tuple(sorted({(int(m[0]), int(m[1])) for m in moves}))
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = self._build_targets(key)
+        if len(self._by_list) > 1024:
+            self._by_list.clear()   # רשימות זמניות - לא לגדול בלי סוף
+        self._by_list[id(moves)] = (moves, len(moves), table)
+        return table
+
+    def _build_targets(self, deltas: Sequence[Cell]) -> List[int]:
+        table = [0] * self.squares
+        for sq in range(self.squares):
+            x, y = sq % self.width, sq // self.width
+            for dx, dy in deltas:
+                table[sq] |= self.bit((x + dx, y + dy))
+        return table
+
+    # ─── queries ─────────────────────────────────────────────────────────────
+    def is_legal(self, piece_id: str, moves: Sequence, from_cell: Cell, to_cell: Cell, occupied: int) -> bool:
+        """to_cell is one of the piece's moves from from_cell and no piece stands in between."""
+        f, t = self.square(from_cell), self.square(to_cell)
+        if f is None or t is None or not self.targets(moves)[f] >> t & 1:
+            return False
+        return piece_id.startswith('N') or not self.between[f * self.squares + t] & occupied
+
+    def first_blocker(self, from_cell: Cell, to_cell: Cell, occupied: int) -> Optional[Cell]:
+        """The occupied square nearest to from_cell strictly between the two cells, or None."""
+        f, t = self.square(from_cell), self.square(to_cell)
+        if f is None or t is None:
+            return None
+        blockers = self.between[f * self.squares + t] & occupied
+        if not blockers:
+            return None
+        # לאורך קרן האינדקסים מונוטוניים - הקרוב ביותר הוא הביט הנמוך/הגבוה
+        sq = (blockers & -blockers).bit_length() - 1 if t > f else blockers.bit_length() - 1
+        return (sq % self.width, sq // self.width)
+
+    def legal_targets(self, piece_id: str, moves: Sequence, from_cell: Cell, occupied: int, own: int = 0) -> int:
+        """Bitboard of every cell the piece can move to (squares in own are left out)."""
+        f = self.square(from_cell)
+        if f is None:
+            return 0
+        targets = self.targets(moves)[f]
+        if piece_id.startswith('N'):
+            return targets & ~own
+        reachable = ~self.lines[f]   # קפיצות שאינן על קו - אין מה שיחסום
+        for d, rays in self.rays.items():
+            ray = rays[f]
+            blockers = ray & occupied
+            if blockers:
+                # הקרן נעצרת על הכלי הראשון (כולל אותו - אפשר לתפוס)
+                step = d[1] * self.width + d[0]
+                first = (blockers & -blockers).bit_length() - 1 if step > 0 else blockers.bit_length() - 1
+                ray &= ~rays[first]
+            reachable |= ray
+        return targets & reachable & ~own
@@ -9,24 +9,30 @@ class Moves:
         moves = []
         try:
             with open(path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("//"):
-                        continue
-                    parts = line.split(",")
-                    if len(parts) < 2:
-                        continue
-                    # קובץ התנועות כתוב כ-dy,dx ולא dx,dy
-                    dy = int(parts[0])
-                    dx_part = parts[1].split(":")
-                    dx = int(dx_part[0])
-                    move_type = dx_part[1] if len(dx_part) > 1 else "normal"
-                    moves.append((dx, dy, move_type))  # שומרים כ-dx,dy
-                    
+                moves = Moves.parse_lines(f)
         except:
             print("cant load file")
         return Moves(moves, dims)
 
+    @staticmethod
+    def parse_lines(lines) -> List[Tuple[int, int, str]]:
+        """Parse the lines of a moves.txt file into (dx, dy, move_type) tuples."""
+        moves = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("//"):
+                continue
+            parts = line.split(",")
+            if len(parts) < 2:
+                continue
+            # קובץ התנועות כתוב כ-dy,dx ולא dx,dy
+            dy = int(parts[0])
+            dx_part = parts[1].split(":")
+            dx = int(dx_part[0])
+            move_type = dx_part[1] if len(dx_part) > 1 else "normal"
+            moves.append((dx, dy, move_type))  # שומרים כ-dx,dy
+        return moves
+
     def __init__(self, moves: List[Tuple[int, int, str]], dims=None):
         self.moves = moves
         self.dims = dims
@@ -1,9 +1,12 @@
 # MovesLog.py - Tracks and displays move history
-from typing import List, Tuple
+import copy
+import threading
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import cv2
 import numpy as np
 from It1_interfaces.EventSystem import Event, EventType, event_publisher
+from It1_interfaces.PanelBitmap import PanelBitmap
 
 @dataclass
 class MoveEntry:
@@ -23,11 +26,28 @@ class MoveEntry:
 class MovesLog:
     """Component that tracks and displays chess moves history."""
     
+    ROW_HEIGHT = 20
+    ROWS_TOP = 60       # קו הבסיס של השורה הראשונה, יחסית לראש הפאנל
+    ROW_ASCENT = 9      # הטקסט מגיע עד 7 פיקסלים מעל קו הבסיס - הרצועה של שורה מתחילה 9 מעליו
+    ROW_MARGIN = 3      # לא לדרוס את המסגרת
+    
     def __init__(self):
         self.moves: List[MoveEntry] = []
         self.current_move_number = 1
         self.pending_white_move = None
         self.pending_black_move = None
+        self.version = 0  # Bumped on every change so the UI panel is redrawn only when needed
+        
+        # Rendered panel: frame and headers once, each row rendered once and shifted when the log scrolls
+        self._bitmap = PanelBitmap()
+        self._bitmap_origin = (0, 0)
+        self._blank_row: Optional[np.ndarray] = None
+        self._shown_rows: List[tuple] = []
+        self._row_strips: Dict[tuple, np.ndarray] = {}
+        # Snapshots drawn on the render thread hand their rendered panel back, so the next snapshot starts from it
+        self._render_lock = threading.RLock()   # משותף ללוג החי ולכל ה-snapshots שלו
+        self._drawn_version = -1
+        self._live: Optional["MovesLog"] = None
         
         # Subscribe to relevant events
         event_publisher.subscribe(EventType.MOVE_MADE, self.on_move_made)
@@ -42,6 +62,7 @@ class MovesLog:
         self.current_move_number = 1
         self.pending_white_move = None
         self.pending_black_move = None
+        self.version += 1
         print("📝 MovesLog: Game started - cleared move history")
     
     def on_move_made(self, event: Event):
@@ -82,6 +103,7 @@ class MovesLog:
                     black_time=time_str
                 )
         
+        self.version += 1
         print(f"📝 MovesLog: Recorded move {move_notation} by {piece_id}")
     
     def on_piece_captured(self, event: Event):
@@ -97,6 +119,7 @@ class MovesLog:
                 if len(parts) == 2:
                     self.pending_white_move.white_move = f"{parts[0]}x{parts[1]}"
         
+        self.version += 1
         print(f"📝 MovesLog: Updated move notation for capture of {captured_piece}")
     
     def _position_to_notation(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int], piece_id: str) -> str:
@@ -139,8 +162,51 @@ class MovesLog:
         seconds = seconds % 60
         return f"{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
     
+    def snapshot(self) -> "MovesLog":
+        """Frozen copy for drawing on another thread (no event subscriptions)."""
+        snap = copy.copy(self)
+        snap.moves = [copy.copy(move) for move in self.moves]
+        snap.pending_white_move = copy.copy(self.pending_white_move)
+        snap.pending_black_move = copy.copy(self.pending_black_move)
+        # ה-worker מצייר על העותק ומוסיף לו רצועות - אסור לשתף מערכים עם הלוג החי
+        with self._render_lock:
+            snap._copy_render_state(self)
+        snap._live = self
+        return snap
+    
+    def _copy_render_state(self, other: "MovesLog"):
+        self._bitmap = other._bitmap.copy()
+        self._bitmap_origin = other._bitmap_origin
+        self._shown_rows = list(other._shown_rows)
+        self._blank_row = None if other._blank_row is None else other._blank_row.copy()
+        self._row_strips = {row: strip.copy() for row, strip in other._row_strips.items()}
+        self._drawn_version = other._drawn_version
+    
+    def _adopt(self, drawn: "MovesLog"):
+        """Take the rendered panel of a snapshot that was just drawn, unless a newer one is already kept."""
+        if drawn._drawn_version > self._drawn_version:
+            self._copy_render_state(drawn)
+    
     def draw_on_image(self, img: np.ndarray, x: int, y: int, width: int, height: int):
         """Draw moves log on the given image."""
+        with self._render_lock:
+            key = (x, y, width, height)
+            if not self._bitmap.valid(img, key):
+                bitmap, bx, by = self._bitmap.begin(img, x, y, width, height, key)
+                self._render_frame(bitmap, bx, by, width, height)
+                self._bitmap_origin = (bx, by)
+                top = by + self.ROWS_TOP - self.ROW_ASCENT
+                self._blank_row = bitmap[top:top + self.ROW_HEIGHT, bx + self.ROW_MARGIN:bx + width - 1].copy()
+                self._shown_rows = []
+                self._row_strips = {}
+            self._update_rows(self._visible_rows(height))
+            self._bitmap.blit(img)
+            self._drawn_version = self.version
+            if self._live is not None:
+                self._live._adopt(self)   # ה-snapshot הבא ימשיך מכאן - רק השורות שהשתנו יצוירו
+    
+    def _render_frame(self, img: np.ndarray, x: int, y: int, width: int, height: int):
+        """Rasterize the static part of the panel: background, title and column headers."""
         # Draw background
         cv2.rectangle(img, (x, y), (x + width, y + height), (240, 240, 240), -1)
         cv2.rectangle(img, (x, y), (x + width, y + height), (0, 0, 0), 2)
@@ -155,40 +221,65 @@ class MovesLog:
         cv2.putText(img, "Move", (x + 10, col_y), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 1)
         cv2.putText(img, "White", (x + 60, col_y), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 1)
         cv2.putText(img, "Black", (x + 150, col_y), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 1)
-        
-        # Draw moves
-        row_height = 20
-        start_y = col_y + 10
-        max_rows = (height - 60) // row_height
+    
+    def _visible_rows(self, height: int) -> List[tuple]:
+        """Rows in the scroll window as (number, white, black, color) - a row is redrawn only if this changes."""
+        max_rows = max(0, (height - 60) // self.ROW_HEIGHT)
         
         # Show last moves first (scroll effect)
-        visible_moves = self.moves[-max_rows:] if len(self.moves) > max_rows else self.moves
-        
-        for i, move in enumerate(visible_moves):
-            row_y = start_y + (i * row_height)
-            
-            # Move number
-            cv2.putText(img, f"{move.move_number}.", (x + 10, row_y), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.35, (0, 0, 0), 1)
-            
-            # White move
-            if move.white_move:
-                cv2.putText(img, move.white_move, (x + 60, row_y), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.35, (0, 0, 0), 1)
-            
-            # Black move
-            if move.black_move:
-                cv2.putText(img, move.black_move, (x + 150, row_y), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.35, (0, 0, 0), 1)
+        visible_moves = self.moves[-max_rows:] if max_rows else []
+        rows = [(f"{move.move_number}.", move.white_move, move.black_move, (0, 0, 0)) for move in visible_moves]
         
         # Show current pending move
         if self.pending_white_move:
-            row_y = start_y + (len(visible_moves) * row_height)
-            if row_y < y + height - 20:
-                cv2.putText(img, f"{self.pending_white_move.move_number}.", (x + 10, row_y), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.35, (100, 100, 100), 1)
-                cv2.putText(img, self.pending_white_move.white_move, (x + 60, row_y), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.35, (100, 100, 100), 1)
+            row_y = self.ROWS_TOP + len(rows) * self.ROW_HEIGHT
+            if row_y < height - 20:
+                rows.append((f"{self.pending_white_move.move_number}.", self.pending_white_move.white_move,
+                             "", (100, 100, 100)))
+        return rows
+    
+    def _update_rows(self, rows: List[tuple]):
+        bitmap = self._bitmap.pixels
+        bx, by = self._bitmap_origin
+        row_h = self.ROW_HEIGHT
+        top = by + self.ROWS_TOP - self.ROW_ASCENT
+        x0 = bx + self.ROW_MARGIN
+        x1 = x0 + self._blank_row.shape[1]
+        shown = self._shown_rows
+        
+        # גלילה: הזזת השורות שכבר מצוירות למעלה במקום לצייר אותן מחדש
+        shift = max(range(len(shown) + 1),
+                    key=lambda s: (sum(a == b for a, b in zip(shown[s:], rows)), -s))
+        if shift and shift < len(shown):
+            kept = len(shown) - shift
+            bitmap[top:top + kept * row_h, x0:x1] = bitmap[top + shift * row_h:top + len(shown) * row_h, x0:x1]
+        shown = shown[shift:]
+        
+        for i in range(max(len(rows), len(shown))):
+            row = rows[i] if i < len(rows) else None
+            if i < len(shown) and shown[i] == row:
+                continue
+            y0 = top + i * row_h
+            bitmap[y0:y0 + row_h, x0:x1] = self._blank_row if row is None else self._row_strip(row)
+        self._shown_rows = list(rows)
+        if len(self._row_strips) > 4 * (len(rows) + 1):   # שורות שגללו החוצה לא יחזרו
+            self._row_strips = {row: self._row_strips[row] for row in rows if row in self._row_strips}
+    
+    def _row_strip(self, row: tuple) -> np.ndarray:
+        """One rendered row of the log, created once and reused while it scrolls."""
+        strip = self._row_strips.get(row)
+        if strip is None:
+            number, white_move, black_move, color = row
+            strip = self._blank_row.copy()
+            baseline = self.ROW_ASCENT
+            offset = self.ROW_MARGIN
+            cv2.putText(strip, number, (10 - offset, baseline), cv2.FONT_HERSHEY_SIMPLEX, 0.35, color, 1)
+            if white_move:
+                cv2.putText(strip, white_move, (60 - offset, baseline), cv2.FONT_HERSHEY_SIMPLEX, 0.35, color, 1)
+            if black_move:
+                cv2.putText(strip, black_move, (150 - offset, baseline), cv2.FONT_HERSHEY_SIMPLEX, 0.35, color, 1)
+            self._row_strips[row] = strip
+        return strip
     
     def get_moves_count(self) -> int:
         """Get total number of completed moves."""
@@ -0,0 +1,158 @@
+# OccupancyIndex.py - Board cell -> pieces lookup, kept up to date as pieces move instead of scanning the list
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+Cell = Tuple[int, int]
+
+
+class OccupancyIndex:
+    """
+    Two maps over Game.pieces:
+      - source: cell -> pieces standing on it (the piece's physics.cell - a piece
+        in flight still holds the cell it left until it arrives)
+      - target: cell -> the piece flying towards it (released on arrival)
+
+    Game updates the index where pieces move (move start, arrival, capture,
+    promotion). It also heals itself: the list being replaced or changing
+    length, or a lookup hit whose piece is no longer on that cell, rebuilds it.
+
+    The occupied cells are also kept as bitboards (bit y * width + x), overall
+    and per colour when color_of is given, for MoveGenerator.
+    """
+
+    def __init__(self, position_of: Callable[[object], Optional[Cell]],
+                 target_of: Callable[[object], Optional[Cell]],
+                 color_of: Optional[Callable[[object], str]] = None, width: int = 8, height: int = 8):
+        self._position_of = position_of
+        self._target_of = target_of
+        self._color_of = color_of
+        self.width = width
+        self.height = height
+        self._source: Optional[Sequence] = None   # הרשימה שממנה נבנה האינדקס
+        self._count = -1
+        self._cells: Dict[Cell, List[object]] = {}
+        self._cell_of: Dict[int, Cell] = {}        # id(piece) -> cell ב-_cells
+        self._targets: Dict[Cell, object] = {}
+        self._target_cell_of: Dict[int, Cell] = {}
+        self._occupied = 0
+        self._color_bits: Dict[str, int] = {}
+        self.rebuilds = 0
+
+    # ─── lookups ─────────────────────────────────────────────────────────────
+    def at(self, pieces: Sequence, cell: Cell) -> Optional[object]:
+        """The piece standing on cell, or None."""
+        bucket = self._bucket(pieces, cell)
+        return bucket[0] if bucket else None
+
+    def all_at(self, pieces: Sequence, cell: Cell) -> List[object]:
+        """Every piece standing on cell (an arriving piece and the one it captures)."""
+        return list(self._bucket(pieces, cell))
+
+    def heading_to(self, pieces: Sequence, cell: Cell) -> Optional[object]:
+        """The piece in flight towards cell, or None."""
+        self._ensure(pieces)
+        return self._targets.get(cell)
+
+    def is_free(self, pieces: Sequence, cell: Cell) -> bool:
+        """No piece on cell and none on its way there."""
+        return self.at(pieces, cell) is None and self.heading_to(pieces, cell) is None
+
+    def occupied(self, pieces: Sequence, color: Optional[str] = None) -> int:
+        """Bitboard of the cells pieces stand on (only pieces of color if given)."""
+        self._ensure(pieces)
+        return self._occupied if color is None else self._color_bits.get(color, 0)
+
+    # ─── updates ─────────────────────────────────────────────────────────────
+    def update(self, pieces: Sequence, piece):
+        """Re-read where a piece stands and where it is going (after a command or arrival)."""
+        if self._ensure(pieces):
+            return
+        self._discard(piece)
+        self._add(piece)
+
+    def add(self, pieces: Sequence, piece):
+        """After pieces.append(piece)."""
+        if pieces is self._source and len(pieces) == self._count + 1:
+            self._count += 1
+            self._add(piece)
+        else:
+            self.rebuild(pieces)
+
+    def remove(self, pieces: Sequence, piece):
+        """After pieces.remove(piece)."""
+        if pieces is self._source and len(pieces) == self._count - 1:
+            self._count -= 1
+            self._discard(piece)
+        else:
+            self.rebuild(pieces)
+
+    def rebuild(self, pieces: Sequence):
+        self._source = pieces
+        self._count = len(pieces)
+        self._cells.clear()
+        self._cell_of.clear()
+        self._targets.clear()
+        self._target_cell_of.clear()
+        self._occupied = 0
+        self._color_bits.clear()
+        for piece in pieces:
+            self._add(piece)
+        self.rebuilds += 1
+
+    # ─── internals ───────────────────────────────────────────────────────────
+    def _ensure(self, pieces: Sequence) -> bool:
+        """Rebuild if pieces is not the list the index was built from. True if it rebuilt."""
+        if pieces is not self._source or len(pieces) != self._count:
+            self.rebuild(pieces)
+            return True
+        return False
+
+    def _bucket(self, pieces: Sequence, cell: Cell) -> List[object]:
+        self._ensure(pieces)
+        bucket = self._cells.get(cell, ())
+        if any(self._position_of(piece) != cell for piece in bucket):
+            # כלי זז בלי שהאינדקס עודכן - בונים מחדש
+            self.rebuild(pieces)
+            bucket = self._cells.get(cell, ())
+        return bucket
+
+    def _add(self, piece):
+        cell = self._position_of(piece)
+        if isinstance(cell, tuple):   # רק tuple משתווה ל-(x, y) - כמו בחיפוש הליניארי
+            self._cells.setdefault(cell, []).append(piece)
+            self._cell_of[id(piece)] = cell
+            self._mark(cell)
+        target = self._target_of(piece)
+        if isinstance(target, tuple):
+            self._targets[target] = piece
+            self._target_cell_of[id(piece)] = target
+
+    def _discard(self, piece):
+        cell = self._cell_of.pop(id(piece), None)
+        if cell is not None:
+            bucket = self._cells[cell]
+            bucket[:] = [p for p in bucket if p is not piece]
+            if not bucket:
+                del self._cells[cell]
+            self._mark(cell)
+        target = self._target_cell_of.pop(id(piece), None)
+        if target is not None and self._targets.get(target) is piece:
+            del self._targets[target]
+
+    def _mark(self, cell: Cell):
+        """Recompute the bits of one cell from its bucket."""
+        x, y = cell[0], cell[1]
+        if not (isinstance(x, int) and isinstance(y, int) and 0 <= x < self.width and 0 <= y < self.height):
+            return
+        bit = 1 << (y * self.width + x)
+        bucket = self._cells.get(cell, ())
+        if bucket:
+            self._occupied |= bit
+        else:
+            self._occupied &= ~bit
+        if self._color_of is None:
+            return
+        for color in self._color_bits:
+            self._color_bits[color] &= ~bit
+        for piece in bucket:
+            color = self._color_of(piece)
+            self._color_bits[color] = self._color_bits.get(color, 0) | bit
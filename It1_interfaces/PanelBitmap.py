@@ -0,0 +1,49 @@
+# PanelBitmap.py - Rendered pixels of a UI panel, reused until the panel's data changes
+from typing import Hashable, Optional
+import numpy as np
+
+
+class PanelBitmap:
+    """
+    Cache of a panel as it was drawn on the image, including the frame border
+    that cv2 draws slightly outside the panel rectangle. The panel renders into
+    the bitmap only when its key (data version, position, size) changes; every
+    other frame is a single copy. The pixels around the frame are taken from
+    the image under the panel, so the background there must be static (it is,
+    on LayeredCanvas).
+    """
+
+    PAD = 2   # מסגרת בעובי 2 חורגת מעט מהמלבן - כמו LayeredCanvas.PANEL_PAD
+
+    def __init__(self):
+        self.key: Optional[Hashable] = None
+        self.pixels: Optional[np.ndarray] = None
+        self._region = (0, 0, 0, 0)   # (x0, y0, x1, y1) במקור, אחרי חיתוך לגבולות התמונה
+
+    def valid(self, img: np.ndarray, key: Hashable) -> bool:
+        return self.pixels is not None and self.key == (key, img.shape)
+
+    def begin(self, img: np.ndarray, x: int, y: int, width: int, height: int, key: Hashable):
+        """
+        Start a new bitmap from the pixels under the panel.
+        Returns (bitmap, x, y) - draw the panel on the bitmap at (x, y).
+        """
+        pad = self.PAD
+        img_h, img_w = img.shape[:2]
+        x0, y0 = max(0, x - pad), max(0, y - pad)
+        x1, y1 = min(img_w, x + width + pad + 1), min(img_h, y + height + pad + 1)
+        self._region = (x0, y0, x1, y1)
+        self.pixels = img[y0:y1, x0:x1].copy()
+        self.key = (key, img.shape)
+        return self.pixels, x - x0, y - y0
+
+    def blit(self, img: np.ndarray):
+        x0, y0, x1, y1 = self._region
+        img[y0:y1, x0:x1] = self.pixels
+
+    def copy(self) -> "PanelBitmap":
+        other = PanelBitmap()
+        other.key = self.key
+        other.pixels = None if self.pixels is None else self.pixels.copy()
+        other._region = self._region
+        return other
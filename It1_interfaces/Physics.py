@@ -1,8 +1,25 @@
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 from It1_interfaces.Command  import Command
 from It1_interfaces.Board  import Board
 
 
+def interpolate_position(board: Board, start_cell: Tuple[int, int], target_cell: Tuple[int, int],
+                         start_ms: int, end_ms: int, now_ms: int) -> Tuple[int, int]:
+    """
+    מיקום בפיקסלים של כלי בתנועה לינארית בין שני תאים.
+    משותף לשרת (Physics.update) וללקוח, שמחשב את התנועה בעצמו לפי נתוני ה-reset.
+    """
+    total_duration = end_ms - start_ms
+    progress = (now_ms - start_ms) / total_duration if total_duration > 0 else 1.0
+    progress = min(1.0, max(0.0, progress))  # טיק יכול להקדים את זמן הפקודה
+    
+    start_pixel = board.cell_to_pixel(start_cell)
+    target_pixel = board.cell_to_pixel(target_cell)
+    x = start_pixel[0] + (target_pixel[0] - start_pixel[0]) * progress
+    y = start_pixel[1] + (target_pixel[1] - start_pixel[1]) * progress
+    return (int(x), int(y))
+
+
 class Physics:
     """
     בסיס לפיזיקה של כלי: מיקום, מהירות, האם אפשר לתפוס/להיתפס, עדכון מצב.
@@ -73,19 +90,8 @@ class Physics:
                 return Command(timestamp=now_ms, piece_id=self.piece_id, type="arrived", target=self.cell, params=None)
             else:
                 # תנועה בתהליך - אינטרפולציה חלקה
-                total_duration = self.end_time - self.start_time
-                elapsed = now_ms - self.start_time
-                progress = elapsed / total_duration  # אחוז התקדמות (0.0 - 1.0)
-                
-                # חישוב מיקום ביניים
-                start_pixel = self.board.cell_to_pixel(self.start_cell)
-                target_pixel = self.board.cell_to_pixel(self.target_cell)
-                
-                # אינטרפולציה לינארית
-                x = start_pixel[0] + (target_pixel[0] - start_pixel[0]) * progress
-                y = start_pixel[1] + (target_pixel[1] - start_pixel[1]) * progress
-                
-                self.pixel_pos = (int(x), int(y))
+                self.pixel_pos = interpolate_position(self.board, self.start_cell, self.target_cell,
+                                                      self.start_time, self.end_time, now_ms)
         elif self.mode == "jump" and now_ms >= self.end_time:
             # קפיצה הסתיימה - צריך ליצור פקודת arrived
             print(f"🏁 פיזיקה: החתיכה קפצה ל-{self.cell}")
@@ -93,6 +99,20 @@ class Physics:
             return Command(timestamp=now_ms, piece_id=self.piece_id, type="arrived", target=self.cell, params=None)
         return None
 
+    def motion(self) -> Optional[Dict]:
+        """
+        The move reset() planned: start/target cell, start time and duration.
+        Sent once per move so clients interpolate locally (None when not moving).
+        """
+        if not self.moving:
+            return None
+        return {
+            'from_cell': tuple(self.start_cell),
+            'to_cell': tuple(self.target_cell),
+            'start_ms': self.start_time,
+            'duration_ms': self.end_time - self.start_time,
+        }
+
     def can_be_captured(self) -> bool:
         return self._can_be_captured
 
@@ -1,45 +1,92 @@
 import pathlib
-from typing import Dict, Tuple
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Tuple, Optional
 import json
 from It1_interfaces.Board  import Board
+from It1_interfaces.Graphics import Graphics
 from It1_interfaces.GraphicsFactory import GraphicsFactory
+from It1_interfaces.Graphics import sprite_size_for_board
 from It1_interfaces.Moves import Moves
 from It1_interfaces.PhysicsFactory import PhysicsFactory
 from It1_interfaces.State  import State
 from It1_interfaces.Piece  import Piece
+from It1_interfaces.SpriteAtlas import SpriteAtlas
+from It1_interfaces.AssetBundle import AssetBundle
+
+
+@dataclass(frozen=True)
+class PieceTemplate:
+    """Everything the pieces of one type share - parsed once per factory, never changed."""
+    piece_type: str
+    moves: Moves                              # טבלת התנועות - משותפת לכל הכלים מהסוג, לקריאה בלבד
+    configs: Mapping[str, Mapping]            # state folder -> config.json
+    graphics: Graphics                        # אב-טיפוס: כל כלי מקבל copy() עם אותם פריימים
+
 
 class PieceFactory:
-    def __init__(self, board: Board, pieces_root: pathlib.Path):
+    def __init__(self, board: Board, pieces_root: pathlib.Path, atlas: Optional[SpriteAtlas] = None,
+                 sprite_size: Optional[Tuple[int, int]] = None, bundle: Optional[AssetBundle] = None):
         """Initialize piece factory with board and 
         generates the library of piece templates from the pieces directory.."""
 
         self.board = board
         self.pieces_root = pieces_root
-        self.gfx_factory = GraphicsFactory()
+        self.atlas = atlas
+        self.bundle = bundle  # moves.txt / config.json כבר מפוענחים - בלי קריאה מהדיסק
+        # ברירת מחדל: ספרייט בגודל תא של הלוח הזה (ולא 80x80 קבוע)
+        self.sprite_size = tuple(sprite_size) if sprite_size else sprite_size_for_board(board)
+        self.gfx_factory = GraphicsFactory(atlas, self.sprite_size)
         self.physics_factory = PhysicsFactory(board)
-    def _build_state_machine(self, piece_dir: pathlib.Path, cell: Tuple[int, int], piece_id: str, game_queue=None) -> State:
-        # טען moves.txt
-        moves_path = piece_dir / "moves.txt"
-        moves = Moves.from_file(moves_path)
+        self.templates: Dict[str, PieceTemplate] = {}  # ספריית התבניות - סוג כלי נטען בפעם הראשונה שמבקשים אותו
 
-        # נניח שמצב התחלתי הוא idle
+    def template(self, p_type: str) -> PieceTemplate:
+        """The prototype of a piece type, built on first use."""
+        template = self.templates.get(p_type)
+        if template is None:
+            template = self.templates[p_type] = self._build_template(p_type)
+        return template
+
+    def preload(self, p_types) -> "PieceFactory":
+        """Build the templates of the given piece types now, e.g. the promotion targets."""
+        for p_type in p_types:
+            self.template(p_type)
+        return self
+
+    def _build_template(self, p_type: str) -> PieceTemplate:
+        piece_dir = self.pieces_root / p_type
         states_dir = piece_dir / "states"
-        idle_dir = states_dir / "idle"
-        with open(idle_dir / "config.json", "r") as f:
-            config = json.load(f)
-        sprites_dir = idle_dir / "sprites"
 
+        if self.bundle is not None and self.bundle.has_piece(p_type):
+            moves = Moves(self.bundle.moves(p_type))
+            configs = {state: self.bundle.config(p_type, state) for state in self.bundle.states(p_type)}
+        else:
+            # טען moves.txt וה-config של כל מצב
+            moves = Moves.from_file(piece_dir / "moves.txt")
+            configs = {}
+            for state_dir in sorted(p for p in states_dir.iterdir() if p.is_dir()):
+                config_path = state_dir / "config.json"
+                if config_path.is_file():
+                    with open(config_path, "r") as f:
+                        configs[state_dir.name] = json.load(f)
+
+        # נניח שמצב התחלתי הוא idle
         graphics = self.gfx_factory.load(
-            sprites_dir=sprites_dir,
-            cfg=config["graphics"],
+            sprites_dir=states_dir / "idle" / "sprites",
+            cfg=configs["idle"]["graphics"],
             board=self.board
         )
+        return PieceTemplate(p_type, moves, MappingProxyType(configs), graphics)
+
+    def _build_state_machine(self, piece_dir: pathlib.Path, cell: Tuple[int, int], piece_id: str, game_queue=None) -> State:
+        # רק המצב של הכלי עצמו נוצר כאן: פיזיקה ומיקום באנימציה. התנועות והפריימים מהתבנית
+        template = self.template(piece_dir.name)
         physics = self.physics_factory.create(
             start_cell=cell,
-            cfg=config["physics"],
+            cfg=template.configs["idle"]["physics"],
             piece_id=piece_id
         )
-        return State(moves, graphics, physics, game_queue)
+        return State(template.moves, template.graphics.copy(), physics, game_queue)
 
     def create_piece(self, p_type: str, cell: tuple[int, int], game_queue=None) -> Piece:
 
@@ -50,3 +97,27 @@ class PieceFactory:
         state = self._build_state_machine(piece_dir, cell, p_type, game_queue)
 
         return Piece(piece_id=p_type, init_state=state)
+
+    def create_pieces(self, placements: Iterable[Tuple[str, str, Tuple[int, int]]], game_queue=None) -> List[Piece]:
+        """Create a whole layout at once from (piece_id, piece_type, cell) - see BoardSetup.placements()."""
+        placements = list(placements)
+        failed = set()
+        for p_type in sorted({p_type for _, p_type, _ in placements}):
+            try:
+                self.template(p_type)
+            except Exception as e:
+                print(f"בעיה עם {p_type}: {e}")
+                failed.add(p_type)
+
+        pieces = []
+        for piece_id, p_type, cell in placements:
+            if p_type in failed:
+                continue
+            try:
+                state = self._build_state_machine(self.pieces_root / p_type, cell, piece_id, game_queue)
+            except Exception as e:
+                # כלי אחד שנכשל לא מפיל את כל הלוח
+                print(f"בעיה עם {piece_id}: {e}")
+                continue
+            pieces.append(Piece(piece_id=piece_id, init_state=state))
+        return pieces
@@ -0,0 +1,133 @@
+# PieceRegistry.py - piece_id -> piece, live count per piece type and the kings of each colour
+from typing import Dict, List, Optional, Sequence
+
+
+def piece_type_of(piece_id: str) -> str:
+    """"QW1" -> "QW": piece letter + colour letter."""
+    return piece_id[:2]
+
+
+class PieceRegistry:
+    """
+    Lookups over Game.pieces that used to be list scans: a piece by its ID
+    (command dispatch), how many pieces of a type are alive, the next free ID
+    of a type (promoted queens) and which kings are alive per colour (win check).
+
+    Same contract as OccupancyIndex: Game reports add/remove, and the registry
+    rebuilds itself when the list is replaced or changes length behind its
+    back, or when a lookup finds a piece whose ID has changed. A miss (no such
+    piece, no king left) is confirmed with one rebuild before it is reported.
+    """
+
+    def __init__(self):
+        self._source: Optional[Sequence] = None
+        self._count = -1
+        self._by_id: Dict[str, object] = {}
+        self._type_counts: Dict[str, int] = {}
+        self._kings: Dict[str, List[object]] = {}   # 'W' / 'B' -> מלכים חיים
+        # סוג -> המספר הבא. רק עולה (גם אחרי תפיסה), כדי ש-ID לא יחזור על עצמו
+        self._next_number: Dict[str, int] = {}
+        self.rebuilds = 0
+
+    # ─── lookups ─────────────────────────────────────────────────────────────
+    def get(self, pieces: Sequence, piece_id: str) -> Optional[object]:
+        """The piece with this ID (the first one in the list, like the old scan)."""
+        rebuilt = self._ensure(pieces)
+        piece = self._by_id.get(piece_id)
+        if (piece is None or piece.piece_id != piece_id) and not rebuilt:
+            self.rebuild(pieces)
+            piece = self._by_id.get(piece_id)
+        return piece
+
+    def count(self, pieces: Sequence, piece_type: str) -> int:
+        """Live pieces of a type, e.g. count(pieces, "QW")."""
+        self._ensure(pieces)
+        return self._type_counts.get(piece_type, 0)
+
+    def next_id(self, pieces: Sequence, piece_type: str) -> str:
+        """A new ID for a piece of this type: "QW2" - never one a live or captured piece had."""
+        number = self._free_number(pieces, piece_type)
+        self._next_number[piece_type] = number + 1
+        return f"{piece_type}{number}"
+
+    def peek_id(self, pieces: Sequence, piece_type: str) -> str:
+        """The ID next_id() would return, without taking it."""
+        return f"{piece_type}{self._free_number(pieces, piece_type)}"
+
+    def kings(self, pieces: Sequence, color: str) -> List[object]:
+        """Live kings of a colour ('W' or 'B')."""
+        rebuilt = self._ensure(pieces)
+        kings = self._kings.get(color, [])
+        if not rebuilt and (not kings or any(piece_type_of(k.piece_id) != "K" + color for k in kings)):
+            self.rebuild(pieces)
+            kings = self._kings.get(color, [])
+        return list(kings)
+
+    def king_alive(self, pieces: Sequence, color: str) -> bool:
+        return bool(self.kings(pieces, color))
+
+    # ─── updates ─────────────────────────────────────────────────────────────
+    def add(self, pieces: Sequence, piece):
+        """After pieces.append(piece)."""
+        if pieces is self._source and len(pieces) == self._count + 1:
+            self._count += 1
+            self._add(piece)
+        else:
+            self.rebuild(pieces)
+
+    def remove(self, pieces: Sequence, piece):
+        """After pieces.remove(piece)."""
+        if pieces is self._source and len(pieces) == self._count - 1:
+            self._count -= 1
+            self._discard(piece)
+        else:
+            self.rebuild(pieces)
+
+    def rebuild(self, pieces: Sequence):
+        self._source = pieces
+        self._count = len(pieces)
+        self._by_id.clear()
+        self._type_counts.clear()
+        self._kings.clear()
+        for piece in pieces:
+            self._add(piece)
+        self.rebuilds += 1
+
+    # ─── internals ───────────────────────────────────────────────────────────
+    def _ensure(self, pieces: Sequence) -> bool:
+        if pieces is not self._source or len(pieces) != self._count:
+            self.rebuild(pieces)
+            return True
+        return False
+
+    def _free_number(self, pieces: Sequence, piece_type: str) -> int:
+        self._ensure(pieces)
+        number = self._next_number.get(piece_type, 0)
+        while f"{piece_type}{number}" in self._by_id:
+            number += 1
+        return number
+
+    def _add(self, piece):
+        piece_id = piece.piece_id
+        self._by_id.setdefault(piece_id, piece)
+        p_type = piece_type_of(piece_id)
+        number = piece_id[2:]
+        if number.isdigit() and int(number) >= self._next_number.get(p_type, 0):
+            self._next_number[p_type] = int(number) + 1
+        self._type_counts[p_type] = self._type_counts.get(p_type, 0) + 1
+        if p_type.startswith("K") and len(p_type) == 2:
+            self._kings.setdefault(p_type[1], []).append(piece)
+
+    def _discard(self, piece):
+        piece_id = piece.piece_id
+        if self._by_id.get(piece_id) is piece:
+            del self._by_id[piece_id]
+            # כלי נוסף עם אותו ID (לא אמור לקרות) - יימצא ב-rebuild בחיפוש הבא
+        p_type = piece_type_of(piece_id)
+        if self._type_counts.get(p_type, 0) > 1:
+            self._type_counts[p_type] -= 1
+        else:
+            self._type_counts.pop(p_type, None)
+        kings = self._kings.get(p_type[1:], [])
+        if p_type.startswith("K") and piece in kings:
+            kings.remove(piece)
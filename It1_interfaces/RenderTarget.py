@@ -0,0 +1,76 @@
+# RenderTarget.py - Where composed frames go: an OpenCV window or an offscreen buffer
+from typing import Callable, Optional
+import cv2
+import numpy as np
+
+# Called with every presented frame. The frame is the renderer's live buffer -
+# a sink that keeps it beyond the call must copy it.
+FrameSink = Callable[[np.ndarray], None]
+
+NO_KEY = 255  # cv2.waitKey(...) & 0xFF when nothing was pressed
+
+
+class RenderTarget:
+    """Base render target: remembers the last frame and forwards frames to an optional sink."""
+
+    def __init__(self, frame_sink: Optional[FrameSink] = None):
+        self.frame_sink = frame_sink
+        self.last_frame: Optional[np.ndarray] = None
+        self.frames_presented = 0
+
+    def present(self, frame: np.ndarray):
+        self.last_frame = frame
+        self.frames_presented += 1
+        if self.frame_sink is not None:
+            self.frame_sink(frame)
+
+    def poll_key(self, delay_ms: int = 1) -> int:
+        """Return the pressed key (masked to 0-255), NO_KEY if none."""
+        return NO_KEY
+
+    def snapshot(self) -> Optional[np.ndarray]:
+        """Copy of the last presented frame (safe to keep)."""
+        return None if self.last_frame is None else self.last_frame.copy()
+
+    def close(self):
+        pass
+
+
+class WindowTarget(RenderTarget):
+    """Shows frames in an OpenCV window and reads the keyboard from it."""
+
+    def __init__(self, window_name: str = "Chess Game", frame_sink: Optional[FrameSink] = None,
+                 topmost: bool = True):
+        super().__init__(frame_sink)
+        self.window_name = window_name
+        self.topmost = topmost
+        self._window_on_top = False
+
+    def present(self, frame: np.ndarray):
+        cv2.imshow(self.window_name, frame)
+        if self.topmost and not self._window_on_top:
+            # Make sure window is in focus - פעם אחת, לא בכל פריים
+            cv2.setWindowProperty(self.window_name, cv2.WND_PROP_TOPMOST, 1)
+            self._window_on_top = True
+        super().present(frame)
+
+    def poll_key(self, delay_ms: int = 1) -> int:
+        # waitKey גם מעבד את אירועי החלון - חייב להיקרא בכל איטרציה
+        return cv2.waitKey(delay_ms) & 0xFF
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class OffscreenTarget(RenderTarget):
+    """
+    No window at all - frames stay in memory (last_frame / snapshot) and go to
+    the sink. For tests, headless servers, thumbnails and draw benchmarks.
+    """
+
+    def encode_png(self) -> Optional[bytes]:
+        """PNG bytes of the last frame, e.g. for server-side snapshots."""
+        if self.last_frame is None:
+            return None
+        ok, buf = cv2.imencode(".png", self.last_frame)
+        return buf.tobytes() if ok else None
@@ -0,0 +1,172 @@
+# RenderWorker.py - Composes frames from immutable snapshots on a background thread, double-buffered
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+from It1_interfaces.Board import Board
+from It1_interfaces.BoardRenderer import BoardRenderer, Box
+from It1_interfaces.LayeredCanvas import DrawFn, LayeredCanvas
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """Everything needed to draw one frame, copied on the game thread."""
+    sprites: Tuple[Tuple[object, object, Tuple[int, int]], ...]   # BoardRenderer.snapshot_sprites()
+    boxes: Tuple[Box, ...] = ()
+    panels: Dict[str, Tuple[Hashable, DrawFn]] = field(default_factory=dict)  # name -> (version, draw_fn)
+    overlay: Optional[object] = None   # MessageOverlay.snapshot(), None when there are no messages
+    hud: Optional[object] = None       # TickProfiler.hud(), None when the HUD is hidden
+
+
+class FrameComposer:
+    """
+    One frame buffer: a board renderer and a window canvas that are brought up
+    to date from a FrameSnapshot. Each buffer keeps its own dirty-rect history.
+    """
+
+    def __init__(self, board: Board, build_canvas: Callable[[int, int], LayeredCanvas]):
+        self.board = board
+        self.renderer = BoardRenderer(board)
+        self._build_canvas = build_canvas
+        self.canvas: Optional[LayeredCanvas] = None
+
+    def compose(self, snapshot: FrameSnapshot) -> np.ndarray:
+        board_img = self.renderer.render_sprites(snapshot.sprites, snapshot.boxes).img.img
+        if self.canvas is None:
+            self.canvas = self._build_canvas(board_img.shape[1], board_img.shape[0])
+
+        frame = self.canvas.compose(board_img,
+                                    {name: version for name, (version, _) in snapshot.panels.items()},
+                                    self.renderer.last_dirty_rects,
+                                    {name: draw_fn for name, (_, draw_fn) in snapshot.panels.items()})
+        if snapshot.overlay is not None:
+            # ההודעות צוירו על הקנבס - לשחזר בפריים הבא רק את האזורים שלהן
+            self.canvas.invalidate(snapshot.overlay.draw_on_image(frame))
+        if snapshot.hud is not None:
+            self.canvas.invalidate(snapshot.hud.draw_on_image(frame))
+        return frame
+
+
+class RenderWorker:
+    """
+    Composes frames on a background thread into one of two buffers while the
+    game thread keeps simulating and polling input. The game thread submits
+    snapshots and presents whichever buffer finished last; the worker never
+    writes into the buffer that is being presented. If the worker falls behind,
+    older snapshots are replaced by newer ones (skipped), never queued.
+    """
+
+    def __init__(self, make_composer: Callable[[], FrameComposer], buffers: int = 2):
+        if buffers < 2:
+            raise ValueError("RenderWorker needs at least two buffers")
+        self._composers: List[FrameComposer] = [make_composer() for _ in range(buffers)]
+        self._frames: List[Optional[np.ndarray]] = [None] * buffers
+        self._sources: List[Optional[FrameSnapshot]] = [None] * buffers   # ה-snapshot שממנו צויר כל באפר
+        self._cond = threading.Condition()
+        self._pending: Optional[FrameSnapshot] = None
+        self._ready: Optional[int] = None        # buffer with the newest finished frame
+        self._presenting: Optional[int] = None   # buffer the game thread is presenting
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # מונים
+        self.composed = 0   # פריימים שצוירו
+        self.skipped = 0    # snapshots / פריימים שהוחלפו בחדשים לפני שהוצגו
+        self.error: Optional[BaseException] = None
+
+    # ─── lifecycle ───────────────────────────────────────────────────────────
+    def start(self) -> "RenderWorker":
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._worker, name="RenderWorker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        if self._thread is None:
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def board(self) -> Board:
+        return self._composers[0].board
+
+    # ─── game thread ─────────────────────────────────────────────────────────
+    def submit(self, snapshot: FrameSnapshot):
+        """Hand a snapshot to the worker. Never blocks; an unstarted snapshot is replaced."""
+        with self._cond:
+            if self._pending is not None:
+                self.skipped += 1
+            self._pending = snapshot
+            self._cond.notify_all()
+
+    def acquire_frame(self, timeout: Optional[float] = 0.0) -> Optional[np.ndarray]:
+        """
+        Newest finished frame, or None if none finished since the last acquire.
+        The buffer belongs to the caller until release_frame() or the next frame
+        acquired (which hands the previous buffer back to the worker).
+        timeout - כמה לחכות לפריים (0 = לא לחכות, None = לחכות בלי הגבלה).
+        """
+        with self._cond:
+            if self._ready is None and timeout != 0:
+                self._cond.wait_for(lambda: self._ready is not None or not self._running, timeout)
+            if self._ready is None:
+                return None
+            self._presenting, self._ready = self._ready, None
+            self._cond.notify_all()   # הבאפר הקודם שוחרר
+            return self._frames[self._presenting]
+
+    def render(self, snapshot: FrameSnapshot, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """Submit and wait for the frame of this snapshot (acquired - call release_frame())."""
+        self.submit(snapshot)
+        with self._cond:
+            self._cond.wait_for(lambda: not self._running or
+                                (self._ready is not None and self._sources[self._ready] is snapshot), timeout)
+            if self._ready is None or self._sources[self._ready] is not snapshot:
+                return None
+            self._presenting, self._ready = self._ready, None
+            self._cond.notify_all()
+            return self._frames[self._presenting]
+
+    def release_frame(self):
+        with self._cond:
+            self._presenting = None
+            self._cond.notify_all()
+
+    # ─── worker ──────────────────────────────────────────────────────────────
+    def _free_buffer(self) -> Optional[int]:
+        for i in range(len(self._composers)):
+            if i != self._presenting and i != self._ready:
+                return i
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: not self._running or
+                                    (self._pending is not None and self._free_buffer() is not None))
+                if not self._running:
+                    return
+                snapshot, self._pending = self._pending, None
+                target = self._free_buffer()
+
+            # מחוץ ל-lock: רוב העבודה ב-cv2/numpy משחררת את ה-GIL, ה-thread הראשי ממשיך בסימולציה
+            try:
+                frame = self._composers[target].compose(snapshot)
+            except Exception as e:
+                print(f"❌ RenderWorker: failed to compose frame: {e}")
+                self.error = e
+                continue
+
+            with self._cond:
+                if self._ready is not None:
+                    self.skipped += 1   # הפריים הקודם לא הוצג ויוחלף
+                self._frames[target] = frame
+                self._sources[target] = snapshot
+                self._ready = target
+                self.composed += 1
+                self._cond.notify_all()
@@ -1,8 +1,10 @@
 # ScoreSystem.py - Tracks and displays game score based on captured pieces
+import copy
 from typing import Dict
 import cv2
 import numpy as np
 from It1_interfaces.EventSystem import Event, EventType, event_publisher
+from It1_interfaces.PanelBitmap import PanelBitmap
 
 class ScoreSystem:
     """Component that tracks and displays game score based on captured pieces."""
@@ -25,6 +27,8 @@ class ScoreSystem:
         
         self.player1_captured: Dict[str, int] = {}  # Count of each piece type captured by white
         self.player2_captured: Dict[str, int] = {}  # Count of each piece type captured by black
+        self.version = 0  # Bumped on every change so the UI panel is redrawn only when needed
+        self._bitmap = PanelBitmap()  # The rendered panel, re-rasterized only when version changes
         
         # Subscribe to relevant events
         event_publisher.subscribe(EventType.PIECE_CAPTURED, self.on_piece_captured)
@@ -38,6 +42,7 @@ class ScoreSystem:
         self.player2_score = 0
         self.player1_captured.clear()
         self.player2_captured.clear()
+        self.version += 1
         print("🏆 ScoreSystem: Game started - reset scores")
     
     def on_piece_captured(self, event: Event):
@@ -70,6 +75,8 @@ class ScoreSystem:
             self.player2_score += piece_value
             self.player2_captured[captured_type] = self.player2_captured.get(captured_type, 0) + 1
             print(f"🏆 {self.player2_name} scored {piece_value} points for capturing {captured_piece}")
+        
+        self.version += 1  # The panel is redrawn on the next frame
     
     def get_score_difference(self) -> int:
         """Get score difference (positive if player1 ahead, negative if player2 ahead)."""
@@ -85,8 +92,24 @@ class ScoreSystem:
         else:
             return "Tied"
     
+    def snapshot(self) -> "ScoreSystem":
+        """Frozen copy for drawing on another thread (no event subscriptions)."""
+        snap = copy.copy(self)
+        snap.player1_captured = dict(self.player1_captured)
+        snap.player2_captured = dict(self.player2_captured)
+        snap._bitmap = self._bitmap.copy()
+        return snap
+    
     def draw_on_image(self, img: np.ndarray, x: int, y: int, width: int, height: int):
         """Draw score display on the given image."""
+        key = (self.version, x, y, width, height)
+        if not self._bitmap.valid(img, key):
+            bitmap, bx, by = self._bitmap.begin(img, x, y, width, height, key)
+            self._render_panel(bitmap, bx, by, width, height)
+        self._bitmap.blit(img)
+    
+    def _render_panel(self, img: np.ndarray, x: int, y: int, width: int, height: int):
+        """Rasterize the score panel (only when the score changed)."""
         # Draw background
         cv2.rectangle(img, (x, y), (x + width, y + height), (250, 250, 250), -1)
         cv2.rectangle(img, (x, y), (x + width, y + height), (0, 0, 0), 2)
@@ -0,0 +1,163 @@
+# SpriteAtlas.py - All piece sprite frames decoded once into one contiguous array
+import os
+import pathlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from It1_interfaces.img import Img
+
+# progress(done, total) - נקרא אחרי כל קובץ שפוענח
+ProgressFn = Callable[[int, int], None]
+
+
+def print_progress(done: int, total: int):
+    """Default progress report - one line per quarter."""
+    quarter = max(1, total // 4)
+    if done == total or done % quarter == 0:
+        print(f"🗂️ Decoding sprites: {done}/{total}")
+
+
+def decode_sprite(path: pathlib.Path, size: Tuple[int, int]) -> Optional[np.ndarray]:
+    """
+    Pixels of one image file resized to size, None if it cannot be read. Same pixels
+    as Img().read(path, size=size), without the blit data - the atlas frames get their own.
+    """
+    try:
+        # קריאה בטוחה גם אם יש תווים בעברית
+        img = cv2.imdecode(np.fromfile(str(path), dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+    except Exception as e:
+        print(f"❌ Failed to load image {path}: {e}")
+        return None
+    if img is None:
+        print(f"⚠️ Warning: failed to load image {path}")
+        return None
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+
+def decode_sprites(paths: Sequence[pathlib.Path], size: Tuple[int, int],
+                   workers: Optional[int] = None, progress: Optional[ProgressFn] = None) -> List[Optional[np.ndarray]]:
+    """
+    Decode and resize image files on a thread pool (cv2 releases the GIL while
+    decoding/resizing), or in this thread with a single worker or a single CPU.
+    Results are in the order of paths, None for files that failed.
+    """
+    results: List[Optional[np.ndarray]] = [None] * len(paths)
+    if not paths:
+        return results
+    workers = workers or min(8, os.cpu_count() or 1)
+
+    def decode(i: int):
+        results[i] = decode_sprite(paths[i], size)
+
+    if workers <= 1 or len(paths) == 1:
+        # בלי pool - ל-thread-ים אין מה להרוויח, רק תקורה
+        for i in range(len(paths)):
+            decode(i)
+            if progress is not None:
+                progress(i + 1, len(paths))
+        return results
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="SpriteDecode") as pool:
+        futures = [pool.submit(decode, i) for i in range(len(paths))]
+        for done, future in enumerate(as_completed(futures), 1):
+            future.result()
+            if progress is not None:
+                progress(done, len(paths))
+    return results
+
+
+class SpriteAtlas:
+    """
+    Holds every frame of every piece type and state (pieces/<type>/states/<state>/sprites/*.png)
+    in a single (N, H, W, C) uint8 array. Frames are handed out as Img objects whose
+    pixels are views (slices) into that array, so pieces never own their own copies.
+    """
+
+    _shared: Dict[Tuple[str, Tuple[int, int]], "SpriteAtlas"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, frames: np.ndarray, index: Dict[Tuple[str, str], Tuple[int, int]]):
+        self.frames = frames        # (N, H, W, C)
+        self.index = index          # (piece_type, state_folder) -> (start, end) in frames
+        # Img wrappers per (piece_type, state) - shared so their blit caches are shared too
+        self._imgs: Dict[Tuple[str, str], List[Img]] = {}
+
+    @classmethod
+    def build(cls, pieces_root: pathlib.Path, size: Tuple[int, int] = (80, 80),
+              workers: Optional[int] = None, progress: Optional[ProgressFn] = print_progress) -> "SpriteAtlas":
+        """Decode and resize every sprite under pieces_root - all files at once, on a thread pool."""
+        started = time.perf_counter()
+        pieces_root = pathlib.Path(pieces_root)
+
+        # קודם אוספים את כל הקבצים בסדר קבוע, ואז מפענחים את כולם במקביל
+        groups: List[Tuple[Tuple[str, str], List[pathlib.Path]]] = []
+        for piece_dir in sorted(p for p in pieces_root.iterdir() if p.is_dir()):
+            states_dir = piece_dir / "states"
+            if not states_dir.is_dir():
+                continue
+            for state_dir in sorted(p for p in states_dir.iterdir() if p.is_dir()):
+                groups.append(((piece_dir.name, state_dir.name), sorted((state_dir / "sprites").glob("*.png"))))
+        results = iter(decode_sprites([path for _, paths in groups for path in paths], size, workers, progress))
+
+        decoded: List[np.ndarray] = []
+        index: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        for key, paths in groups:
+            start = len(decoded)
+            for _ in paths:
+                img = next(results)
+                if img is not None:
+                    decoded.append(img)
+            if len(decoded) > start:
+                index[key] = (start, len(decoded))
+
+        channels = 4 if any(f.ndim == 3 and f.shape[2] == 4 for f in decoded) else 3
+        frames = np.empty((len(decoded), size[1], size[0], channels), dtype=np.uint8)
+        for i, frame in enumerate(decoded):
+            if frame.ndim == 2:
+                frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+            if frame.shape[2] == channels:
+                frames[i] = frame
+            else:
+                frames[i, ..., :3] = frame[..., :3]
+                frames[i, ..., 3] = 255
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"🗂️ SpriteAtlas: {len(decoded)} frames, {len(index)} states, {frames.nbytes // 1024} KB "
+              f"in {elapsed_ms:.0f} ms")
+        return cls(frames, index)
+
+    @classmethod
+    def shared(cls, pieces_root: pathlib.Path, size: Tuple[int, int] = (80, 80)) -> "SpriteAtlas":
+        """Process-wide atlas per (pieces_root, size) - built on first use, reused by every game/room."""
+        key = (str(pathlib.Path(pieces_root).resolve()), tuple(size))
+        with cls._shared_lock:
+            atlas = cls._shared.get(key)
+            if atlas is None:
+                atlas = cls.build(pieces_root, size)
+                cls._shared[key] = atlas
+            return atlas
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Frame size as (width, height)."""
+        return int(self.frames.shape[2]), int(self.frames.shape[1])
+
+    def has(self, piece_type: str, state: str) -> bool:
+        return (piece_type, state) in self.index
+
+    def get_frames(self, piece_type: str, state: str) -> List[Img]:
+        """Return the frames of a piece state as Img objects viewing into the atlas."""
+        key = (piece_type, state)
+        imgs = self._imgs.get(key)
+        if imgs is None:
+            start, end = self.index[key]
+            imgs = []
+            for i in range(start, end):
+                img = Img()
+                img.img = self.frames[i]   # view, not a copy
+                imgs.append(img)
+            self._imgs[key] = imgs
+        return imgs
@@ -0,0 +1,159 @@
+# TickProfiler.py - Per-stage timings of the game loop in ring buffers, with percentiles and an on-screen HUD
+import contextlib
+import json
+import pathlib
+import time
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+
+# (x0, y0, x1, y1) in image pixels, x1/y1 exclusive - same as MessageOverlay.Rect
+Rect = Tuple[int, int, int, int]
+
+_NULL_STAGE = contextlib.nullcontext()   # כבוי - אותו אובייקט בכל קריאה, בלי הקצאות ובלי מדידה
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "TickProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _Ring:
+    __slots__ = ("values", "index", "count")
+
+    def __init__(self, capacity: int):
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+
+    def push(self, value: float):
+        self.values[self.index] = value
+        self.index = (self.index + 1) % len(self.values)
+        if self.count < len(self.values):
+            self.count += 1
+
+    def samples(self) -> np.ndarray:
+        return self.values[:self.count]
+
+
+class TickProfiler:
+    """
+    Records how long each stage of the game loop takes (pieces update, command
+    drain, draw, ...). Every stage keeps its last `capacity` samples in a ring
+    buffer; summary() gives p50/p95/p99. When disabled, stage() returns a
+    shared no-op context, so the instrumentation can stay in production code.
+    """
+
+    PERCENTILES = (50, 95, 99)
+    HUD_REFRESH_S = 0.25   # חישוב האחוזונים לתצוגה - לא בכל פריים
+
+    def __init__(self, capacity: int = 600, enabled: bool = False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.hud_visible = False
+        self._rings: Dict[str, _Ring] = {}
+        self._hud: Optional["ProfilerHud"] = None
+        self._hud_time = 0.0
+
+    # ─── recording ───────────────────────────────────────────────────────────
+    def stage(self, name: str):
+        """Context manager timing one stage: `with profiler.stage("draw"): ...`"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name: str, duration_ms: float):
+        ring = self._rings.get(name)
+        if ring is None:
+            ring = self._rings[name] = _Ring(self.capacity)
+        ring.push(duration_ms)
+
+    def reset(self):
+        self._rings.clear()
+        self._hud = None
+
+    # ─── results ─────────────────────────────────────────────────────────────
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """stage -> {'count', 'mean', 'p50', 'p95', 'p99', 'max'} in milliseconds."""
+        result = {}
+        for name, ring in self._rings.items():
+            samples = ring.samples()
+            if not len(samples):
+                continue
+            p50, p95, p99 = np.percentile(samples, self.PERCENTILES)
+            result[name] = {
+                'count': int(len(samples)),
+                'mean': float(samples.mean()),
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+                'max': float(samples.max()),
+            }
+        return result
+
+    def dump(self, path) -> pathlib.Path:
+        """Write summary() and the raw samples as JSON."""
+        path = pathlib.Path(path)
+        data = {
+            'summary': self.summary(),
+            'samples_ms': {name: ring.samples().round(4).tolist() for name, ring in self._rings.items()},
+        }
+        path.write_text(json.dumps(data, indent=2))
+        print(f"⏱️ TickProfiler: stats written to {path}")
+        return path
+
+    # ─── HUD ─────────────────────────────────────────────────────────────────
+    def toggle_hud(self) -> bool:
+        """Show/hide the HUD. Showing it also turns recording on."""
+        self.hud_visible = not self.hud_visible
+        if self.hud_visible:
+            self.enabled = True
+        self._hud = None
+        return self.hud_visible
+
+    def hud(self) -> Optional["ProfilerHud"]:
+        """Immutable HUD text for the current frame, None when hidden (refreshed every HUD_REFRESH_S)."""
+        if not self.hud_visible:
+            return None
+        now = time.monotonic()
+        if self._hud is None or now - self._hud_time >= self.HUD_REFRESH_S:
+            lines = ["stage            p50    p95    p99 ms"]
+            for name, stats in self.summary().items():
+                lines.append(f"{name:<15}{stats['p50']:6.2f} {stats['p95']:6.2f} {stats['p99']:6.2f}")
+            self._hud = ProfilerHud(tuple(lines))
+            self._hud_time = now
+        return self._hud
+
+
+class ProfilerHud:
+    """Text block drawn in the top-left corner of a frame (same draw_on_image contract as MessageOverlay)."""
+
+    LINE_HEIGHT = 16
+
+    def __init__(self, lines: Tuple[str, ...]):
+        self.lines = lines
+
+    def draw_on_image(self, img: np.ndarray) -> List[Rect]:
+        height, width = img.shape[:2]
+        x0, y0 = 5, 5
+        x1 = min(width, x0 + 300)
+        y1 = min(height, y0 + 8 + self.LINE_HEIGHT * len(self.lines))
+        if x0 >= x1 or y0 >= y1:
+            return []
+        cv2.rectangle(img, (x0, y0), (x1 - 1, y1 - 1), (0, 0, 0), -1)
+        for i, line in enumerate(self.lines):
+            cv2.putText(img, line, (x0 + 5, y0 + 16 + i * self.LINE_HEIGHT),
+                        cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 255, 0), 1)
+        return [(x0, y0, x1, y1)]
@@ -0,0 +1,196 @@
+# VideoRecorder.py - Records presented frames to a video file / image sequence on a background thread
+import pathlib
+import queue
+import threading
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+
+DROP_NEWEST = "drop_newest"   # התור מלא - הפריים החדש נזרק
+DROP_OLDEST = "drop_oldest"   # התור מלא - הפריים הישן ביותר בתור נזרק לטובת החדש
+
+_STOP = object()
+
+
+class VideoRecorder:
+    """
+    Frame sink that records a game without slowing the game loop.
+    push() only copies the frame into a bounded queue; a worker thread does the
+    encoding (cv2.VideoWriter, or PNG files when path is a directory / has no
+    video extension). When the encoder falls behind, frames are dropped
+    according to drop_policy instead of blocking the caller.
+
+    The output has a fixed fps while the game draws at its own pace, so frames
+    pushed with a timestamp are placed on the output timeline: a frame is
+    repeated until the next one is due, and a frame replaced within the same
+    output slot is dropped. Frames without a timestamp take one slot each.
+    """
+
+    VIDEO_EXTENSIONS = {".mp4": "mp4v", ".avi": "MJPG", ".mkv": "mp4v", ".mov": "mp4v"}
+
+    def __init__(self, path, fps: float = 30.0, max_queue: int = 32,
+                 drop_policy: str = DROP_OLDEST, fourcc: Optional[str] = None):
+        if drop_policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.path = pathlib.Path(path)
+        self.fps = fps
+        self.drop_policy = drop_policy
+        self.image_sequence = self.path.suffix.lower() not in self.VIDEO_EXTENSIONS
+        self.fourcc = fourcc or self.VIDEO_EXTENSIONS.get(self.path.suffix.lower(), "mp4v")
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._writer: Optional[cv2.VideoWriter] = None
+        self._frame_size: Optional[Tuple[int, int]] = None
+        self._thread: Optional[threading.Thread] = None
+
+        # מונים
+        self.captured = 0   # פריימים שנכנסו לתור ולא נזרקו ממנו (נכתבו / ייכתבו)
+        self.dropped = 0    # פריימים שנזרקו (תור מלא / אחרי stop)
+        self.written = 0    # פריימים שנכתבו בפועל (כולל חזרות)
+        self.duplicated = 0  # חזרות על פריים קודם - הזמן של המשחק נשמר גם כשלא צויר פריים
+        self.errors = 0     # פריימים שהכתיבה שלהם נכשלה
+
+    # ─── lifecycle ───────────────────────────────────────────────────────────
+    def start(self) -> "VideoRecorder":
+        if self._thread is None:
+            if self.image_sequence:
+                self.path.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._worker, name="VideoRecorder", daemon=True)
+            self._thread.start()
+            print(f"🎬 VideoRecorder: recording to {self.path}")
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Flush what's queued, then close the file."""
+        if self._thread is None:
+            return
+        thread, self._thread = self._thread, None   # push() מפסיק להכניס פריימים
+        while True:
+            try:
+                self._queue.put(_STOP, timeout=0.1)
+                break
+            except queue.Full:
+                if not thread.is_alive():
+                    # ה-worker מת - אף אחד לא ירוקן את התור, זורקים את מה שנשאר
+                    self._drain()
+                elif timeout is not None:
+                    # ה-worker תקוע - מפנים מקום לסימן העצירה במקום לחכות לנצח
+                    self._drain(1)
+        thread.join(timeout)
+        print(f"🎬 VideoRecorder: {self.written} frames written ({self.duplicated} repeated), "
+              f"{self.dropped} dropped, {self.errors} failed")
+
+    @property
+    def recording(self) -> bool:
+        return self._thread is not None
+
+    # ─── frame sink ──────────────────────────────────────────────────────────
+    def push(self, frame: np.ndarray, timestamp_ms: Optional[float] = None) -> bool:
+        """
+        Queue a frame shown at timestamp_ms (game time) for encoding.
+        Never blocks; returns False if this frame was not queued.
+        """
+        if self._thread is None:
+            self.dropped += 1
+            return False
+
+        with self._lock:
+            if self._queue.full():
+                if self.drop_policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                try:
+                    self._queue.get_nowait()
+                    self.captured -= 1   # נכנס לתור אבל לא ייכתב - נספר רק כ-dropped
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+            try:
+                # הבאפר של הרנדרר חי וממשיך להשתנות - חייבים עותק
+                self._queue.put_nowait((timestamp_ms, frame.copy()))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self.captured += 1
+        return True
+
+    __call__ = push   # אפשר להעביר את ה-recorder ישירות כ-frame_sink
+
+    # ─── worker ──────────────────────────────────────────────────────────────
+    def _worker(self):
+        pending = None     # (slot, frame) - נכתב כשידוע מתי מגיע הפריים הבא
+        origin_ms = None   # זמן המשחק של slot 0
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                timestamp_ms, frame = item
+                next_slot = 0 if pending is None else pending[0] + 1
+                if timestamp_ms is None:
+                    slot = next_slot
+                else:
+                    if origin_ms is None:
+                        origin_ms = timestamp_ms - next_slot * 1000.0 / self.fps
+                    slot = round((timestamp_ms - origin_ms) * self.fps / 1000.0)
+                if pending is None:
+                    pending = (slot, frame)
+                elif slot <= pending[0]:
+                    # אותו slot בווידאו - הפריים החדש מחליף את הקודם
+                    with self._lock:
+                        self.captured -= 1
+                        self.dropped += 1
+                    pending = (pending[0], frame)
+                else:
+                    self._emit(pending[1], slot - pending[0])
+                    pending = (slot, frame)
+        finally:
+            if pending is not None:
+                self._emit(pending[1], 1)
+            if self._writer is not None:
+                self._writer.release()
+                self._writer = None
+
+    def _emit(self, frame: np.ndarray, copies: int):
+        """Write a frame for the given number of output slots."""
+        for i in range(copies):
+            try:
+                self._write(frame)
+            except Exception as e:
+                # כשל בכתיבת פריים אחד לא הורג את ה-thread - אחרת stop() נתקע על תור מלא
+                if not self.errors:
+                    print(f"⚠️ VideoRecorder: failed to write frame: {e}")
+                self.errors += 1
+                return
+            if i:
+                self.duplicated += 1
+
+    def _drain(self, limit: Optional[int] = None):
+        """Throw away queued frames (all, or up to limit) - counted as dropped."""
+        with self._lock:
+            while limit is None or limit > 0:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    return
+                self.captured -= 1
+                self.dropped += 1
+                if limit is not None:
+                    limit -= 1
+
+    def _write(self, frame: np.ndarray):
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = frame[..., :3]
+        if self.image_sequence:
+            cv2.imwrite(str(self.path / f"frame_{self.written:06d}.png"), frame)
+        else:
+            size = (frame.shape[1], frame.shape[0])
+            if self._writer is None:
+                self._frame_size = size
+                self._writer = cv2.VideoWriter(str(self.path), cv2.VideoWriter_fourcc(*self.fourcc),
+                                               self.fps, size)
+            elif size != self._frame_size:
+                frame = cv2.resize(frame, self._frame_size)
+            self._writer.write(np.ascontiguousarray(frame))
+        self.written += 1
@@ -532,9 +532,15 @@ import base64
 from It1_interfaces.img import Img
 from It1_interfaces.Board import Board
 from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.LayeredCanvas import LayeredCanvas
+from It1_interfaces.RenderTarget import RenderTarget, WindowTarget
+from It1_interfaces.ClockSync import ClockSync
+from It1_interfaces.Physics import interpolate_position
+from It1_interfaces.Graphics import frame_index_at, sprite_size_for_board
+from It1_interfaces.FrameCache import frame_cache
 
 class ChessClient:
-    def __init__(self, server_uri: str = "ws://localhost:8765"):
+    def __init__(self, server_uri: str = "ws://localhost:8765", render_target: Optional[RenderTarget] = None):
         self.server_uri = server_uri
         self.websocket = None
         self.connected = False
@@ -547,9 +553,21 @@ class ChessClient:
         self.player2_cursor = [0, 0]
         self.selected_piece_player1 = None
         self.selected_piece_player2 = None
+        self.legal_targets_player1 = []  # יעדים חוקיים של הכלי הנבחר - מחושבים בשרת
+        self.legal_targets_player2 = []
         self.game_over = False
         self.winner = None
         self.my_player = None  # מספר השחקן שלי (1, 2, או None לצופה)
+        self.clock = ClockSync()  # הערכת שעון השרת - לאינטרפולציה מקומית של תנועות
+        
+        # ציור לפי דרישה: מצב חדש / תנועה באמצע / סמן זז. בלי אלה ה-thread ישן
+        self._redraw = threading.Condition()
+        self._redraw_requested = True
+        self.frame_id = 0  # עולה בכל פריים שצויר - ה-thread של החלון מציג רק פריים חדש
+        self.redraw_hz = 60.0
+        # אנימציות בלולאה (idle) כשאף כלי לא זז: None = בקצב האנימציה של הכלי עצמו,
+        # מספר = עד כך וכך פריימים בשנייה, 0 = לא מעירות את הציור (לוח סטטי לא צורך CPU)
+        self.idle_animation_hz: Optional[float] = None
         
         # נתוני ניקוד ומהלכים
         self.score_data = {}
@@ -557,13 +575,22 @@ class ChessClient:
         
         # Display components
         self.board = None
-        self.pieces_sprites = {}  # piece_id -> sprite image
+        # פריימי אנימציה מה-FrameCache המשותף: נטענים לפי הצורך, משותפים לכל הכלים מאותו סוג, LRU מפנה
+        self.pieces_root = pathlib.Path(r"C:\Users\pieces")
+        self.sprite_size = (80, 80)
         self.extended_img = None
         
         # UI settings (copied from Game.py) - הגדלה לפאנלים הנוספים
         self.ui_panel_width = 400  # הגדלה מ-300 ל-400 לפאנלים הרחבים יותר
         self.new_window_width = 822 + self.ui_panel_width + 800
         self.new_window_height = max(822, 600) + 200
+        # שני קנבסים: ה-thread של הציור מצייר באחד בזמן שה-thread של החלון מציג את השני
+        self._canvases: List[Optional[LayeredCanvas]] = [None, None]
+        self._frame_cond = threading.Condition()
+        self._front: Optional[int] = None       # הקנבס של הפריים האחרון שפורסם
+        self._presenting: Optional[int] = None  # הקנבס שהחלון מציג כרגע
+        # חלון OpenCV כברירת מחדל, OffscreenTarget לריצה בלי מסך
+        self.render_target = render_target if render_target is not None else WindowTarget("Chess Game - Client", topmost=False)
         
         self.initialize_display()
 
@@ -588,6 +615,7 @@ class ChessClient:
             H_cells=8,
             img=img
         )
+        self.sprite_size = sprite_size_for_board(self.board)  # אותו גודל כמו בשרת
         
         # טען sprites של הכלים
         self.load_piece_sprites()
@@ -595,28 +623,35 @@ class ChessClient:
         print("🖼️ Display initialized successfully!")
 
     def load_piece_sprites(self):
-        """טען את sprites של כל הכלים"""
-        pieces_root = pathlib.Path(r"C:\Users\pieces")
+        """טען מראש את פריימי ה-idle (כל הכלים מתחילים בו) - שאר המצבים נטענים בפעם הראשונה שמופיעים"""
         piece_types = ["RB", "NB", "BB", "QB", "KB", "PB", "RW", "NW", "BW", "QW", "KW", "PW"]
         
         for piece_type in piece_types:
             try:
-                # טען sprite מתיקיית idle
-                sprite_path = pieces_root / piece_type / "states" / "idle" / "sprites"
-                if sprite_path.exists():
-                    # קח את התמונה הראשונה
-                    sprite_files = list(sprite_path.glob("*.png"))
-                    if sprite_files:
-                        sprite_img = Img()
-                        sprite_img.read(str(sprite_files[0]), size=(80, 80))
-                        if sprite_img.img is not None:
-                            self.pieces_sprites[piece_type] = sprite_img
-                            print(f"✅ Loaded sprite for {piece_type}")
-                        else:
-                            print(f"❌ Failed to load sprite for {piece_type}")
+                frames = self.state_frames(piece_type, "idle")
+                if frames[0].img is not None:
+                    print(f"✅ Loaded sprite for {piece_type}")
+                else:
+                    print(f"❌ Failed to load sprite for {piece_type}")
             except Exception as e:
                 print(f"❌ Error loading sprite for {piece_type}: {e}")
 
+    def state_frames(self, piece_type: str, state: str) -> List[Img]:
+        """Frames of one piece type in one state folder, from the shared frame cache."""
+        return frame_cache.get_scaled(self.pieces_root / piece_type / "states" / state / "sprites", self.sprite_size)
+
+    def piece_sprite(self, piece_data: Dict, server_now: float) -> Img:
+        """הפריים הנוכחי של הכלי - לפי מצב האנימציה וזמן התחלתה שהשרת שלח (כמו Graphics.update)"""
+        piece_type = ''.join([c for c in piece_data['id'] if not c.isdigit()])
+        animation = piece_data.get('animation') or {}
+        frames = self.state_frames(piece_type, animation.get('state', 'idle'))
+        start_ms = animation.get('start_ms')
+        if start_ms is None or not self.clock.synced:
+            return frames[0]
+        index = frame_index_at(server_now - start_ms, len(frames), animation.get('frame_time_ms', 0),
+                               animation.get('loop', True))
+        return frames[index]
+
     async def connect_to_server(self):
         """התחברות לשרת"""
         try:
@@ -688,12 +723,17 @@ class ChessClient:
 
     def update_game_state(self, game_data: Dict):
         """עדכון מצב המשחק מנתוני השרת"""
+        server_time = game_data.get('server_time_ms')
+        if server_time is not None:
+            self.clock.observe(server_time)
         self.pieces_data = game_data.get('pieces', [])
         self.board_size = tuple(game_data.get('board_size', (822, 822)))
         self.player1_cursor = game_data.get('player1_cursor', [0, 7])
         self.player2_cursor = game_data.get('player2_cursor', [0, 0])
         self.selected_piece_player1 = game_data.get('selected_piece_player1')
         self.selected_piece_player2 = game_data.get('selected_piece_player2')
+        self.legal_targets_player1 = game_data.get('legal_targets_player1') or []
+        self.legal_targets_player2 = game_data.get('legal_targets_player2') or []
         self.game_over = game_data.get('game_over', False)
         self.winner = game_data.get('winner')
         
@@ -715,6 +755,57 @@ class ChessClient:
         # אם המשחק נגמר, הצג הודעת ניצחון
         if self.game_over and self.winner:
             print(f"🏆 Game Over! Winner: {self.winner}")
+        
+        self.request_redraw()
+
+    def request_redraw(self):
+        """Wake the display thread to draw one new frame."""
+        with self._redraw:
+            self._redraw_requested = True
+            self._redraw.notify_all()
+
+    def next_redraw_delay(self) -> Optional[float]:
+        """
+        Seconds until the picture changes by itself: the next frame of a move,
+        or the next sprite frame of an animation. None when nothing animates.
+        Looping animations play at their own rate, capped at idle_animation_hz
+        when that is set; idle_animation_hz = 0 turns them off on a still board.
+        """
+        if not self.clock.synced:
+            return None
+        server_now = self.clock.server_now()
+        if self.is_animating(server_now):
+            return 1 / self.redraw_hz
+        
+        delay_ms = None
+        for piece_data in self.pieces_data:
+            animation = piece_data.get('animation') or {}
+            start_ms, frame_time_ms = animation.get('start_ms'), animation.get('frame_time_ms', 0)
+            if start_ms is None or frame_time_ms <= 0:
+                continue
+            piece_type = ''.join([c for c in piece_data['id'] if not c.isdigit()])
+            frame_count = len(self.state_frames(piece_type, animation.get('state', 'idle')))
+            elapsed = max(0.0, server_now - start_ms)
+            loop = animation.get('loop', True)
+            if frame_count <= 1 or (not loop and elapsed >= (frame_count - 1) * frame_time_ms):
+                continue   # פריים יחיד / אנימציה חד-פעמית שנגמרה
+            until_next = frame_time_ms - elapsed % frame_time_ms
+            if loop and self.idle_animation_hz is not None:
+                if self.idle_animation_hz <= 0:
+                    continue   # כובו - לולאת idle על לוח סטטי לא מעירה את ה-thread
+                until_next = max(until_next, 1000 / self.idle_animation_hz)
+            delay_ms = until_next if delay_ms is None else min(delay_ms, until_next)
+        return None if delay_ms is None else max(delay_ms / 1000, 1 / self.redraw_hz)
+
+    def is_animating(self, server_now: Optional[float] = None) -> bool:
+        """True while some piece is in the middle of a move the client interpolates."""
+        if not self.clock.synced:
+            return False
+        if server_now is None:
+            server_now = self.clock.server_now()
+        return any(piece_data.get('motion') and
+                   server_now < piece_data['motion']['start_ms'] + piece_data['motion']['duration_ms']
+                   for piece_data in self.pieces_data)
 
     def draw_game(self):
         """ציור המשחק - מבוסס על Game._draw()"""
@@ -734,24 +825,28 @@ class ChessClient:
         if hasattr(display_board, "img"):
             board_img = display_board.img.img
             
-            # יצירת תמונה חדשה גדולה יותר
-            self.extended_img = self.create_extended_display(board_img)
-            
-            return self.extended_img
+            # יצירת תמונה חדשה גדולה יותר - בקנבס שלא מוצג; display_loop מפרסם אותה
+            return self.create_extended_display(board_img)
         
         return None
 
+    def piece_pixel_position(self, piece_data: Dict, server_now: float) -> Tuple[int, int]:
+        """מיקום הכלי לציור: אינטרפולציה מקומית לפי נתוני התנועה, אחרת המיקום שהשרת שלח"""
+        motion = piece_data.get('motion')
+        if motion and self.clock.synced:
+            start_ms = motion['start_ms']
+            return interpolate_position(self.board, tuple(motion['from_cell']), tuple(motion['to_cell']),
+                                        start_ms, start_ms + motion['duration_ms'], server_now)
+        return tuple(piece_data.get('pixel_position', (0, 0)))
+
     def draw_pieces_on_board(self, board):
-        """ציור הכלים על הלוח לפי מיקומי הפיקסלים מהשרת"""
+        """ציור הכלים על הלוח - כלים בתנועה לפי שעון השרת המסונכרן, השאר לפי המיקום מהשרת"""
+        server_now = self.clock.server_now()
         for piece_data in self.pieces_data:
-            piece_id = piece_data['id']
-            pixel_pos = piece_data.get('pixel_position', (0, 0))
+            pixel_pos = self.piece_pixel_position(piece_data, server_now)
             
-            # חלץ את סוג הכלי מה-ID (למשל "PW0" -> "PW")
-            piece_type = ''.join([c for c in piece_id if not c.isdigit()])
-            
-            # מצא את ה-sprite המתאים
-            sprite = self.pieces_sprites.get(piece_type)
+            # מצא את ה-sprite המתאים - הפריים הנוכחי של האנימציה
+            sprite = self.piece_sprite(piece_data, server_now)
             if sprite and sprite.img is not None:
                 x, y = pixel_pos
                 sprite.draw_on(board.img, int(x), int(y))
@@ -761,22 +856,18 @@ class ChessClient:
         if hasattr(board, 'img') and hasattr(board.img, 'img'):
             img = board.img.img
             
-            # חישוב גודל משבצת
-            board_height, board_width = img.shape[:2]
-            cell_width = board_width // 8
-            cell_height = board_height // 8
+            # מלבן משבצת מטבלת ה-lookup של הלוח - זהה למיקומי הכלים ולשרת
+            def cell_corners(cell):
+                x0, y0, x1, y1 = board.cell_rect(tuple(cell))
+                return (x0, y0), (x1 - 1, y1 - 1)
             
             # ציור סמן שחקן 1 (כחול עבה) - רק אם זה השחקן הנוכחי
-            x1, y1 = self.player1_cursor
-            top_left_1 = (x1 * cell_width, y1 * cell_height)
-            bottom_right_1 = ((x1 + 1) * cell_width - 1, (y1 + 1) * cell_height - 1)
+            top_left_1, bottom_right_1 = cell_corners(self.player1_cursor)
             if self.my_player == 1:
                 cv2.rectangle(img, top_left_1, bottom_right_1, (255, 0, 0), 8)  # כחול BGR
             
             # ציור סמן שחקן 2 (אדום עבה) - רק אם זה השחקן הנוכחי
-            x2, y2 = self.player2_cursor
-            top_left_2 = (x2 * cell_width, y2 * cell_height)
-            bottom_right_2 = ((x2 + 1) * cell_width - 1, (y2 + 1) * cell_height - 1)
+            top_left_2, bottom_right_2 = cell_corners(self.player2_cursor)
             if self.my_player == 2:
                 cv2.rectangle(img, top_left_2, bottom_right_2, (0, 0, 255), 8)  # אדום BGR
             
@@ -784,18 +875,19 @@ class ChessClient:
             if self.selected_piece_player1:
                 piece_pos = self.get_piece_position_by_id(self.selected_piece_player1)
                 if piece_pos:
-                    px, py = piece_pos
-                    piece_top_left = (px * cell_width, py * cell_height)
-                    piece_bottom_right = ((px + 1) * cell_width - 1, (py + 1) * cell_height - 1)
+                    piece_top_left, piece_bottom_right = cell_corners(piece_pos)
                     cv2.rectangle(img, piece_top_left, piece_bottom_right, (0, 255, 0), 4)  # ירוק עבה
+                    # היעדים החוקיים של הכלי הנבחר - מסגרת דקה באותו צבע, כמו ב-Game
+                    for cell in self.legal_targets_player1:
+                        cv2.rectangle(img, *cell_corners(cell), (0, 255, 0), 1)
             
             if self.selected_piece_player2:
                 piece_pos = self.get_piece_position_by_id(self.selected_piece_player2)
                 if piece_pos:
-                    px, py = piece_pos
-                    piece_top_left = (px * cell_width, py * cell_height)
-                    piece_bottom_right = ((px + 1) * cell_width - 1, (py + 1) * cell_height - 1)
+                    piece_top_left, piece_bottom_right = cell_corners(piece_pos)
                     cv2.rectangle(img, piece_top_left, piece_bottom_right, (0, 255, 255), 4)  # צהוב עבה
+                    for cell in self.legal_targets_player2:
+                        cv2.rectangle(img, *cell_corners(cell), (0, 255, 255), 1)
 
     def get_piece_position_by_id(self, piece_id: str) -> Optional[Tuple[int, int]]:
         """מצא מיקום כלי לפי ID"""
@@ -804,21 +896,31 @@ class ChessClient:
                 return tuple(piece_data.get('position', (0, 0)))
         return None
 
+    def _back_canvas_index(self) -> int:
+        """The canvas that is not the published frame, once the window is done presenting it."""
+        back = 0 if self._front is None else 1 - self._front
+        with self._frame_cond:
+            self._frame_cond.wait_for(lambda: self._presenting != back or not self.running)
+        return back
+
     def create_extended_display(self, board_img):
-        """יצירת תצוגה מורחבת עם פאנלי ניקוד ומהלכים"""
-        import numpy as np
-        
-        # יצירת תמונה חדשה עם גודל מורחב
-        extended_img = np.ones((self.new_window_height, self.new_window_width, 3), dtype=np.uint8) * 240
-        
-        # העתקת תמונת הלוח למרכז
-        board_height, board_width = board_img.shape[:2]
-        if board_img.shape[2] == 4:
-            board_img = board_img[:, :, :3]  # הסרת ערוץ Alpha
-        
-        x_offset = (self.new_window_width - board_width) // 2
-        y_offset = (self.new_window_height - board_height) // 2
-        extended_img[y_offset:y_offset + board_height, x_offset:x_offset + board_width] = board_img
+        """עדכון תצוגה מורחבת עם פאנלי ניקוד ומהלכים - פאנל מצויר מחדש רק כשהנתונים שלו השתנו"""
+        back = self._back_canvas_index()
+        if self._canvases[back] is None:
+            self._canvases[back] = self.build_canvas(board_img.shape[1], board_img.shape[0])
+        
+        return self._canvases[back].compose(board_img, {
+            "score": (self.my_player, self.score_data),
+            "moves": (self.my_player, self.moves_data),
+            "controls": self.my_player,
+            "game_info": (self.my_player, self.game_over, self.winner, len(self.pieces_data),
+                          tuple(self.player1_cursor), tuple(self.player2_cursor)),
+        })
+
+    def build_canvas(self, board_width, board_height):
+        """יצירת הקנבס והפאנלים שלו"""
+        canvas = LayeredCanvas(self.new_window_width, self.new_window_height, 240)
+        x_offset, _ = canvas.board_origin(board_width, board_height)
         
         # חישוב מיקום הפאנלים בצד ימין
         panel_x = x_offset + board_width + 20
@@ -827,22 +929,21 @@ class ChessClient:
         # פאנל ניקוד
         score_panel_y = 20
         score_panel_height = 200
-        self.draw_score_panel(extended_img, panel_x, score_panel_y, panel_width, score_panel_height)
+        canvas.add_layer("score", panel_x, score_panel_y, panel_width, score_panel_height, self.draw_score_panel)
         
         # פאנל רשימת מהלכים
         moves_panel_y = score_panel_y + score_panel_height + 20
         moves_panel_height = 300
-        self.draw_moves_panel(extended_img, panel_x, moves_panel_y, panel_width, moves_panel_height)
+        canvas.add_layer("moves", panel_x, moves_panel_y, panel_width, moves_panel_height, self.draw_moves_panel)
         
         # פאנל פקדים
         controls_panel_y = moves_panel_y + moves_panel_height + 20
-        self.draw_controls_panel(extended_img, panel_x, controls_panel_y, panel_width, 120)
+        canvas.add_layer("controls", panel_x, controls_panel_y, panel_width, 120, self.draw_controls_panel)
         
         # פאנל מידע המשחק
         game_info_panel_y = controls_panel_y + 140
-        self.draw_game_info_panel(extended_img, panel_x, game_info_panel_y, panel_width, 100)
-        
-        return extended_img
+        canvas.add_layer("game_info", panel_x, game_info_panel_y, panel_width, 100, self.draw_game_info_panel)
+        return canvas
 
     def draw_score_panel(self, img, x, y, width, height):
         """ציור פאנל הניקוד - מבוסס על ScoreSystem"""
@@ -1167,12 +1268,24 @@ class ChessClient:
 
     def handle_keyboard_opencv(self):
         """טיפול בקלט מקלדת דרך OpenCV - רץ בthread נפרד"""
+        shown_frame = -1
         while self.running:
             if self.extended_img is not None:
-                cv2.imshow("Chess Game - Client", self.extended_img)
+                with self._frame_cond:
+                    frame = None
+                    if self.frame_id != shown_frame:  # אותו פריים כבר מוצג - לא שולחים אותו שוב לחלון
+                        shown_frame, frame = self.frame_id, self.extended_img
+                        self._presenting = self._front   # ה-thread של הציור לא יכתוב לקנבס הזה
+                if frame is not None:
+                    try:
+                        self.render_target.present(frame)
+                    finally:
+                        with self._frame_cond:
+                            self._presenting = None
+                            self._frame_cond.notify_all()
                 
                 # המתן למקש (30ms timeout)
-                key = cv2.waitKey(30) & 0xFF
+                key = self.render_target.poll_key(30)
                 
                 if key != 255 and key != -1:  # מקש נלחץ
                     print(f"🔑 Client captured key: {key}")
@@ -1195,21 +1308,41 @@ class ChessClient:
                     
                     # בדוק אם צריך לצאת
                     if key == 27 or key == ord('q'):  # ESC או Q
-                        self.running = False
+                        self.stop()
                         break
             
             time.sleep(0.016)  # ~60 FPS
 
     def display_loop(self):
-        """לולאת התצוגה - רץ בthread נפרד"""
+        """לולאת התצוגה - רץ בthread נפרד, מצייר רק כשמשהו השתנה"""
+        delay = None
         while self.running:
+            with self._redraw:
+                # תנועה באמצע - פריים כל 1/60 שנייה; אנימציה - עד הפריים הבא שלה; אחרת ישנים עד שמגיע מצב חדש
+                if not self._redraw_requested:
+                    self._redraw.wait(delay)
+                self._redraw_requested = False
+            if not self.running:
+                break
+            # מחושב לפני הציור - גם אחרי שהתנועה נגמרה מציירים עוד פריים אחד, הכלי במיקום הסופי
+            delay = self.next_redraw_delay()
+            
             # צייר את המשחק
             img = self.draw_game()
             
             if img is not None:
-                self.extended_img = img
-            
-            time.sleep(1/60.0)  # 60 FPS
+                # פרסום אחרי שהציור הסתיים: הקנבס שצויר הופך לקדמי, ורק אז frame_id עולה
+                with self._frame_cond:
+                    self._front = 0 if self._front is None else 1 - self._front
+                    self.extended_img = img
+                    self.frame_id += 1
+
+    def stop(self):
+        """Stop the display and keyboard threads."""
+        self.running = False
+        self.request_redraw()
+        with self._frame_cond:
+            self._frame_cond.notify_all()
 
     async def run(self):
         """הפעלת הלקוח"""
@@ -1232,8 +1365,8 @@ class ChessClient:
         await self.listen_to_server()
         
         # נקה משאבים
-        self.running = False
-        cv2.destroyAllWindows()
+        self.stop()
+        self.render_target.close()
         await self.disconnect_from_server()
 
 async def main():
@@ -1250,7 +1383,7 @@ async def main():
     except Exception as e:
         print(f"❌ Client error: {e}")
     finally:
-        client.running = False
+        client.stop()
         cv2.destroyAllWindows()
 
 if __name__ == "__main__":
@@ -594,7 +594,11 @@ from It1_interfaces.img import Img
 from It1_interfaces.Board import Board
 from It1_interfaces.Game import Game
 from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.AssetBundle import AssetBundle
+from It1_interfaces.Graphics import sprite_size_for_board
+from It1_interfaces.BoardSetup import load_setup
 from It1_interfaces.Command import Command
+from It1_interfaces.RenderTarget import OffscreenTarget
 import queue
 
 @dataclass
@@ -611,6 +615,9 @@ class GameState:
     # הוספת נתוני ניקוד ומהלכים
     score_data: Dict
     moves_data: Dict
+    server_time_ms: int = 0  # שעון המשחק של השרת - הלקוח מסתנכרן אליו לאינטרפולציה
+    legal_targets_player1: Optional[List] = None  # יעדים חוקיים של הכלי הנבחר - להדגשה אצל הלקוח
+    legal_targets_player2: Optional[List] = None
     ##למחוק אם לא עובד התמונה
     # extended_img_base64: Optional[str] = None
     
@@ -622,12 +629,16 @@ class ClientInfo:
     client_id: str
 
 class ChessServer:
+    # עדכון מחזורי בלבד - שינויים (פקודות, הגעה, תפיסה) נשלחים מיד, והתנועה מחושבת אצל הלקוח
+    STATE_BROADCAST_HZ = 5
+
     def __init__(self):
         self.clients: Dict[str, ClientInfo] = {}  # client_id -> ClientInfo
         self.game: Optional[Game] = None
         self.game_initialized = False
         self.player1_assigned = False
         self.player2_assigned = False
+        self._last_broadcast_ms = 0
         
     async def register_client(self, websocket, client_id: str):
         """רישום לקוח חדש"""
@@ -676,6 +687,7 @@ class ChessServer:
         """אתחול המשחק - בדיוק כמו במain.py"""
         print("🎮 Starting chess game on server...")
         print("🎮 מתחיל משחק שחמט בשרת...")
+        started = time.perf_counter()
 
         # טען את התמונה
         print("📸 Loading board image...")
@@ -699,44 +711,27 @@ class ChessServer:
         )
         
         pieces_root = pathlib.Path(r"C:\Users\pieces")
-        factory = PieceFactory(board, pieces_root)
-
-        start_positions = [
-            # כלים שחורים בחלק העליון של הלוח (שורות 0-1)
-            ("RB", (0, 0)), ("NB", (1, 0)), ("BB", (2, 0)), ("QB", (3, 0)), ("KB", (4, 0)), ("BB", (5, 0)), ("NB", (6, 0)), ("RB", (7, 0)),
-            ("PB", (0, 1)), ("PB", (1, 1)), ("PB", (2, 1)), ("PB", (3, 1)), ("PB", (4, 1)), ("PB", (5, 1)), ("PB", (6, 1)), ("PB", (7, 1)),
-            # כלים לבנים בחלק התחתון של הלוח (שורות 6-7)
-            ("PW", (0, 6)), ("PW", (1, 6)), ("PW", (2, 6)), ("PW", (3, 6)), ("PW", (4, 6)), ("PW", (5, 6)), ("PW", (6, 6)), ("PW", (7, 6)),
-            ("RW", (0, 7)), ("NW", (1, 7)), ("BW", (2, 7)), ("QW", (3, 7)), ("KW", (4, 7)), ("BW", (5, 7)), ("NW", (6, 7)), ("RW", (7, 7)),
-        ]
+        # bundle ממופה לזיכרון - משותף לכל החדרים, וגם לתהליכי שרת אחרים דרך אותם דפים פיזיים
+        sprite_size = sprite_size_for_board(board)  # ספרייט בגודל תא של הלוח
+        bundle = AssetBundle.open(pieces_root, size=sprite_size)
+        factory = PieceFactory(board, pieces_root, bundle.atlas, sprite_size=sprite_size, bundle=bundle)
 
-        pieces = []
-        piece_counters = {}  # Track count per piece type for unique IDs
+        # מיקומי הפתיחה מ-pieces/board.csv - מפוענח פעם אחת לכל התהליך
+        setup = load_setup(pieces_root)
 
         # צור את המשחק עם התור
-        self.game = Game([], board, "Player 1", "Player 2")  # הוספת שמות שחקנים
+        # בשרת אין חלון - פריימים מצוירים רק לבקשת snapshot
+        self.game = Game([], board, "Player 1", "Player 2", render_target=OffscreenTarget(),
+                         piece_factory=factory)  # הוספת שמות שחקנים
 
-        for p_type, cell in start_positions:
-            try:
-                # Create unique piece ID by adding counter
-                if p_type not in piece_counters:
-                    piece_counters[p_type] = 0
-                unique_id = f"{p_type}{piece_counters[p_type]}"
-                piece_counters[p_type] += 1
-                piece = factory.create_piece(p_type, cell, self.game.user_input_queue)
-                # Override the piece ID with unique ID
-                piece.piece_id = unique_id
-                # Update physics with the correct piece_id
-                piece._state._physics.piece_id = unique_id
-                pieces.append(piece)
-            except Exception as e:
-                print(f"בעיה עם {p_type}: {e}")
+        # כל הכלים בבת אחת מהתבניות, עם IDs ייחודיים
+        pieces = factory.create_pieces(setup.placements(), self.game.user_input_queue)
 
         # עדכן את המשחק עם הכלים
         self.game.pieces = pieces
         self.game_initialized = True
         
-        print(f"🎮 Game initialized with {len(pieces)} pieces")
+        print(f"🎮 Game initialized with {len(pieces)} pieces in {(time.perf_counter() - started) * 1000:.0f} ms")
         print("🏆 ScoreSystem initialized")
         print("📝 MovesLog initialized")
         
@@ -780,8 +775,9 @@ class ChessServer:
             # (4) detect captures
             self.game._resolve_collisions()
             
-            # (5) שלח עדכון מחזורי ללקוחות
-            await self.broadcast_game_state()
+            # (5) שלח עדכון מחזורי ללקוחות - בקצב נמוך, הלקוחות מחשבים את התנועה בעצמם
+            if now - self._last_broadcast_ms >= 1000 / self.STATE_BROADCAST_HZ:
+                await self.broadcast_game_state()
             
             # (6) שליטה בקצב פריימים - 60 FPS
             await asyncio.sleep(1/60.0)
@@ -809,11 +805,26 @@ class ChessServer:
                 # בדיקת חיבור
                 await websocket.send(json.dumps({'type': 'pong'}))
                 
+            elif msg_type == 'get_snapshot':
+                # תמונת מצב של הלוח, מצוירת בשרת בלי חלון
+                png = self.snapshot_png()
+                await websocket.send(json.dumps({
+                    'type': 'snapshot',
+                    'image_png_base64': base64.b64encode(png).decode('ascii') if png else None
+                }))
+                
         except json.JSONDecodeError:
             print(f"❌ Invalid JSON from client {client_id}: {message}")
         except Exception as e:
             print(f"❌ Error handling message from client {client_id}: {e}")
 
+    def snapshot_png(self) -> Optional[bytes]:
+        """Render the current position offscreen and return it as PNG bytes."""
+        if not self.game:
+            return None
+        self.game.render_frame()
+        return self.game.render_target.encode_png()
+
     async def handle_keyboard_input(self, key: int, client_id: str):
         """טיפול בקלט מקלדת - רק השחקן המתאים יכול לשלוט"""
         if not self.game:
@@ -947,11 +958,16 @@ class ChessServer:
             piece_pos = self.game._get_piece_position(piece)
             pixel_pos = getattr(piece._state._physics, 'pixel_pos', (0, 0))
             
+            motion = getattr(piece._state._physics, 'motion', None)
+            playback = getattr(piece._state._graphics, 'playback', None)
+            
             pieces_data.append({
                 'id': piece.piece_id,
                 'position': piece_pos,
                 'pixel_position': pixel_pos,
-                'moving': getattr(piece._state._physics, 'moving', False)
+                'moving': getattr(piece._state._physics, 'moving', False),
+                'motion': motion() if motion else None,  # תחילת/יעד/זמן התנועה - הלקוח מבצע אינטרפולציה
+                'animation': playback() if playback else None  # מצב האנימציה וזמן התחלתה - הלקוח מנגן בעצמו
             })
         
         # איסוף נתוני ניקוד
@@ -981,7 +997,10 @@ class ChessServer:
             game_over=self.game.game_over,
             winner=getattr(self.game, 'winner', None),
             score_data=score_data,
-            moves_data=moves_data
+            moves_data=moves_data,
+            server_time_ms=int(time.monotonic() * 1000),
+            legal_targets_player1=self.game.legal_targets(self.game.selected_piece_player1) if self.game.selected_piece_player1 else None,
+            legal_targets_player2=self.game.legal_targets(self.game.selected_piece_player2) if self.game.selected_piece_player2 else None
         )
 
     async def send_game_state_with_player_info(self, websocket, player_number: Optional[int]):
@@ -1001,7 +1020,10 @@ class ChessServer:
                     'winner': game_state.winner,
                     'your_player': player_number,  # מידע נוסף עבור הלקוח
                     'score_data': game_state.score_data,  # הוספת נתוני ניקוד
-                    'moves_data': game_state.moves_data   # הוספת נתוני מהלכים
+                    'moves_data': game_state.moves_data,   # הוספת נתוני מהלכים
+                    'server_time_ms': game_state.server_time_ms,
+                    'legal_targets_player1': game_state.legal_targets_player1,
+                    'legal_targets_player2': game_state.legal_targets_player2
                 }
             }
             try:
@@ -1024,6 +1046,7 @@ class ChessServer:
         game_state = self.get_game_state()
         if not game_state:
             return
+        self._last_broadcast_ms = game_state.server_time_ms
         
         # שלח לכל הלקוחות המחוברים עם המידע המתאים להם
         disconnected_clients = []
@@ -1042,7 +1065,10 @@ class ChessServer:
                         'winner': game_state.winner,
                         'your_player': client_info.player_number,
                         'score_data': game_state.score_data,  # הוספת נתוני ניקוד
-                        'moves_data': game_state.moves_data   # הוספת נתוני מהלכים
+                        'moves_data': game_state.moves_data,   # הוספת נתוני מהלכים
+                        'server_time_ms': game_state.server_time_ms,
+                        'legal_targets_player1': game_state.legal_targets_player1,
+                        'legal_targets_player2': game_state.legal_targets_player2
                     }
                 }
                 
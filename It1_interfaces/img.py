@@ -8,6 +8,9 @@ import numpy as np
 class Img:
     def __init__(self):
         self.img = None
+        # מטמון נתוני blit (צבע מוכפל באלפא + אלפא הפוך) - נבנה פעם אחת לכל תמונה
+        self._blit_src = None
+        self._blit_cache = {}
 
     
     def read(self, path: str | pathlib.Path,
@@ -37,8 +40,42 @@ class Img:
         if self.img is not None and size:
             self.img = cv2.resize(self.img, size, interpolation=interpolation)
 
+        # הכנת נתוני ה-blit כבר בזמן הטעינה ולא בזמן הציור
+        if self.img is not None:
+            self._blit_data(4 if self.img.ndim == 3 and self.img.shape[2] == 4 else 3)
+
         return self
-    
+
+    def _blit_data(self, channels: int):
+        """
+        Return (color, premultiplied, inverse_alpha) for blitting onto a canvas with
+        the given number of channels. premultiplied/inverse_alpha are None when the
+        sprite is fully opaque (plain copy). Cached until self.img is replaced.
+        """
+        if getattr(self, "_blit_src", None) is not self.img:
+            self._blit_src = self.img
+            self._blit_cache = {}
+        cached = self._blit_cache.get(channels)
+        if cached is not None:
+            return cached
+
+        img = self.img
+        if img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        color = img[..., :3]
+        premul = inv_alpha = None
+        if img.shape[2] == 4 and not np.all(img[..., 3] == 255):
+            alpha = img[..., 3:4]
+            premul = np.rint(color.astype(np.float32) * alpha / 255.0).astype(np.uint8)
+            inv_alpha = np.repeat(255 - alpha, 3, axis=2)
+            if channels == 4:
+                # ערוץ האלפא של הקנבס נשאר כמו שהוא: x*255/255 + 0
+                premul = np.concatenate([premul, np.zeros_like(alpha)], axis=2)
+                inv_alpha = np.concatenate([inv_alpha, np.full_like(alpha, 255)], axis=2)
+        cached = (color, premul, inv_alpha)
+        self._blit_cache[channels] = cached
+        return cached
+
     def draw_on(self, other_img, x, y):
         if self.img is None:
             print("self.img is None")
@@ -52,31 +89,35 @@ class Img:
         if not hasattr(other_img.img, "shape"):
             print("other_img.img has no shape")
             return
-        if self.img.shape[2] == 3:
-            self.img = cv2.cvtColor(self.img, cv2.COLOR_BGR2BGRA)
-        if self.img.shape[2] != other_img.img.shape[2]:
-            print("Shape mismatch:", self.img.shape, other_img.img.shape)
+
+        canvas = other_img.img
+        channels = canvas.shape[2] if canvas.ndim == 3 else 1
+        if channels not in (3, 4):
+            print("Shape mismatch:", self.img.shape, canvas.shape)
             return
 
+        # חיתוך בגבולות הקנבס במקום לזרוק שגיאה
         h, w = self.img.shape[:2]
-        H, W = other_img.img.shape[:2]
-
-        if y + h > H or x + w > W:
-            raise ValueError("Logo does not fit at the specified position.")
-
-        roi = other_img.img[y:y + h, x:x + w]
+        H, W = canvas.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, W), min(y + h, H)
+        if x0 >= x1 or y0 >= y1:
+            return
+        sy, sx = slice(y0 - y, y1 - y), slice(x0 - x, x1 - x)
 
-        if self.img.shape[2] == 4:
-            b, g, r, a = cv2.split(self.img)
-            mask = a / 255.0
-            for c in range(3):
-                roi[..., c] = (1 - mask) * roi[..., c] + mask * self.img[..., c]
+        color, premul, inv_alpha = self._blit_data(channels)
+        roi = canvas[y0:y1, x0:x1]
+        if premul is None:
+            roi[..., :3] = color[sy, sx]
         else:
-            other_img.img[y:y + h, x:x + w] = self.img
+            # dst = dst * (255 - a) / 255 + src * a / 255, כל הערוצים בפעולת cv2 אחת
+            blended = cv2.multiply(roi, inv_alpha[sy, sx], scale=1 / 255.0)
+            cv2.add(blended, premul[sy, sx], dst=roi)
 
     def put_text(self, txt, x, y, font_size, color=(255, 255, 255, 255), thickness=1):
         if self.img is None:
             raise ValueError("Image not loaded.")
+        self._blit_src = None  # הפיקסלים משתנים במקום
         cv2.putText(self.img, txt, (x, y),
                     cv2.FONT_HERSHEY_SIMPLEX, font_size,
                     color, thickness, cv2.LINE_AA)
@@ -2,9 +2,16 @@ from It1_interfaces.img  import Img
 from It1_interfaces.Board  import Board
 from It1_interfaces.Game import Game
 from It1_interfaces.PieceFactory  import PieceFactory
+from It1_interfaces.Graphics import sprite_size_for_board
+from It1_interfaces.AssetBundle import AssetBundle
+from It1_interfaces.BoardSetup import load_setup
 import pathlib
+import os
+import time
 import cv2
 
+startup_started = time.perf_counter()  # זמן עד הפריים הראשון
+
 print("🎮 Starting chess game...")
 print("🎮 מתחיל משחק שחמט...")
 # טען את התמונה
@@ -34,39 +41,21 @@ board = Board(
 # pieces_root = pathlib.Path("/pieces")
 
 pieces_root = pathlib.Path(r"C:\Users\סולי\Downloads\chess\chess\CTD25\pieces")
-factory = PieceFactory(board, pieces_root)
-
-
-start_positions = [
-    # כלים שחורים בחלק העליון של הלוח (שורות 0-1)
-    ("RB", (0, 0)), ("NB", (1, 0)), ("BB", (2, 0)), ("QB",  (3, 0)), ("KB",  (4, 0)), ("BB", (5, 0)), ("NB", (6, 0)), ("RB", (7, 0)),
-    ("PB", (0, 1)), ("PB", (1, 1)), ("PB", (2, 1)), ("PB", (3, 1)), ("PB", (4, 1)), ("PB", (5, 1)), ("PB", (6, 1)), ("PB", (7, 1)),
-    # כלים לבנים בחלק התחתון של הלוח (שורות 6-7)
-    ("PW", (0, 6)), ("PW", (1, 6)), ("PW", (2, 6)), ("PW", (3, 6)), ("PW", (4, 6)), ("PW", (5, 6)), ("PW", (6, 6)), ("PW", (7, 6)),
-    ("RW", (0, 7)), ("NW", (1, 7)), ("BW", (2, 7)), ("QW",  (3, 7)), ("KW",  (4, 7)), ("BW", (5, 7)), ("NW", (6, 7)), ("RW", (7, 7)),
-]
+# כל הפריימים, התנועות וההגדרות של הכלים - קובץ bundle אחד ממופה לזיכרון (נבנה מחדש כשהתיקייה משתנה)
+# הספרייטים בגודל תא של הלוח - bundle נפרד לכל גודל
+sprite_size = sprite_size_for_board(board)
+bundle = AssetBundle.open(pieces_root, size=sprite_size)
+factory = PieceFactory(board, pieces_root, bundle.atlas, sprite_size=sprite_size, bundle=bundle)
 
-pieces = []
-piece_counters = {} # Track count per piece type for unique IDs
+# מיקומי הפתיחה מ-pieces/board.csv (או CHESS_LAYOUT / CHESS_LAYOUT_SEED) - כלים שחורים למעלה, לבנים למטה
+setup = load_setup(pieces_root)
 
-# צור את המשחק עם התור
-game = Game([], board)
+# צור את המשחק עם התור - הפריימים מצוירים ב-thread נפרד, ה-loop הראשי רק מציג
+# ה-factory מוזרק למשחק - הכתרה יוצרת מלכה מהתבנית הטעונה
+game = Game([], board, threaded_render=True, piece_factory=factory)
 
-for p_type, cell in start_positions:
-    try:
-        # Create unique piece ID by adding counter
-        if p_type not in piece_counters:
-            piece_counters[p_type] = 0
-        unique_id = f"{p_type}{piece_counters[p_type]}"
-        piece_counters[p_type] += 1
-        piece = factory.create_piece(p_type, cell, game.user_input_queue)
-        # Override the piece ID with unique ID
-        piece.piece_id = unique_id
-        # Update physics with the correct piece_id
-        piece._state._physics.piece_id = unique_id
-        pieces.append(piece)
-    except Exception as e:
-        print(f"בעיה עם {p_type}: {e}")
+# כל הכלים בבת אחת, עם IDs ייחודיים (RB0, RB1, ...)
+pieces = factory.create_pieces(setup.placements(), game.user_input_queue)
 
 # עדכן את המשחק עם הכלים
 game.pieces = pieces
@@ -77,7 +66,14 @@ for piece in pieces:
 
 
 cv2.imshow("Chess - מצב התחלתי", display_board.img.img)
+# הפריים הראשון הוצג - נמדד לפני ההמתנה למקש
+print(f"⏱️ Time to first frame (board + sprites + {len(pieces)} pieces + initial position shown): "
+      f"{(time.perf_counter() - startup_started) * 1000:.0f} ms")
 cv2.waitKey(0)
 
 cv2.destroyAllWindows()        
+# הקלטת המשחק לקובץ וידאו: CHESS_RECORD=game.mp4 (או תיקייה לרצף תמונות)
+record_path = os.environ.get("CHESS_RECORD")
+if record_path:
+    game.start_recording(record_path)
 game.run()
\ No newline at end of file
@@ -134,5 +134,52 @@ class TestMessageOverlay(unittest.TestCase):
         self.assertIn("🔥 WP → WQ", [m.text for m in self.overlay.messages])
 
 
+class TestMessageBanner(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('It1_interfaces.MessageOverlay.event_publisher', Mock())
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.overlay = MessageOverlay()
+
+    def test_banner_is_prerendered_once(self):
+        with patch('It1_interfaces.MessageOverlay.time.time', return_value=100.0):
+            self.overlay.show_message("Check!", duration=3.0, color=(0, 255, 0))
+        message = self.overlay.messages[0]
+        self.assertEqual(message.banner.shape[2], 4)
+        self.assertTrue((message.banner[..., 3] > 0).any())
+
+        img = np.zeros((300, 400, 3), dtype=np.uint8)
+        with patch('It1_interfaces.MessageOverlay.time.time', return_value=101.0), \
+                patch('cv2.putText') as mock_putText, patch('cv2.getTextSize') as mock_getTextSize:
+            self.overlay.draw_on_image(img)
+            self.overlay.draw_on_image(img)
+            mock_putText.assert_not_called()
+            mock_getTextSize.assert_not_called()
+
+    def test_only_the_banner_region_is_touched(self):
+        with patch('It1_interfaces.MessageOverlay.time.time', return_value=100.0):
+            self.overlay.show_message("King captured", duration=3.0)
+        img = np.full((400, 1200, 3), 77, dtype=np.uint8)
+        with patch('It1_interfaces.MessageOverlay.time.time', return_value=101.0):
+            rects = self.overlay.draw_on_image(img)
+
+        self.assertEqual(len(rects), 1)
+        x0, y0, x1, y1 = rects[0]
+        outside = img.copy()
+        outside[y0:y1, x0:x1] = 77
+        self.assertTrue((outside == 77).all())
+        self.assertFalse((img[y0:y1, x0:x1] == 77).all())
+        banner_h, banner_w = self.overlay.messages[0].banner.shape[:2]
+        self.assertEqual((x1 - x0, y1 - y0), (banner_w, banner_h))
+
+    def test_faded_out_message_draws_nothing(self):
+        with patch('It1_interfaces.MessageOverlay.time.time', return_value=100.0):
+            self.overlay.show_message("Bye", duration=1.0)
+        img = np.full((200, 300, 3), 77, dtype=np.uint8)
+        with patch('It1_interfaces.MessageOverlay.time.time', return_value=101.2):
+            self.assertEqual(self.overlay.draw_on_image(img), [])
+        self.assertTrue((img == 77).all())
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,44 @@
+import json
+import pathlib
+
+import cv2
+import numpy as np
+import pytest
+
+from It1_interfaces.Board import Board
+from It1_interfaces.img import Img
+
+# piece type -> {state: number of sprite frames}
+PIECES = {"PW": {"idle": 2, "move": 2}, "QW": {"idle": 2, "move": 2}, "QB": {"idle": 2, "move": 2}}
+
+
+def build_pieces_tree(root: pathlib.Path, pieces=PIECES, moves="1,0\n0,1:capture\n", sprite_shape=(20, 20, 3)):
+    """pieces/<type>/{moves.txt, states/<state>/{config.json, sprites/*.png}} under root."""
+    for piece, states in pieces.items():
+        (root / piece).mkdir(parents=True)
+        (root / piece / "moves.txt").write_text(moves)
+        for n, (state, count) in enumerate(states.items()):
+            state_dir = root / piece / "states" / state
+            (state_dir / "sprites").mkdir(parents=True)
+            (state_dir / "config.json").write_text(json.dumps(
+                {"graphics": {"frames_per_sec": 4 + n, "is_loop": True}, "physics": {"speed_m_per_sec": 2.0}}))
+            for i in range(count):
+                cv2.imwrite(str(state_dir / "sprites" / f"{i + 1}.png"), np.full(sprite_shape, 40 * i + n, dtype=np.uint8))
+    return root
+
+
+def build_board():
+    """8x8 board of 16 px cells on a black 128x128 image."""
+    img = Img()
+    img.img = np.zeros((128, 128, 3), dtype=np.uint8)
+    return Board(cell_H_pix=16, cell_W_pix=16, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=img)
+
+
+@pytest.fixture
+def make_pieces_tree():
+    return build_pieces_tree
+
+
+@pytest.fixture
+def make_board():
+    return build_board
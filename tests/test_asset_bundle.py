@@ -0,0 +1,55 @@
+import os
+
+import numpy as np
+
+from It1_interfaces.AssetBundle import AssetBundle, default_bundle_path
+from It1_interfaces.Moves import Moves
+from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.SpriteAtlas import SpriteAtlas
+
+# שתי תיקיות כלים, ספרייטים עם אלפא ו-moves.txt עם שורת הערה
+TREE = dict(pieces={"QW": {"idle": 2, "move": 2}, "PB": {"idle": 2}},
+            moves="1,0\n// comment\n0,1:capture\n", sprite_shape=(30, 20, 4))
+
+
+def test_compiled_bundle_matches_the_tree(tmp_path, make_pieces_tree):
+    root = make_pieces_tree(tmp_path / "pieces", **TREE)
+    bundle = AssetBundle.compile(root, tmp_path / "pieces.bundle", size=(16, 16))
+
+    atlas = SpriteAtlas.build(root, size=(16, 16), progress=None)
+    assert isinstance(bundle.atlas.frames, np.memmap)
+    assert bundle.atlas.index == atlas.index
+    assert np.array_equal(bundle.atlas.frames, atlas.frames)
+    assert bundle.moves("QW") == Moves.from_file(root / "QW" / "moves.txt").moves
+    assert bundle.config("QW", "move")["graphics"]["frames_per_sec"] == 5
+
+
+def test_open_reuses_fresh_bundle_and_rebuilds_stale_one(tmp_path, make_pieces_tree):
+    root = make_pieces_tree(tmp_path / "pieces", **TREE)
+    path = default_bundle_path(root, (16, 16))
+    first = AssetBundle._open_fresh(root, (16, 16), None)
+    assert path.is_file()
+    mtime = path.stat().st_mtime_ns
+    assert AssetBundle._open_fresh(root, (16, 16), None).fingerprint == first.fingerprint
+    assert path.stat().st_mtime_ns == mtime   # עדכני - לא נבנה מחדש
+
+    (root / "PB" / "moves.txt").write_text("2,0\n")
+    stat = os.stat(root / "PB" / "moves.txt")
+    os.utime(root / "PB" / "moves.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    rebuilt = AssetBundle._open_fresh(root, (16, 16), None)
+    assert rebuilt.fingerprint != first.fingerprint
+    assert rebuilt.moves("PB") == [(0, 2, "normal")]
+
+
+def test_factory_builds_pieces_from_the_bundle_alone(tmp_path, make_board, make_pieces_tree):
+    root = make_pieces_tree(tmp_path / "pieces", **TREE)
+    bundle = AssetBundle.compile(root, tmp_path / "pieces.bundle", size=(16, 16))
+    for piece in ("QW", "PB"):   # התנועות וההגדרות נקראות מה-bundle ולא מהדיסק
+        (root / piece / "moves.txt").unlink()
+        (root / piece / "states" / "idle" / "config.json").unlink()
+
+    factory = PieceFactory(make_board(), root, bundle.atlas, sprite_size=(16, 16), bundle=bundle)
+    piece = factory.create_piece("QW", (3, 3))
+    assert piece._state._moves.moves == [(0, 1, "normal"), (1, 0, "capture")]
+    frame = piece._state._graphics.get_img().img
+    assert np.shares_memory(frame, bundle.atlas.frames)
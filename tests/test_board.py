@@ -31,4 +31,51 @@ def test_board_clone():
     assert clone.img.img is not board.img.img
     # שינוי בשיבוט לא משפיע על המקור
     clone.img.img[0,0,0] = 99
-    assert board.img.img[0,0,0] != 99
\ No newline at end of file
+    assert board.img.img[0,0,0] != 99
+
+def make_board(cell_w=102.75, cell_h=103.5):
+    return Board(cell_H_pix=cell_h, cell_W_pix=cell_w, cell_H_m=1, cell_W_m=1,
+                 W_cells=8, H_cells=8, img=MockImg(np.zeros((822, 822, 3), np.uint8)))
+
+
+def test_cell_to_pixel_matches_original_formula():
+    board = make_board()
+    for x in range(8):
+        for y in range(8):
+            assert board.cell_to_pixel((x, y)) == (int(x * 102.75), int(y * 103.5))
+    # מחוץ ללוח - עדיין אותה נוסחה, כולל החיתוך של int() בתאים שליליים
+    assert board.cell_to_pixel((9, -1)) == (int(9 * 102.75), int(-103.5))
+    assert board.cells_to_pixels([(9, -1), (0, 0)]).tolist() == [[int(9 * 102.75), -103], [0, 0]]
+
+
+def test_cell_rects_tile_the_board_without_gaps():
+    board = make_board()
+    for x in range(7):
+        assert board.cell_rect((x, 0))[2] == board.cell_rect((x + 1, 0))[0]
+    widths = np.diff(board.col_edges)
+    assert set(widths) <= {102, 103}           # השבר מתפזר על פני הלוח
+    assert board.col_edges[-1] == 822
+
+
+def test_float_noise_does_not_shift_edges():
+    board = make_board(cell_w=0.1 * 1000, cell_h=100.0)
+    assert list(board.col_edges) == [i * 100 for i in range(9)]
+
+
+def test_vectorized_api_matches_scalar():
+    board = make_board()
+    cells = np.array([(x, y) for x in range(8) for y in range(8)])
+    pixels = board.cells_to_pixels(cells)
+    rects = board.cell_rects(cells)
+    for (x, y), p, r in zip(cells, pixels, rects):
+        assert tuple(p) == board.cell_to_pixel((x, y))
+        assert tuple(r) == board.cell_rect((x, y))
+    assert tuple(board.cells_to_pixels([(8, -2)])[0]) == board.cell_to_pixel((8, -2))
+
+
+def test_tables_follow_geometry_changes():
+    board = make_board()
+    assert board.cell_to_pixel((1, 1)) == (102, 103)
+    board.cell_W_pix = 50
+    assert board.cell_to_pixel((1, 1)) == (50, 103)
+    assert board.clone().cell_to_pixel((2, 2)) == (100, 207)
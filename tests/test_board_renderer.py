@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import numpy as np
+import cv2
+
+from It1_interfaces.Board import Board
+from It1_interfaces.BoardRenderer import BoardRenderer
+from It1_interfaces.img import Img
+
+
+def make_board(size=200):
+    img = Img()
+    img.img = np.full((size, size, 4), 50, dtype=np.uint8)
+    img.img[::2, ::2, :3] = 120  # פסים כדי שכל שחזור רקע שגוי ייראה
+    return Board(cell_H_pix=25, cell_W_pix=25, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=img)
+
+
+def make_sprite(value, alpha=128, size=20):
+    sprite = Img()
+    sprite.img = np.full((size, size, 4), value, dtype=np.uint8)
+    sprite.img[..., 3] = alpha
+    return sprite
+
+
+def make_piece(sprite, pos):
+    graphics = SimpleNamespace(get_img=lambda: graphics.sprite, sprite=sprite)
+    physics = SimpleNamespace(pixel_pos=pos)
+    return SimpleNamespace(_state=SimpleNamespace(_graphics=graphics, _physics=physics))
+
+
+def full_redraw(board, pieces, boxes):
+    frame = board.clone()
+    for p in pieces:
+        x, y = p._state._physics.pixel_pos
+        p._state._graphics.get_img().draw_on(frame.img, x, y)
+    for top_left, bottom_right, color, thickness in boxes:
+        cv2.rectangle(frame.img.img, top_left, bottom_right, color, thickness)
+    return frame.img.img
+
+
+def test_first_render_matches_full_redraw():
+    board = make_board()
+    pieces = [make_piece(make_sprite(200), (10, 10)), make_piece(make_sprite(30), (20, 20))]
+    boxes = [((0, 0), (24, 24), (255, 0, 0), 8)]
+    renderer = BoardRenderer(board)
+    frame = renderer.render(pieces, boxes)
+    assert np.array_equal(frame.img.img, full_redraw(board, pieces, boxes))
+
+
+def test_static_scene_has_no_dirty_rects():
+    board = make_board()
+    pieces = [make_piece(make_sprite(200), (10, 10))]
+    renderer = BoardRenderer(board)
+    renderer.render(pieces, [])
+    renderer.render(pieces, [])
+    assert renderer.last_dirty_rects == []
+
+
+def test_move_frame_change_and_capture_stay_consistent():
+    board = make_board()
+    a = make_piece(make_sprite(200), (10, 10))
+    b = make_piece(make_sprite(30), (25, 15))   # חופף ל-a
+    c = make_piece(make_sprite(90), (150, 150))
+    pieces = [a, b, c]
+    boxes = [((0, 0), (24, 24), (255, 0, 0), 8)]
+    renderer = BoardRenderer(board)
+    renderer.render(pieces, boxes)
+
+    a._state._physics.pixel_pos = (60, 40)                # תנועה
+    c._state._graphics.sprite = make_sprite(10)           # פריים אנימציה חדש
+    boxes = [((25, 25), (49, 49), (255, 0, 0), 8)]        # הזזת סמן
+    frame = renderer.render(pieces, boxes)
+    assert np.array_equal(frame.img.img, full_redraw(board, pieces, boxes))
+
+    pieces.remove(b)                                      # תפיסה
+    frame = renderer.render(pieces, boxes)
+    assert np.array_equal(frame.img.img, full_redraw(board, pieces, boxes))
+    # הכלי שלא זז לא גרם לציור מחדש של כל הלוח
+    assert all(r != (0, 0, 200, 200) for r in renderer.last_dirty_rects)
+
+
+def test_background_is_never_drawn_on():
+    board = make_board()
+    pristine = board.img.img.copy()
+    renderer = BoardRenderer(board)
+    renderer.render([make_piece(make_sprite(200), (10, 10))], [((0, 0), (24, 24), (255, 0, 0), 8)])
+    assert np.array_equal(board.img.img, pristine)
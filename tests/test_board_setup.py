@@ -0,0 +1,69 @@
+import pathlib
+
+import pytest
+
+from It1_interfaces.BoardSetup import BoardSetup, load_setup
+from It1_interfaces.PieceFactory import PieceFactory
+
+BOARD_CSV = pathlib.Path(__file__).parent.parent / "pieces" / "board.csv"
+
+
+def test_board_csv_is_the_standard_layout():
+    placements = BoardSetup.from_csv(BOARD_CSV).placements()
+    assert len(placements) == 32
+    assert placements[:5] == [("RB0", "RB", (0, 0)), ("NB0", "NB", (1, 0)), ("BB0", "BB", (2, 0)),
+                              ("QB0", "QB", (3, 0)), ("KB0", "KB", (4, 0))]
+    assert ("RB1", "RB", (7, 0)) in placements
+    assert ("PW7", "PW", (7, 6)) in placements
+    assert ("KW0", "KW", (4, 7)) in placements
+    assert len({piece_id for piece_id, _, _ in placements}) == 32
+
+
+def test_custom_and_shuffled_layouts():
+    setup = BoardSetup.from_rows([["RB", "", "KB"], ["PB", "PB", ""], [], ["RW", "", "KW"]])
+    assert setup.placements() == [("RB0", "RB", (0, 0)), ("KB0", "KB", (2, 0)), ("PB0", "PB", (0, 1)),
+                                  ("PB1", "PB", (1, 1)), ("RW0", "RW", (0, 3)), ("KW0", "KW", (2, 3))]
+
+    standard = BoardSetup.from_csv(BOARD_CSV)
+    shuffled = standard.shuffled(seed=7)
+    assert shuffled.pieces == standard.shuffled(seed=7).pieces
+    cells = {cell: p_type for p_type, cell in shuffled.pieces}
+    assert len(cells) == 32
+    for col in range(8):   # השורות האחוריות נשארות מראה זו של זו, החיילים במקומם
+        assert cells[(col, 0)][0] == cells[(col, 7)][0]
+        assert cells[(col, 1)] == "PB" and cells[(col, 6)] == "PW"
+
+
+def test_factory_creates_the_layout_in_one_batch(tmp_path, make_board, make_pieces_tree):
+    factory = PieceFactory(make_board(), make_pieces_tree(tmp_path), sprite_size=(16, 16))
+    setup = BoardSetup.from_rows([["QB", "", "XX"], ["", "", ""], ["PW", "PW", "QW"]])
+    pieces = factory.create_pieces(setup.placements())   # XX לא קיים - מדולג
+
+    assert [p.piece_id for p in pieces] == ["QB0", "PW0", "PW1", "QW0"]
+    assert [p._state._physics.piece_id for p in pieces] == ["QB0", "PW0", "PW1", "QW0"]
+    assert pieces[2]._state._physics.cell == (1, 2)
+    assert set(factory.templates) == {"QB", "PW", "QW"}
+
+
+def test_missing_board_csv_falls_back_to_the_standard_layout(tmp_path, monkeypatch):
+    monkeypatch.delenv("CHESS_LAYOUT", raising=False)
+    monkeypatch.delenv("CHESS_LAYOUT_SEED", raising=False)
+    assert load_setup(tmp_path).placements() == BoardSetup.from_csv(BOARD_CSV).placements()
+
+    monkeypatch.setenv("CHESS_LAYOUT", str(tmp_path / "missing.csv"))
+    with pytest.raises(FileNotFoundError, match="CHESS_LAYOUT"):
+        load_setup(tmp_path)
+
+
+def test_one_bad_placement_does_not_abort_the_batch(tmp_path, monkeypatch, make_board, make_pieces_tree):
+    factory = PieceFactory(make_board(), make_pieces_tree(tmp_path), sprite_size=(16, 16))
+    physics_create = factory.physics_factory.create
+
+    def create(start_cell, cfg, piece_id):
+        if piece_id == "PW1":
+            raise ValueError("bad cell")
+        return physics_create(start_cell=start_cell, cfg=cfg, piece_id=piece_id)
+    monkeypatch.setattr(factory.physics_factory, "create", create)
+
+    pieces = factory.create_pieces([("PW0", "PW", (0, 6)), ("PW1", "PW", (1, 6)), ("PW2", "PW", (2, 6))])
+    assert [p.piece_id for p in pieces] == ["PW0", "PW2"]
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from It1_interfaces.RenderTarget import OffscreenTarget
+
+ex_chess_client = pytest.importorskip("It1_interfaces.ex_chess_client")   # דורש websockets
+ChessClient = ex_chess_client.ChessClient
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, make_pieces_tree):
+    monkeypatch.setattr(ChessClient, "initialize_display", lambda self: None)   # בלי תמונת הלוח מהדיסק
+    client = ChessClient(render_target=OffscreenTarget())
+    client.pieces_root = make_pieces_tree(tmp_path)
+    client.sprite_size = (16, 16)
+    return client
+
+
+def state_message(server_ms, pieces=()):
+    return json.dumps({'type': 'game_state', 'data': {'pieces': list(pieces), 'server_time_ms': server_ms}})
+
+
+def idle_piece(start_ms, loop=True):
+    # 2 פריימים ב-idle, 6 פריימים בשנייה
+    return {'id': "QW0", 'position': (0, 7), 'motion': None,
+            'animation': {'state': 'idle', 'start_ms': start_ms, 'frame_time_ms': 167, 'loop': loop}}
+
+
+def test_draws_only_after_a_state_message(client, monkeypatch):
+    draws = []
+    monkeypatch.setattr(client, "draw_game", lambda: draws.append(time.monotonic()))
+    thread = threading.Thread(target=client.display_loop, daemon=True)
+    thread.start()
+    try:
+        time.sleep(0.2)
+        assert len(draws) == 1                       # הפריים הראשון בלבד - אחר כך ישן
+        assert client.next_redraw_delay() is None
+
+        asyncio.run(client.handle_server_message(state_message(client.clock.local_ms())))
+        time.sleep(0.2)
+        assert len(draws) == 2                       # מצב חדש -> פריים אחד, ושוב שקט
+    finally:
+        client.stop()
+        thread.join(1)
+
+
+def test_looping_idle_plays_at_the_piece_rate_unless_capped(client):
+    now = client.clock.local_ms()
+    client.update_game_state({'pieces': [idle_piece(now - 1000)], 'server_time_ms': now})
+    assert 0 < client.next_redraw_delay() <= 0.167   # ברירת מחדל - בקצב האנימציה של הכלי
+
+    client.idle_animation_hz = 2.0                   # קצב מוגבל
+    assert client.next_redraw_delay() == pytest.approx(0.5)
+
+    client.idle_animation_hz = 0                     # כבוי - לוח סטטי לא מעיר את הציור
+    assert client.next_redraw_delay() is None
+
+
+def test_one_shot_animation_still_plays_to_the_end(client):
+    now = client.clock.local_ms()
+    client.update_game_state({'pieces': [idle_piece(now, loop=False)], 'server_time_ms': now})
+    assert 0 < client.next_redraw_delay() <= 0.167
+
+
+def test_frames_alternate_buffers_and_skip_the_one_being_presented(client):
+    board = np.zeros((64, 64, 3), dtype=np.uint8)
+    first = client.create_extended_display(board)
+    client._front = 0                                # display_loop מפרסם את הפריים הראשון
+    second = client.create_extended_display(board)
+    assert not np.shares_memory(first, second)       # הפריים הבא לא נכתב על המוצג
+
+    client._front, client._presenting = 1, 0         # החלון עדיין מציג את הקנבס הראשון
+    drawn = threading.Event()
+    thread = threading.Thread(target=lambda: (client.create_extended_display(board), drawn.set()), daemon=True)
+    thread.start()
+    assert not drawn.wait(0.1)                       # ממתין עד שההצגה מסתיימת
+    with client._frame_cond:
+        client._presenting = None
+        client._frame_cond.notify_all()
+    assert drawn.wait(1)
+
+
+def test_selected_piece_shows_the_legal_targets_from_the_server(client, make_board):
+    now = client.clock.local_ms()
+    client.update_game_state({'pieces': [{'id': "QW0", 'position': (0, 7)}], 'server_time_ms': now,
+                              'selected_piece_player1': "QW0", 'legal_targets_player1': [[1, 7], [0, 6]]})
+    board = make_board()
+    client.draw_cursors(board)
+    img = board.img.img
+    for x, y in ((1, 7), (0, 6)):
+        assert tuple(img[y * 16 + 8, x * 16]) == (0, 255, 0)   # מסגרת דקה ירוקה על כל יעד
+    assert not img[3 * 16 + 8, 3 * 16].any()                   # משבצת שאינה יעד נשארת נקייה
@@ -0,0 +1,20 @@
+from It1_interfaces.ClockSync import ClockSync
+
+
+def test_offset_is_the_least_delayed_sample():
+    clock = ClockSync()
+    assert not clock.synced
+    # שעון השרת מקדים את המקומי ב-5000ms, עיכוב רשת משתנה
+    for server_ms, delay in [(10000, 40), (10100, 15), (10200, 80)]:
+        clock.observe(server_ms, server_ms - 5000 + delay)
+    assert clock.synced
+    assert clock.offset_ms == -5000 + 15
+    assert clock.server_now(6000) == 6000 + 5000 - 15
+
+
+def test_old_samples_leave_the_window():
+    clock = ClockSync(window=2)
+    clock.observe(1000, 1000)          # דגימה "מזלית" שכבר לא רלוונטית
+    clock.observe(2000, 2100)
+    clock.observe(3000, 3100)
+    assert clock.offset_ms == 100
@@ -0,0 +1,104 @@
+import pathlib
+
+import numpy as np
+import pytest
+import cv2
+
+from It1_interfaces.FrameCache import FrameCache
+from It1_interfaces.Graphics import Graphics
+
+
+def make_piece_folder(root: pathlib.Path, piece="NW", states=("idle", "move")):
+    for state in states:
+        sprites = root / piece / "states" / state / "sprites"
+        sprites.mkdir(parents=True)
+        for i in range(2):
+            cv2.imwrite(str(sprites / f"{i + 1}.png"), np.full((10, 10, 3), i, dtype=np.uint8))
+    return root / piece / "states"
+
+
+def test_lru_eviction_and_hits():
+    cache = FrameCache(max_entries=2)
+    loads = []
+    loader = lambda name: (lambda: loads.append(name) or [name])
+    cache.get("a", loader("a"))
+    cache.get("b", loader("b"))
+    cache.get("a", loader("a"))      # a הופך לאחרון שנעשה בו שימוש
+    cache.get("c", loader("c"))      # מפנה את b
+    assert loads == ["a", "b", "c"]
+    assert cache.peek("b") is None and cache.peek("a") == ["a"]
+    assert cache.hits == 1 and cache.misses == 3
+
+
+def test_pieces_of_same_type_share_frames(tmp_path, monkeypatch):
+    states = make_piece_folder(tmp_path)
+    monkeypatch.setattr("It1_interfaces.Graphics.frame_cache", FrameCache())
+    a = Graphics(states / "idle" / "sprites", board=None)
+    b = Graphics(states / "idle" / "sprites", board=None)
+    assert a.frames is b.frames
+
+
+def test_state_switch_does_not_touch_disk(tmp_path, monkeypatch):
+    states = make_piece_folder(tmp_path)
+    monkeypatch.setattr("It1_interfaces.Graphics.frame_cache", FrameCache())
+    gfx = Graphics(states / "idle" / "sprites", board=None)
+    gfx._switch_sprites_for_state("move")
+    gfx._switch_sprites_for_state("idle")
+
+    reads = []
+    monkeypatch.setattr(FrameCache, "_build_scale", lambda self, folder, size: reads.append(folder) or [])
+    idle = gfx.frames
+    gfx._switch_sprites_for_state("move")
+    gfx._switch_sprites_for_state("idle")
+    clone = gfx.copy()
+    assert reads == []
+    assert gfx.frames is idle and clone.frames is idle
+
+
+def test_scales_are_built_lazily_from_the_decoded_source(tmp_path, monkeypatch):
+    states = make_piece_folder(tmp_path, states=("idle",))
+    cache = FrameCache()
+    monkeypatch.setattr("It1_interfaces.Graphics.frame_cache", cache)
+    sprites = states / "idle" / "sprites"
+
+    big = cache.get_scaled(sprites, (8, 8))
+    assert big[0].img.shape[:2] == (8, 8)
+
+    reads = []
+    monkeypatch.setattr("It1_interfaces.FrameCache.Img.read", lambda self, p, **kw: reads.append(p))
+    thumb = cache.get_scaled(sprites, (4, 4))          # מהמקור שכבר פוענח, בלי לגעת בדיסק
+    assert reads == [] and thumb[0].img.shape[:2] == (4, 4)
+    assert cache.get_scaled(sprites, (4, 4)) is thumb
+    assert sorted(cache.cached_sizes(sprites)) == [(4, 4), (8, 8)]
+
+    gfx = Graphics(sprites, board=None, sprite_size=(8, 8))
+    assert gfx.frames is big
+    assert gfx.get_img_scaled((4, 4)) is thumb[0]
+
+
+def test_upsizing_reuses_the_decoded_source(tmp_path, monkeypatch):
+    sprites = make_piece_folder(tmp_path, states=("idle",)) / "idle" / "sprites"
+    cache = FrameCache()
+    cache.get_scaled(sprites, (4, 4))
+
+    reads = []
+    monkeypatch.setattr("It1_interfaces.FrameCache.Img.read", lambda self, p, **kw: reads.append(p))
+    bigger = cache.get_scaled(sprites, (12, 12))       # אין גודל גדול יותר - מהמקור שכבר פוענח
+    assert reads == [] and bigger[0].img.shape[:2] == (12, 12)
+    assert sorted(cache.cached_sizes(sprites)) == [(4, 4), (12, 12)]
+
+
+def test_scales_come_from_the_source_and_it_is_never_evicted(tmp_path, monkeypatch):
+    sprites = make_piece_folder(tmp_path, states=("idle",)) / "idle" / "sprites"
+    cache = FrameCache(max_entries=1)
+    cache.get_scaled(sprites, (8, 8))
+    cache.get_scaled(sprites, (6, 6))                  # מפנה את 8x8 - המקור נשאר
+
+    resized = []
+    resize = cv2.resize
+    monkeypatch.setattr("It1_interfaces.FrameCache.cv2.resize",
+                        lambda src, size, **kw: resized.append(src.shape[:2]) or resize(src, size, **kw))
+    monkeypatch.setattr("It1_interfaces.FrameCache.Img.read", lambda self, p, **kw: pytest.fail("decoded again"))
+    cache.get_scaled(sprites, (4, 4))
+    assert resized == [(10, 10), (10, 10)]             # מה-PNG המקורי, לא מ-6x6
+    assert len(cache) == 1
@@ -86,4 +86,34 @@ def test_update_and_loop(monkeypatch):
     gfx.update(1)
     gfx.update(501)
     assert gfx.current_frame == 1
-    shutil.rmtree(sprites)
\ No newline at end of file
+    shutil.rmtree(sprites)
+
+
+def test_playback_reproduces_the_local_animation(tmp_path):
+    import cv2
+    import numpy as np
+    from It1_interfaces.Graphics import Graphics, frame_index_at
+    sprites = tmp_path / "PW" / "states" / "move" / "sprites"
+    sprites.mkdir(parents=True)
+    for i in range(4):
+        cv2.imwrite(str(sprites / f"{i}.png"), np.full((8, 8, 4), i * 40, dtype=np.uint8))
+
+    for loop in (True, False):
+        gfx = Graphics(sprites, DummyBoard(), loop=loop, fps=10.0, sprite_size=(8, 8))
+        gfx.reset()
+        for now in range(1000, 2000, 10):   # טיקים של 10ms
+            gfx.update(now)
+            info = gfx.playback()
+            assert info['state'] == "move"
+            assert frame_index_at(now - info['start_ms'], len(gfx.frames),
+                                  info['frame_time_ms'], info['loop']) == gfx.current_frame
+
+
+def test_sprite_size_is_the_smallest_board_cell():
+    import numpy as np
+    from It1_interfaces.Board import Board
+    from It1_interfaces.Graphics import sprite_size_for_board
+    board = Board(cell_H_pix=822 / 8, cell_W_pix=822 / 8, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+    width, height = sprite_size_for_board(board)
+    assert (width, height) == (102, 102)   # תאים של 102/103 פיקסלים - לא 103 של round
+    assert width == int(np.diff(board.col_edges).min()) and height == int(np.diff(board.row_edges).min())
@@ -0,0 +1,63 @@
+import numpy as np
+
+from It1_interfaces.blit_benchmark import legacy_blend
+from It1_interfaces.img import Img
+
+
+def make_img(arr):
+    img = Img()
+    img.img = arr
+    return img
+
+
+def random_sprite(seed=0, size=80):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (size, size, 4), dtype=np.uint8)
+
+
+def test_blend_matches_float_reference():
+    sprite = random_sprite()
+    canvas = random_sprite(1, 200)
+    expected = canvas.copy()
+    legacy_blend(sprite, expected, 30, 40)
+
+    make_img(sprite).draw_on(make_img(canvas), 30, 40)
+    assert np.abs(canvas.astype(int) - expected.astype(int)).max() <= 1
+    # ערוץ האלפא של הקנבס לא משתנה
+    assert np.array_equal(canvas[..., 3], expected[..., 3])
+
+
+def test_opaque_bgr_sprite_is_not_converted_in_place():
+    sprite = np.full((10, 10, 3), 77, dtype=np.uint8)
+    canvas = np.zeros((20, 20, 4), dtype=np.uint8)
+    img = make_img(sprite)
+    img.draw_on(make_img(canvas), 5, 5)
+    assert img.img is sprite and img.img.shape == (10, 10, 3)
+    assert (canvas[5:15, 5:15, :3] == 77).all()
+    assert (canvas[5:15, 5:15, 3] == 0).all()
+
+
+def test_sprite_is_clipped_at_canvas_edges():
+    sprite = np.full((10, 10, 4), 255, dtype=np.uint8)
+    canvas = np.zeros((20, 20, 4), dtype=np.uint8)
+    img = make_img(sprite)
+    img.draw_on(make_img(canvas), 15, -5)
+    assert (canvas[0:5, 15:20, :3] == 255).all()
+    assert canvas[5:, :, :3].sum() == 0 and canvas[:, :15, :3].sum() == 0
+    img.draw_on(make_img(canvas), 50, 50)  # מחוץ לקנבס לגמרי - לא זורק
+
+
+def test_draws_on_bgr_canvas():
+    sprite = random_sprite(2, 16)
+    canvas = np.zeros((32, 32, 3), dtype=np.uint8)
+    make_img(sprite).draw_on(make_img(canvas), 8, 8)
+    assert canvas[8:24, 8:24].any()
+
+
+def test_put_text_invalidates_blit_cache():
+    img = make_img(np.zeros((40, 120, 4), dtype=np.uint8))
+    canvas = np.zeros((40, 120, 4), dtype=np.uint8)
+    img.draw_on(make_img(canvas), 0, 0)
+    img.put_text("hi", 5, 30, 1.0, color=(255, 255, 255, 255), thickness=2)
+    img.draw_on(make_img(canvas), 0, 0)
+    assert canvas[..., :3].any()
@@ -0,0 +1,83 @@
+import numpy as np
+import cv2
+
+from It1_interfaces.LayeredCanvas import LayeredCanvas
+
+
+class Panel:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def draw(self, img, x, y, width, height):
+        self.calls += 1
+        cv2.rectangle(img, (x, y), (x + width, y + height), (250, 250, 250), -1)
+        cv2.rectangle(img, (x, y), (x + width, y + height), (0, 0, 0), 2)
+        cv2.putText(img, self.text, (x + 10, y + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)
+
+
+def reference(board_img, panels):
+    img = np.full((300, 500, 3), 240, dtype=np.uint8)
+    img[100:200, 200:300] = board_img[..., :3]
+    for panel, (x, y) in panels:
+        panel.draw(img, x, y, 150, 60)
+    return img
+
+
+def make_canvas(score, moves):
+    canvas = LayeredCanvas(500, 300, 240)
+    canvas.add_layer("score", 320, 20, 150, 60, score.draw)
+    canvas.add_layer("moves", 320, 120, 150, 60, moves.draw)
+    return canvas
+
+
+def test_canvas_is_reused_and_matches_full_draw():
+    score, moves = Panel("Score 0"), Panel("Moves")
+    canvas = make_canvas(score, moves)
+    board = np.full((100, 200, 4), 30, dtype=np.uint8)[:, :100]
+    first = canvas.compose(board, {"score": 0, "moves": 0})
+    second = canvas.compose(board, {"score": 0, "moves": 0})
+    assert first is second
+    assert score.calls == 1 and moves.calls == 1
+    assert np.array_equal(second, reference(board, [(Panel("Score 0"), (320, 20)), (Panel("Moves"), (320, 120))]))
+
+
+def test_only_changed_panel_is_redrawn():
+    score, moves = Panel("Score 0"), Panel("Moves")
+    canvas = make_canvas(score, moves)
+    board = np.full((100, 100, 3), 30, dtype=np.uint8)
+    canvas.compose(board, {"score": 0, "moves": 0})
+    score.text = "Score 12"
+    img = canvas.compose(board, {"score": 1, "moves": 0})
+    assert score.calls == 2 and moves.calls == 1
+    assert np.array_equal(img, reference(board, [(Panel("Score 12"), (320, 20)), (Panel("Moves"), (320, 120))]))
+
+
+def test_board_dirty_rects_and_invalidate():
+    score, moves = Panel("Score 0"), Panel("Moves")
+    canvas = make_canvas(score, moves)
+    board = np.full((100, 100, 3), 30, dtype=np.uint8)
+    canvas.compose(board, {"score": 0, "moves": 0})
+
+    board[10:20, 10:20] = 200
+    img = canvas.compose(board, {"score": 0, "moves": 0}, [(10, 10, 20, 20)])
+    assert (img[110:120, 210:220] == 200).all()
+
+    img[0:50, 0:50] = 0     # משהו צויר ישירות על הקנבס (למשל הודעה)
+    canvas.invalidate()
+    img = canvas.compose(board, {"score": 0, "moves": 0}, [])
+    assert np.array_equal(img, reference(board, [(Panel("Score 0"), (320, 20)), (Panel("Moves"), (320, 120))]))
+
+
+def test_invalidated_rects_are_restored_without_full_redraw():
+    score, moves = Panel("Score 0"), Panel("Moves")
+    canvas = make_canvas(score, moves)
+    board = np.full((100, 100, 3), 30, dtype=np.uint8)
+    clean = canvas.compose(board, {"score": 0, "moves": 0}).copy()
+
+    # "הודעה" שחוצה את הלוח ואת פאנל הניקוד
+    canvas.canvas[50:100, 150:400] = 0
+    canvas.invalidate([(150, 50, 400, 100)])
+    again = canvas.compose(board, {"score": 0, "moves": 0}, [])
+    assert np.array_equal(again, clean)
+    assert score.calls == 2 and moves.calls == 1   # רק הפאנל שנפגע צויר מחדש
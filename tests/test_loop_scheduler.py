@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from It1_interfaces.Game import Game
+from It1_interfaces.LoopScheduler import LoopScheduler
+
+
+def test_ticks_are_fixed_step_and_catch_up():
+    s = LoopScheduler(tick_hz=100, render_hz=50)
+    s.start(1000)
+    assert s.due_ticks(1000) == [1000]
+    assert s.due_ticks(1005) == []
+    # פריים איטי - הטיקים החסרים מושלמים בצעדים קבועים
+    assert s.due_ticks(1041) == [1010, 1020, 1030, 1040]
+    assert s.max_tick_lateness_ms == 31
+
+
+def test_catch_up_is_bounded_and_resyncs():
+    s = LoopScheduler(tick_hz=100, render_hz=50, max_ticks_per_frame=3)
+    s.start(0)
+    assert len(s.due_ticks(1000)) == 3
+    assert s.dropped_ticks > 0
+    assert s.due_ticks(1000) == []
+    assert s.due_ticks(1010) == [1010]
+
+
+def test_render_rate_skips_missed_frames():
+    s = LoopScheduler(tick_hz=100, render_hz=50)
+    s.start(0)
+    assert s.render_due(0)
+    assert not s.render_due(10)
+    assert s.render_due(20)
+    assert s.render_due(200)        # פריימים שפוספסו לא נצברים
+    assert not s.render_due(210)
+    assert s.renders == 3
+
+
+def test_sleep_uses_remaining_budget():
+    s = LoopScheduler(tick_hz=100, render_hz=50)
+    s.start(0)
+    s.due_ticks(0)
+    s.render_due(0)
+    assert s.time_to_next_ms(4) == 6
+    assert s.time_to_next_ms(30) == 0
+
+
+class CountingPiece:
+    piece_id = "PW0"
+
+    def __init__(self):
+        self.updates = []
+
+    def reset(self, now):
+        pass
+
+    def update(self, now):
+        self.updates.append(now)
+
+
+def test_game_runs_simulation_without_input(monkeypatch):
+    board = SimpleNamespace(img=SimpleNamespace(img=np.zeros((80, 80, 3), dtype=np.uint8)))
+    piece = CountingPiece()
+    game = Game([piece], board, tick_hz=100, render_hz=25)
+
+    clock = {"now": 0}
+    frames = []
+    monkeypatch.setattr(game, "game_time_ms", lambda: clock["now"])
+    monkeypatch.setattr(game, "_draw", lambda: frames.append(clock["now"]))
+
+    def show():
+        clock["now"] += 5           # אף מקש לא נלחץ
+        return clock["now"] < 200
+    monkeypatch.setattr(game, "_show", show)
+    monkeypatch.setattr(LoopScheduler, "sleep_until_next", lambda self, now: None)
+    monkeypatch.setattr("cv2.destroyAllWindows", lambda: None)
+
+    game.run()
+    assert piece.updates == list(range(0, 200, 10))
+    assert frames == list(range(0, 200, 40))
@@ -0,0 +1,75 @@
+import pathlib
+import random
+
+from It1_interfaces.Game import Game
+from It1_interfaces.MoveGenerator import MoveGenerator
+from It1_interfaces.Moves import Moves
+from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.RenderTarget import OffscreenTarget
+
+PIECES = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+def scan_is_legal(piece_id, moves, start, end, occupied):
+    """The old check: find the delta in the list, then walk the path square by square."""
+    (x0, y0), (x1, y1) = start, end
+    if not (0 <= x1 <= 7 and 0 <= y1 <= 7) or (x1 - x0, y1 - y0) not in [(m[0], m[1]) for m in moves]:
+        return False
+    dx, dy = x1 - x0, y1 - y0
+    if piece_id.startswith("N") or not (dx == 0 or dy == 0 or abs(dx) == abs(dy)):
+        return True
+    sx, sy = (dx > 0) - (dx < 0), (dy > 0) - (dy < 0)
+    x, y = x0 + sx, y0 + sy
+    while (x, y) != (x1, y1):
+        if (x, y) in occupied:
+            return False
+        x, y = x + sx, y + sy
+    return True
+
+
+def test_matches_the_square_by_square_scan():
+    generator = MoveGenerator()
+    rng = random.Random(7)
+    for p_type in ("QW", "RB", "BW", "NB", "KW"):
+        moves = Moves.from_file(PIECES / p_type / "moves.txt").valid_moves
+        for _ in range(200):
+            occupied = {(rng.randrange(8), rng.randrange(8)) for _ in range(rng.randrange(20))}
+            bits = sum(generator.bit(cell) for cell in occupied)
+            start = (rng.randrange(8), rng.randrange(8))
+            piece_id = p_type + "0"
+            targets = set(generator.cells(generator.legal_targets(piece_id, moves, start, bits)))
+            for end in [(x, y) for x in range(-1, 9) for y in range(-1, 9)]:
+                expected = scan_is_legal(piece_id, moves, start, end, occupied)
+                assert generator.is_legal(piece_id, moves, start, end, bits) == expected, (p_type, start, end)
+                assert (end in targets) == expected
+
+
+def test_blockers_and_own_pieces():
+    generator = MoveGenerator()
+    rook = Moves.from_file(PIECES / "RW" / "moves.txt").valid_moves
+    occupied = generator.bit((0, 2)) | generator.bit((0, 5)) | generator.bit((3, 0))
+    assert generator.first_blocker((0, 0), (0, 7), occupied) == (0, 2)
+    assert generator.first_blocker((0, 7), (0, 0), occupied) == (0, 5)
+    assert generator.first_blocker((0, 0), (1, 2), occupied) is None   # לא על קו - אין "בין"
+
+    own = generator.bit((3, 0))
+    targets = generator.cells(generator.legal_targets("RW0", rook, (0, 0), occupied, own))
+    assert targets == [(1, 0), (2, 0), (0, 1), (0, 2)]   # נעצר על (0,2) - תפיסה, לא על כלי שלו
+    assert MoveGenerator.shared() is MoveGenerator.shared(8, 8)
+
+
+def test_game_validates_and_highlights_with_bitboards(make_board):
+    board = make_board()
+    factory = PieceFactory(board, PIECES, sprite_size=(16, 16))
+    game = Game([], board, render_target=OffscreenTarget(), piece_factory=factory)
+    game.pieces = factory.create_pieces([("RW0", "RW", (0, 7)), ("PW0", "PW", (0, 5)), ("NB0", "NB", (3, 7))],
+                                        game.user_input_queue)
+    rook = game.registry.get(game.pieces, "RW0")
+
+    assert game._is_valid_move(rook, 0, 6, 1)
+    assert not game._is_valid_move(rook, 0, 4, 1)              # החייל חוסם
+    assert game._check_path(0, 7, 0, 3, "RW0") == (0, 5)
+    assert game._check_path(0, 7, 2, 6, "NW0") is None
+    assert sorted(game.legal_targets(rook)) == [(0, 6), (1, 7), (2, 7), (3, 7)]   # החייל שלו לא, הסוס כן
+    game.selected_piece_player1 = rook
+    assert len(game._cursor_boxes()) == 2 + 1 + 4
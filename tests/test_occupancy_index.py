@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+from It1_interfaces.Command import Command
+from It1_interfaces.Game import Game
+from It1_interfaces.OccupancyIndex import OccupancyIndex
+from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.RenderTarget import OffscreenTarget
+
+
+def piece(piece_id, cell, target=None):
+    return SimpleNamespace(piece_id=piece_id, cell=cell, target=target)
+
+
+def make_index():
+    return OccupancyIndex(lambda p: p.cell, lambda p: p.target)
+
+
+def test_lookups_and_incremental_updates():
+    a, b = piece("A", (0, 0)), piece("B", (1, 0), target=(1, 5))
+    pieces = [a, b]
+    index = make_index()
+    assert index.at(pieces, (0, 0)) is a
+    assert index.at(pieces, (1, 0)) is b            # עדיין תופס את משבצת המקור
+    assert index.heading_to(pieces, (1, 5)) is b     # וגם את משבצת היעד
+    assert not index.is_free(pieces, (1, 5))
+
+    b.cell, b.target = (1, 5), None                  # הגיע
+    index.update(pieces, b)
+    assert index.at(pieces, (1, 0)) is None
+    assert index.at(pieces, (1, 5)) is b and index.heading_to(pieces, (1, 5)) is None
+
+    c = piece("C", (1, 5))
+    pieces.append(c)
+    index.add(pieces, c)
+    assert index.all_at(pieces, (1, 5)) == [b, c]
+    pieces.remove(b)
+    index.remove(pieces, b)
+    assert index.all_at(pieces, (1, 5)) == [c]
+    assert index.rebuilds == 1
+
+
+def test_index_heals_after_changes_behind_its_back():
+    a = piece("A", (0, 0))
+    pieces = [a]
+    index = make_index()
+    assert index.at(pieces, (0, 0)) is a
+
+    a.cell = (3, 3)                      # זז בלי update
+    assert index.at(pieces, (0, 0)) is None
+    assert index.at(pieces, (3, 3)) is a
+
+    pieces.append(piece("B", (4, 4)))    # נוסף בלי add
+    assert index.at(pieces, (4, 4)).piece_id == "B"
+    replaced = [piece("C", (0, 0))]      # הרשימה הוחלפה
+    assert index.at(replaced, (0, 0)).piece_id == "C"
+
+
+def test_game_tracks_a_move_from_start_to_arrival(tmp_path, monkeypatch, make_board, make_pieces_tree):
+    monkeypatch.setattr(Game, "_is_win", lambda self: False)   # אין מלכים על הלוח הזה
+    board = make_board()
+    factory = PieceFactory(board, make_pieces_tree(tmp_path), sprite_size=(16, 16))
+    game = Game([], board, render_target=OffscreenTarget(), piece_factory=factory)
+    game.pieces = [factory.create_piece("QW", (0, 7), game.user_input_queue)]
+    queen = game.pieces[0]
+    queen.piece_id = queen._state._physics.piece_id = "QW0"
+    start = game.game_time_ms()
+    queen.reset(start)
+
+    game._process_input(Command(start, "QW0", "move", target=(0, 4)))
+    assert game._get_piece_at_position(0, 7) is queen
+    assert game.occupancy.heading_to(game.pieces, (0, 4)) is queen
+
+    for now in range(start, start + 5000, 100):
+        game._tick(now)
+    assert game._get_piece_at_position(0, 4) is queen
+    assert game._get_piece_at_position(0, 7) is None
+    assert game.occupancy.heading_to(game.pieces, (0, 4)) is None
@@ -0,0 +1,107 @@
+import numpy as np
+
+from It1_interfaces.Board import Board
+from It1_interfaces.EventSystem import Event, EventType
+from It1_interfaces.Game import Game
+from It1_interfaces.img import Img
+from It1_interfaces.MovesLog import MovesLog
+from It1_interfaces.RenderTarget import OffscreenTarget
+from It1_interfaces.ScoreSystem import ScoreSystem
+
+
+def blank():
+    return np.full((600, 400, 3), 240, dtype=np.uint8)
+
+
+def move(log, piece_id, from_pos, to_pos, t):
+    log.on_move_made(Event(EventType.MOVE_MADE, {'piece_id': piece_id, 'from_position': from_pos,
+                                                 'to_position': to_pos, 'timestamp': t}, t))
+
+
+def test_score_panel_rasterized_only_when_score_changes(monkeypatch):
+    score = ScoreSystem("A", "B")
+    calls = []
+    render = score._render_panel
+    monkeypatch.setattr(score, "_render_panel", lambda *a: (calls.append(1), render(*a)))
+
+    first = blank()
+    score.draw_on_image(first, 20, 20, 280, 200)
+    again = blank()
+    score.draw_on_image(again, 20, 20, 280, 200)
+    assert len(calls) == 1
+    assert np.array_equal(first, again)
+
+    score.on_piece_captured(Event(EventType.PIECE_CAPTURED,
+                                  {'captured_piece': 'QB0', 'capturing_piece': 'PW0'}, 0))
+    after = blank()
+    score.draw_on_image(after, 20, 20, 280, 200)
+    assert len(calls) == 2
+    assert not np.array_equal(first, after)
+
+
+def test_scrolled_moves_log_matches_a_fresh_render():
+    log = MovesLog()
+    img = blank()
+    for i in range(30):   # מספיק מהלכים כדי לגלול את החלון כמה פעמים
+        move(log, "PW0" if i % 2 == 0 else "NB0", (i % 8, 6), ((i + 1) % 8, 5), i * 1000)
+        log.draw_on_image(img, 20, 20, 280, 300)
+
+    fresh = MovesLog()
+    fresh.moves = log.moves
+    fresh.pending_white_move = log.pending_white_move
+    expected = blank()
+    fresh.draw_on_image(expected, 20, 20, 280, 300)
+    assert np.array_equal(img, expected)
+
+
+def test_moves_log_renders_each_row_once(monkeypatch):
+    log = MovesLog()
+    img = blank()
+    for i in range(6):
+        move(log, "PW0" if i % 2 == 0 else "NB0", (0, 6), (0, 5), i)
+    log.draw_on_image(img, 20, 20, 280, 300)
+
+    rendered = []
+    row_strip = log._row_strip
+    monkeypatch.setattr(log, "_row_strip", lambda row: (rendered.append(row), row_strip(row))[1])
+    move(log, "PW0", (1, 6), (1, 5), 10)
+    log.draw_on_image(img, 20, 20, 280, 300)
+    assert len(rendered) == 1   # רק השורה החדשה (המהלך הלבן הממתין)
+
+
+def test_moves_log_snapshot_shares_no_buffers():
+    log = MovesLog()
+    for i in range(4):
+        move(log, "PW0" if i % 2 == 0 else "NB0", (0, 6), (0, 5), i)
+    log.draw_on_image(blank(), 20, 20, 280, 300)
+
+    snap = log.snapshot()
+    assert snap._row_strips is not log._row_strips
+    assert all(not np.shares_memory(snap._row_strips[row], strip) for row, strip in log._row_strips.items())
+    assert not np.shares_memory(snap._blank_row, log._blank_row)
+
+
+def test_game_snapshots_continue_from_the_last_drawn_log(monkeypatch):
+    img = Img()
+    img.img = np.full((160, 160, 4), 90, dtype=np.uint8)
+    board = Board(cell_H_pix=20, cell_W_pix=20, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=img)
+    game = Game([], board, render_target=OffscreenTarget())
+    for i in range(6):
+        move(game.moves_log, "PW0" if i % 2 == 0 else "NB0", (0, 6), (0, 5), i)
+    game._frame_snapshot().panels["moves"][1](blank(), 20, 20, 280, 300)   # כמו ה-worker
+
+    frames, rows = [], []
+    render_frame, row_strip = MovesLog._render_frame, MovesLog._row_strip
+    monkeypatch.setattr(MovesLog, "_render_frame", lambda self, *a: (frames.append(1), render_frame(self, *a)))
+    monkeypatch.setattr(MovesLog, "_row_strip", lambda self, row: (rows.append(row), row_strip(self, row))[1])
+    move(game.moves_log, "PW0", (1, 6), (1, 5), 10)
+    drawn = blank()
+    game._frame_snapshot().panels["moves"][1](drawn, 20, 20, 280, 300)
+    assert frames == [] and len(rows) == 1   # רק השורה החדשה - המסגרת והשורות הקודמות נלקחו מהפריים הקודם
+
+    fresh = MovesLog()
+    fresh.moves = game.moves_log.moves
+    fresh.pending_white_move = game.moves_log.pending_white_move
+    expected = blank()
+    fresh.draw_on_image(expected, 20, 20, 280, 300)
+    assert np.array_equal(drawn, expected)
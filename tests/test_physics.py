@@ -52,4 +52,21 @@ def test_physics_arrival_command():
     assert not p.moving
     # check if arrival command is as expected
     arrival_cmd = p.update(6000)
-    assert arrival_cmd is None  # כי כבר לא בתנועה
\ No newline at end of file
+    assert arrival_cmd is None  # כי כבר לא בתנועה
+
+
+def test_motion_lets_a_client_reproduce_the_server_position():
+    from It1_interfaces.Physics import interpolate_position
+    board = DummyBoard()
+    p = Physics((0, 0), board)
+    assert p.motion() is None
+    p.reset(DummyCommand("move", (2, 0), 1000))
+    motion = p.motion()
+    assert motion == {'from_cell': (0, 0), 'to_cell': (2, 0), 'start_ms': 1000, 'duration_ms': 1000}
+
+    p.update(1250)
+    start = motion['start_ms']
+    assert interpolate_position(board, motion['from_cell'], motion['to_cell'],
+                                start, start + motion['duration_ms'], 1250) == p.pixel_pos == (50, 0)
+    # אחרי סוף התנועה הלקוח נשאר ביעד עד שהשרת מאשר הגעה
+    assert interpolate_position(board, (0, 0), (2, 0), 1000, 2000, 9000) == (200, 0)
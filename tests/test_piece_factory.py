@@ -0,0 +1,40 @@
+from It1_interfaces.Moves import Moves
+from It1_interfaces.PieceFactory import PieceFactory
+
+
+def test_piece_type_is_parsed_once(tmp_path, monkeypatch, make_board, make_pieces_tree):
+    factory = PieceFactory(make_board(), make_pieces_tree(tmp_path), sprite_size=(16, 16))
+    reads = []
+    from_file = Moves.from_file
+    monkeypatch.setattr(Moves, "from_file", staticmethod(lambda path, dims=None: (reads.append(path), from_file(path, dims))[1]))
+
+    pawns = [factory.create_piece("PW", (x, 6)) for x in range(8)]
+    factory.create_piece("QW", (3, 7))
+    assert len(reads) == 2   # פעם אחת לכל סוג
+    assert set(factory.templates) == {"PW", "QW"}
+    assert factory.template("PW").configs["move"]["graphics"]["frames_per_sec"] == 5
+
+    first, second = pawns[0]._state, pawns[1]._state
+    assert first._moves is second._moves
+    assert first._graphics.frames is second._graphics.frames
+
+
+def test_instances_keep_their_own_mutable_state(tmp_path, make_board, make_pieces_tree):
+    factory = PieceFactory(make_board(), make_pieces_tree(tmp_path), sprite_size=(16, 16))
+    a = factory.create_piece("PW", (0, 6))
+    b = factory.create_piece("PW", (1, 6))
+
+    assert a._state._physics is not b._state._physics
+    assert a._state._graphics is not b._state._graphics
+    assert a._state._physics.cell != b._state._physics.cell
+
+    a._state._graphics.current_frame = 1
+    assert b._state._graphics.current_frame == 0
+    assert factory.template("PW").graphics.current_frame == 0
+
+
+def test_sprite_size_defaults_to_the_board_cell(tmp_path, make_board, make_pieces_tree):
+    factory = PieceFactory(make_board(), make_pieces_tree(tmp_path))
+    assert factory.sprite_size == (16, 16)
+    piece = factory.create_piece("PW", (0, 6))
+    assert piece._state._graphics.get_img().img.shape[:2] == (16, 16)
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+from It1_interfaces.Command import Command
+from It1_interfaces.Game import Game
+from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.PieceRegistry import PieceRegistry, piece_type_of
+from It1_interfaces.RenderTarget import OffscreenTarget
+
+
+def piece(piece_id):
+    return SimpleNamespace(piece_id=piece_id)
+
+
+def test_lookups_and_incremental_updates():
+    kw, kb, q0, q1 = piece("KW0"), piece("KB0"), piece("QW0"), piece("QW1")
+    pieces = [kw, kb, q0, q1]
+    registry = PieceRegistry()
+    assert piece_type_of("QW12") == "QW"
+    assert registry.get(pieces, "QW1") is q1
+    assert registry.count(pieces, "QW") == 2
+    assert registry.kings(pieces, "W") == [kw]
+
+    pieces.remove(kb)
+    registry.remove(pieces, kb)
+    assert not registry.king_alive(pieces, "B")
+    q2 = piece("QW2")
+    pieces.append(q2)
+    registry.add(pieces, q2)
+    assert registry.count(pieces, "QW") == 3 and registry.get(pieces, "QW2") is q2
+    assert registry.get(pieces, "KB0") is None
+    assert registry.rebuilds == 3   # הבנייה הראשונה + אימות של כל החטאה (KB0 ומלך שחור)
+
+
+def test_registry_heals_after_changes_behind_its_back():
+    a = piece("PW0")
+    pieces = [a]
+    registry = PieceRegistry()
+    assert registry.get(pieces, "PW0") is a
+
+    a.piece_id = "QW0"                    # הוחלף ID בלי עדכון
+    assert registry.get(pieces, "PW0") is None
+    assert registry.get(pieces, "QW0") is a
+    pieces.append(piece("KW0"))           # נוסף בלי add
+    assert registry.king_alive(pieces, "W")
+    assert registry.get([piece("KB0")], "KB0").piece_id == "KB0"   # הרשימה הוחלפה
+
+
+def test_game_dispatch_and_win_check_use_the_registry(tmp_path, make_board, make_pieces_tree):
+    board = make_board()
+    factory = PieceFactory(board, make_pieces_tree(tmp_path), sprite_size=(16, 16))
+    game = Game([], board, render_target=OffscreenTarget(), piece_factory=factory)
+    game.pieces = factory.create_pieces([("QW0", "QW", (0, 7)), ("QB0", "QB", (7, 0))], game.user_input_queue)
+    game.pieces += [piece("KW0"), piece("KB0")]
+    queen = game.registry.get(game.pieces, "QW0")
+    start = game.game_time_ms()
+    queen.reset(start)
+    rebuilds = game.registry.rebuilds
+
+    game._process_input(Command(start, "QW0", "move", target=(0, 4)))
+    assert game._get_piece_target(queen) == (0, 4)
+    assert not game.game_over
+    assert game.registry.rebuilds == rebuilds      # בלי סריקה של הרשימה
+
+    king = game.registry.get(game.pieces, "KB0")
+    game.pieces.remove(king)
+    game.registry.remove(game.pieces, king)
+    assert game._is_win()
+
+
+def test_next_id_never_reuses_a_captured_id():
+    q0, q1 = piece("QW0"), piece("QW1")
+    pieces = [q0, q1]
+    registry = PieceRegistry()
+    pieces.remove(q0)
+    registry.remove(pieces, q0)
+    assert registry.peek_id(pieces, "QW") == "QW2"
+    assert registry.next_id(pieces, "QW") == "QW2"
+    assert registry.next_id(pieces, "QW") == "QW3"
+    assert registry.next_id(pieces, "QB") == "QB0"
+
+
+def test_promotion_after_a_capture_gets_a_fresh_id(tmp_path, make_board, make_pieces_tree):
+    board = make_board()
+    factory = PieceFactory(board, make_pieces_tree(tmp_path), sprite_size=(16, 16))
+    game = Game([], board, render_target=OffscreenTarget(), piece_factory=factory)
+    game.pieces = factory.create_pieces([("QW0", "QW", (0, 7)), ("QW1", "QW", (1, 7)), ("PW0", "PW", (2, 0))],
+                                        game.user_input_queue)
+    captured = game.registry.get(game.pieces, "QW0")
+    game.pieces.remove(captured)
+    game.registry.remove(game.pieces, captured)
+
+    game._promote_pawn_to_queen(game.registry.get(game.pieces, "PW0"), "QW", (2, 0))
+    assert sorted(p.piece_id for p in game.pieces) == ["QW1", "QW2"]
+    assert game.registry.get(game.pieces, "QW2")._state._physics.cell == (2, 0)
@@ -0,0 +1,50 @@
+from It1_interfaces.Command import Command
+from It1_interfaces.Game import Game
+from It1_interfaces.img import Img
+from It1_interfaces.Moves import Moves
+from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.RenderTarget import OffscreenTarget
+from It1_interfaces.TickProfiler import TickProfiler
+
+
+def no_disk(*args, **kwargs):
+    raise AssertionError("promotion read from disk")
+
+
+def test_promotion_uses_injected_templates_and_keeps_ticks_short(tmp_path, monkeypatch, make_board, make_pieces_tree):
+    board = make_board()
+    factory = PieceFactory(board, make_pieces_tree(tmp_path), sprite_size=(16, 16))
+    profiler = TickProfiler(enabled=True)
+    game = Game([], board, render_target=OffscreenTarget(), profiler=profiler, piece_factory=factory)
+    assert "QW" in factory.templates   # נטען מראש בבניית המשחק
+
+    pawn = factory.create_piece("PW", (2, 0), game.user_input_queue)
+    pawn.piece_id = pawn._state._physics.piece_id = "PW0"
+    game.pieces = [pawn]
+
+    monkeypatch.setattr(Img, "read", no_disk)
+    monkeypatch.setattr(Moves, "from_file", staticmethod(no_disk))
+    game.user_input_queue.put(Command(0, "PW0", "arrived"))
+    for tick in range(10):
+        game._tick(tick * 16)
+
+    assert [p.piece_id for p in game.pieces] == ["QW0"]
+    queen = game.pieces[0]
+    assert queen._state._physics.cell == (2, 0)
+    assert queen._state._moves is factory.template("QW").moves
+
+    worst_ms = max(stats['max'] for stats in profiler.summary().values())
+    assert worst_ms < 50, f"worst tick stage took {worst_ms:.1f} ms during promotion"
+
+
+def test_fallback_templates_are_loaded_with_the_game_not_during_promotion(tmp_path, monkeypatch, make_board, make_pieces_tree):
+    board = make_board()
+    pawn = PieceFactory(board, make_pieces_tree(tmp_path), sprite_size=(16, 16)).create_piece("PW", (2, 0), None)
+    pawn.piece_id = pawn._state._physics.piece_id = "PW0"
+    game = Game([pawn], board, render_target=OffscreenTarget())
+    assert game.piece_factory is not None and "QW" in game.piece_factory.templates
+
+    monkeypatch.setattr(PieceFactory, "__init__", no_disk)
+    monkeypatch.setattr(Img, "read", no_disk)
+    game._promote_pawn_to_queen(pawn, "QW", (2, 0))
+    assert [p.piece_id for p in game.pieces] == ["QW0"]
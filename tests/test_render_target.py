@@ -0,0 +1,52 @@
+import numpy as np
+import cv2
+
+from It1_interfaces.Board import Board
+from It1_interfaces.Game import Game
+from It1_interfaces.img import Img
+from It1_interfaces.RenderTarget import NO_KEY, OffscreenTarget, WindowTarget
+
+
+def make_game(target):
+    img = Img()
+    img.img = np.full((160, 160, 3), 90, dtype=np.uint8)
+    board = Board(cell_H_pix=20, cell_W_pix=20, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=img)
+    return Game([], board, render_target=target)
+
+
+def test_offscreen_game_renders_without_window(monkeypatch):
+    def no_window(*a, **kw):
+        raise AssertionError("offscreen rendering must not touch HighGUI")
+    monkeypatch.setattr("cv2.imshow", no_window)
+    monkeypatch.setattr("cv2.waitKey", no_window)
+
+    frames = []
+    target = OffscreenTarget(frame_sink=lambda f: frames.append(f.copy()))
+    game = make_game(target)
+    frame = game.render_frame()
+    assert frame.shape == (game.new_window_height, game.new_window_width, 3)
+    assert target.frames_presented == 1 and len(frames) == 1
+    assert np.array_equal(frames[0], frame)
+    assert game._show() is True             # אין מקלדת - אין קלט ואין יציאה
+    assert target.poll_key() == NO_KEY
+
+
+def test_snapshot_is_a_copy_and_png_round_trips():
+    target = OffscreenTarget()
+    game = make_game(target)
+    game.render_frame()
+    snap = target.snapshot()
+    assert snap is not target.last_frame
+    decoded = cv2.imdecode(np.frombuffer(target.encode_png(), np.uint8), cv2.IMREAD_COLOR)
+    assert np.array_equal(decoded, snap)
+
+
+def test_window_target_sets_topmost_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr("cv2.imshow", lambda name, img: calls.append("show"))
+    monkeypatch.setattr("cv2.setWindowProperty", lambda *a: calls.append("top"))
+    target = WindowTarget("Chess Game")
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    target.present(frame)
+    target.present(frame)
+    assert calls == ["show", "top", "show"]
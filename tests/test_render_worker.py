@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+import time
+
+import numpy as np
+
+from It1_interfaces.Board import Board
+from It1_interfaces.BoardRenderer import snapshot_sprites
+from It1_interfaces.Game import Game
+from It1_interfaces.img import Img
+from It1_interfaces.LayeredCanvas import LayeredCanvas
+from It1_interfaces.RenderTarget import OffscreenTarget
+from It1_interfaces.RenderWorker import FrameComposer, FrameSnapshot, RenderWorker
+
+
+def make_board(size=160):
+    img = Img()
+    img.img = np.full((size, size, 4), 90, dtype=np.uint8)
+    return Board(cell_H_pix=20, cell_W_pix=20, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=img)
+
+
+def make_piece(value, pos):
+    sprite = Img()
+    sprite.img = np.full((20, 20, 4), value, dtype=np.uint8)
+    sprite.img[..., 3] = 255
+    graphics = SimpleNamespace(get_img=lambda: sprite)
+    physics = SimpleNamespace(pixel_pos=pos)
+    return SimpleNamespace(_state=SimpleNamespace(_graphics=graphics, _physics=physics))
+
+
+def make_composer(board):
+    return FrameComposer(board, lambda w, h: LayeredCanvas(w + 40, h + 40, 0))
+
+
+def test_snapshot_does_not_follow_the_piece():
+    board = make_board()
+    piece = make_piece(200, (0, 0))
+    snap = FrameSnapshot(tuple(snapshot_sprites([piece])))
+    piece._state._physics.pixel_pos = (100, 100)   # המשחק ממשיך לזוז אחרי ה-snapshot
+
+    frame = make_composer(board).compose(snap)
+    assert frame[20, 20].tolist() == [200, 200, 200]        # (0, 0) + היסט 20 של הלוח בחלון
+    assert frame[120, 120].tolist() == [90, 90, 90]
+
+
+def test_worker_frames_match_synchronous_composer():
+    board = make_board()
+    piece = make_piece(200, (0, 0))
+    worker = RenderWorker(lambda: make_composer(board)).start()
+    reference = make_composer(board)
+    try:
+        for x in (0, 40, 80, 40):
+            piece._state._physics.pixel_pos = (x, x)
+            snap = FrameSnapshot(tuple(snapshot_sprites([piece])), (((0, 0), (19, 19), (255, 0, 0), 2),))
+            frame = worker.render(snap, timeout=5)
+            try:
+                assert np.array_equal(frame, reference.compose(snap))
+            finally:
+                worker.release_frame()
+    finally:
+        worker.stop()
+    assert worker.error is None
+    assert worker.composed == 4
+
+
+def test_worker_never_writes_into_the_presented_buffer():
+    board = make_board()
+    piece = make_piece(200, (0, 0))
+    worker = RenderWorker(lambda: make_composer(board)).start()
+    try:
+        presented = worker.render(FrameSnapshot(tuple(snapshot_sprites([piece]))), timeout=5)
+        kept = presented.copy()
+        for x in (40, 80, 120):
+            piece._state._physics.pixel_pos = (x, x)
+            worker.submit(FrameSnapshot(tuple(snapshot_sprites([piece]))))
+            time.sleep(0.02)
+        assert np.array_equal(presented, kept)   # עדיין בהצגה - לא נגעו בו
+        worker.release_frame()
+
+        frame = worker.acquire_frame(timeout=5)
+        assert frame is not None and frame is not presented
+        worker.release_frame()
+    finally:
+        worker.stop()
+    assert worker.error is None
+
+
+def test_threaded_game_renders_the_same_frame():
+    sync_game = Game([], make_board(), render_target=OffscreenTarget())
+    threaded_game = Game([], make_board(), render_target=OffscreenTarget(), threaded_render=True)
+    try:
+        expected = sync_game.render_frame()
+        frame = threaded_game.render_frame()
+        assert np.array_equal(frame, expected)
+    finally:
+        threaded_game._stop_render_worker()
+
+
+def test_rendered_frame_stays_valid_until_the_next_frame():
+    board = make_board()
+    piece = make_piece(200, (0, 0))
+    game = Game([], board, render_target=OffscreenTarget(), threaded_render=True)
+    game.pieces = [piece]
+    try:
+        frame = game.render_frame()
+        kept = frame.copy()
+        worker = game._get_render_worker()
+        for x in (40, 80, 120):    # ה-worker ממשיך לצייר בזמן שהשרת מקודד את הפריים
+            piece._state._physics.pixel_pos = (x, x)
+            worker.submit(game._frame_snapshot())
+            time.sleep(0.02)
+        assert game.extended_img is frame
+        assert np.array_equal(frame, kept)
+    finally:
+        game._stop_render_worker()
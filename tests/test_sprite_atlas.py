@@ -0,0 +1,63 @@
+import numpy as np
+
+from It1_interfaces.SpriteAtlas import SpriteAtlas, decode_sprites
+from It1_interfaces.img import Img
+from It1_interfaces.Graphics import Graphics
+
+# מספר פריימים שונה בכל מצב - 6 פריימים בסך הכל
+TREE = dict(pieces={"QW": {"idle": 2, "move": 3}, "PB": {"idle": 1}}, sprite_shape=(30, 20, 3))
+
+
+def test_build_indexes_all_states(tmp_path, make_pieces_tree):
+    atlas = SpriteAtlas.build(make_pieces_tree(tmp_path, **TREE), size=(16, 16))
+    assert atlas.frames.shape == (6, 16, 16, 3)
+    assert atlas.frames.flags["C_CONTIGUOUS"]
+    assert atlas.has("QW", "move") and not atlas.has("QW", "jump")
+    start, end = atlas.index[("QW", "move")]
+    assert end - start == 3
+
+
+def test_frames_are_views_into_the_atlas(tmp_path, make_pieces_tree):
+    atlas = SpriteAtlas.build(make_pieces_tree(tmp_path, **TREE), size=(16, 16))
+    frames = atlas.get_frames("QW", "idle")
+    assert len(frames) == 2
+    assert all(np.shares_memory(f.img, atlas.frames) for f in frames)
+    assert atlas.get_frames("QW", "idle")[0] is frames[0]
+
+
+def test_graphics_uses_atlas_frames(tmp_path, make_pieces_tree):
+    root = make_pieces_tree(tmp_path, **TREE)
+    atlas = SpriteAtlas.build(root, size=(16, 16))
+    gfx = Graphics(root / "QW" / "states" / "idle" / "sprites", board=None, atlas=atlas, sprite_size=(16, 16))
+    assert np.shares_memory(gfx.get_img().img, atlas.frames)
+    gfx._switch_sprites_for_state("move")
+    assert len(gfx.frames) == 3
+    assert np.shares_memory(gfx.get_img().img, atlas.frames)
+    assert gfx.copy().frames == gfx.frames
+
+
+def test_shared_atlas_is_built_once(tmp_path, make_pieces_tree):
+    root = make_pieces_tree(tmp_path, **TREE)
+    assert SpriteAtlas.shared(root, (16, 16)) is SpriteAtlas.shared(root, (16, 16))
+
+
+def test_parallel_decode_matches_sequential(tmp_path, make_pieces_tree):
+    root = make_pieces_tree(tmp_path, **TREE)
+    (root / "QW" / "states" / "idle" / "sprites" / "9.png").write_bytes(b"not a png")   # קובץ פגום מדולג
+    reports = []
+    parallel = SpriteAtlas.build(root, size=(16, 16), workers=4, progress=lambda done, total: reports.append((done, total)))
+    sequential = SpriteAtlas.build(root, size=(16, 16), workers=1, progress=None)
+    assert parallel.index == sequential.index
+    assert np.array_equal(parallel.frames, sequential.frames)
+    assert reports[-1] == (7, 7) and len(reports) == 7
+
+
+def test_single_worker_decodes_in_order_without_a_pool(tmp_path, monkeypatch, make_pieces_tree):
+    root = make_pieces_tree(tmp_path, **TREE)
+    paths = sorted(root.glob("*/states/*/sprites/*.png"))
+    monkeypatch.setattr("It1_interfaces.SpriteAtlas.ThreadPoolExecutor", None)   # pool ייכשל אם ייווצר
+    reports = []
+    frames = decode_sprites(paths, (16, 16), workers=1, progress=lambda done, total: reports.append(done))
+    assert reports == list(range(1, len(paths) + 1))
+    for path, frame in zip(paths, frames):
+        assert np.array_equal(frame, Img().read(path, size=(16, 16)).img)
@@ -0,0 +1,49 @@
+import json
+
+import numpy as np
+
+from It1_interfaces.TickProfiler import TickProfiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = TickProfiler()
+    with profiler.stage("draw"):
+        pass
+    assert profiler.stage("draw") is profiler.stage("show")   # אותו אובייקט ריק - בלי הקצאות
+    assert profiler.summary() == {}
+
+
+def test_percentiles_over_the_ring_buffer():
+    profiler = TickProfiler(capacity=100, enabled=True)
+    for ms in range(1, 201):   # רק 100 האחרונים נשמרים: 101..200
+        profiler.record("pieces.update", float(ms))
+    stats = profiler.summary()["pieces.update"]
+    assert stats['count'] == 100
+    assert stats['p50'] == np.percentile(np.arange(101, 201), 50)
+    assert stats['p99'] <= stats['max'] == 200.0
+
+
+def test_stage_times_the_block():
+    profiler = TickProfiler(enabled=True)
+    for _ in range(3):
+        with profiler.stage("commands"):
+            pass
+    assert profiler.summary()["commands"]['count'] == 3
+
+
+def test_dump_and_hud(tmp_path):
+    profiler = TickProfiler()
+    assert profiler.hud() is None
+    assert profiler.toggle_hud() and profiler.enabled
+    profiler.record("draw", 2.5)
+
+    data = json.loads(profiler.dump(tmp_path / "profile.json").read_text())
+    assert data['summary']['draw']['p95'] == 2.5
+    assert data['samples_ms']['draw'] == [2.5]
+
+    hud = profiler.hud()
+    img = np.zeros((200, 400, 3), dtype=np.uint8)
+    rects = hud.draw_on_image(img)
+    assert any(line.startswith("draw") for line in hud.lines)
+    x0, y0, x1, y1 = rects[0]
+    assert img[y0:y1, x0:x1].any() and not img[y1:, :].any()
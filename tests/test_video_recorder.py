@@ -0,0 +1,111 @@
+import threading
+
+import numpy as np
+import cv2
+import pytest
+
+from It1_interfaces.VideoRecorder import DROP_NEWEST, DROP_OLDEST, VideoRecorder
+
+
+def frame(value, size=(48, 64)):
+    return np.full((size[0], size[1], 3), value, dtype=np.uint8)
+
+
+def test_video_file_is_written(tmp_path):
+    path = tmp_path / "game.avi"
+    rec = VideoRecorder(path, fps=10).start()
+    for i in range(12):
+        assert rec.push(frame(i * 20))
+    rec.stop()
+    assert rec.captured == 12 and rec.written == 12 and rec.dropped == 0
+
+    cap = cv2.VideoCapture(str(path))
+    assert cap.isOpened()
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 12
+    cap.release()
+
+
+def test_image_sequence_copies_live_buffer(tmp_path):
+    rec = VideoRecorder(tmp_path / "frames", max_queue=8).start()
+    live = frame(10)
+    rec.push(live)
+    live[:] = 200                      # הרנדרר ממשיך לצייר על אותו באפר
+    rec.stop()
+    saved = cv2.imread(str(tmp_path / "frames" / "frame_000000.png"))
+    assert (saved == 10).all()
+
+
+@pytest.mark.parametrize("policy", [DROP_NEWEST, DROP_OLDEST])
+def test_slow_encoder_drops_instead_of_blocking(tmp_path, monkeypatch, policy):
+    release = threading.Event()
+    written = []
+
+    def slow_write(self, f):
+        release.wait()
+        written.append(int(f[0, 0, 0]))
+        self.written += 1
+    monkeypatch.setattr(VideoRecorder, "_write", slow_write)
+
+    rec = VideoRecorder(tmp_path / "frames", max_queue=2, drop_policy=policy).start()
+    for i in range(10):
+        rec.push(frame(i))             # אסור לחסום גם כשה-encoder תקוע
+    release.set()
+    rec.stop()
+
+    assert rec.written + rec.dropped == 10
+    assert rec.dropped > 0
+    assert rec.written == len(written)
+    if policy == DROP_OLDEST:
+        assert written[-1] == 9        # הפריים האחרון תמיד נשמר
+    else:
+        assert 9 not in written
+
+
+def test_push_before_start_is_counted_as_dropped(tmp_path):
+    rec = VideoRecorder(tmp_path / "x.avi")
+    assert rec.push(frame(0)) is False
+    assert rec.dropped == 1
+
+
+def test_write_errors_are_counted_and_do_not_kill_the_worker(tmp_path, monkeypatch):
+    calls = []
+
+    def failing_write(self, f):
+        calls.append(1)
+        if len(calls) == 1:
+            raise cv2.error("encoder failed")
+        self.written += 1
+    monkeypatch.setattr(VideoRecorder, "_write", failing_write)
+
+    rec = VideoRecorder(tmp_path / "frames", max_queue=4).start()
+    for i in range(3):
+        rec.push(frame(i))
+    rec.stop()
+    assert rec.errors == 1 and rec.written == 2
+
+
+def test_stop_does_not_hang_when_the_worker_is_gone(tmp_path, monkeypatch):
+    monkeypatch.setattr(VideoRecorder, "_worker", lambda self: None)   # ה-worker יצא מיד
+    rec = VideoRecorder(tmp_path / "frames", max_queue=2, drop_policy=DROP_OLDEST).start()
+    rec._thread.join()
+    for i in range(5):
+        rec.push(frame(i))
+    rec.stop(timeout=1)                # התור מלא ואין מי שירוקן אותו
+    assert rec.captured == 0 and rec.dropped == 5
+
+
+def test_timestamps_keep_the_game_timing(tmp_path, monkeypatch):
+    written = []
+
+    def record_write(self, f):
+        written.append(int(f[0, 0, 0]))
+        self.written += 1
+    monkeypatch.setattr(VideoRecorder, "_write", record_write)
+
+    rec = VideoRecorder(tmp_path / "frames", fps=10).start()
+    for value, t in ((1, 1000), (2, 1100), (3, 1400), (4, 1420), (5, 1500)):
+        rec.push(frame(value), timestamp_ms=t)
+    rec.stop()
+    # 2 נשאר על המסך 300ms -> 3 פריימים; 4 מחליף את 3 באותו slot
+    assert written == [1, 2, 2, 2, 4, 5]
+    assert rec.duplicated == 2 and rec.dropped == 1 and rec.captured == 4